@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+배치 처리 모듈
+
+여러 개의 백준 문제(URL, 문제 번호, 번호 범위, 입력 파일)를
+한 번의 실행으로 크롤링하여 Notion에 정리합니다.
+"""
+
+import re
+import sys
+import time
+
+
+PROBLEM_URL = "https://www.acmicpc.net/problem/{}"
+
+# 한 번에 펼칠 수 있는 범위 최대 크기 (오타로 인한 폭주 방지)
+MAX_RANGE_SIZE = 10000
+
+
+def expand_target(entry):
+    """
+    입력 항목 하나를 백준 문제 URL 목록으로 변환
+
+    지원 형식:
+        https://www.acmicpc.net/problem/1000   (URL)
+        1000                                   (문제 번호)
+        1000-1999                              (번호 범위, 양 끝 포함)
+
+    Args:
+        entry: 입력 문자열
+
+    Returns:
+        list: 백준 문제 URL 리스트
+    """
+    entry = entry.strip()
+    if not entry or entry.startswith("#"):
+        return []
+
+    if "acmicpc.net/problem/" in entry:
+        return [entry]
+
+    if entry.isdigit():
+        return [PROBLEM_URL.format(int(entry))]
+
+    match = re.fullmatch(r'(\d+)\s*-\s*(\d+)', entry)
+    if match:
+        start, end = int(match.group(1)), int(match.group(2))
+        if start > end:
+            raise ValueError(f"잘못된 범위입니다 (시작 > 끝): {entry}")
+        if end - start + 1 > MAX_RANGE_SIZE:
+            raise ValueError(f"범위가 너무 큽니다 (최대 {MAX_RANGE_SIZE}개): {entry}")
+        return [PROBLEM_URL.format(n) for n in range(start, end + 1)]
+
+    raise ValueError(f"올바른 백준 URL / 문제 번호 / 범위가 아닙니다: {entry}")
+
+
+def read_entries(path):
+    """
+    입력 파일(또는 '-'이면 stdin)에서 한 줄에 하나씩 항목 읽기
+
+    빈 줄과 '#'으로 시작하는 줄은 무시합니다.
+    """
+    if path == "-":
+        for line in sys.stdin:
+            yield line
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line
+
+
+def iter_targets(entries, files=None, problem_ids=None):
+    """
+    명령행 항목, 입력 파일, 문제 번호 스트림을 합쳐 중복 없는 URL 스트림 생성
+
+    파이프라인 등 무거운 모듈을 불러오지 않으므로 데몬 클라이언트에서도 사용합니다.
+
+    Args:
+        entries: 명령행으로 받은 항목 리스트
+        files: 입력 파일 경로 리스트 ('-'는 stdin)
+        problem_ids: 문제 번호 iterable (예: solved.ac 검색 결과)
+
+    Yields:
+        str: 백준 문제 URL
+    """
+    seen = set()
+
+    def expand_lines():
+        # 파일 항목은 잘못된 줄이 있어도 경고만 하고 계속 진행
+        for path in files or []:
+            for line in read_entries(path):
+                try:
+                    yield from expand_target(line)
+                except ValueError as e:
+                    print(f"⚠️ 건너뜀: {e}")
+
+    def sources():
+        for entry in entries:
+            yield from expand_target(entry)
+        yield from expand_lines()
+        for problem_id in problem_ids or []:
+            yield PROBLEM_URL.format(problem_id)
+
+    for url in sources():
+        if url in seen:
+            continue
+        seen.add(url)
+        yield url
+
+
+def prefetch_metadata(urls, window=None):
+    """
+    URL 스트림을 window개씩 모아 solved.ac 정보를 묶음으로 미리 조회
+
+    스트림은 그대로 흘려보내므로 입력 전체를 메모리에 올리지 않습니다.
+    로컬 캐시에 유효한 항목이 있는 문제는 조회하지 않습니다.
+
+    Args:
+        urls: 백준 문제 URL iterable
+        window: 한 번에 모을 URL 수 (기본: solved.ac lookup 최대 문제 수)
+
+    Yields:
+        str: 백준 문제 URL (입력 순서 그대로)
+    """
+    from scraper import get_problem_id
+    from solved_ac import prefetch_problems, LOOKUP_BATCH_SIZE
+    from cache import is_problem_cached
+
+    window = window or LOOKUP_BATCH_SIZE
+
+    def prefetch(buffer):
+        ids = [get_problem_id(u) for u in buffer]
+        ids = [pid for pid in ids if pid and not is_problem_cached(pid)]
+        if ids:
+            prefetch_problems(ids)
+
+    buffer = []
+    for url in urls:
+        buffer.append(url)
+        if len(buffer) >= window:
+            prefetch(buffer)
+            yield from buffer
+            buffer = []
+
+    if buffer:
+        prefetch(buffer)
+        yield from buffer
+
+
+STATUS_ICONS = {
+    "created": "✅",
+    "updated": "🔄",
+    "exists": "⚠️",
+    "failed": "❌",
+}
+
+
+def print_result(index, result):
+    """문제 하나의 처리 결과를 한 줄로 출력"""
+    icon = STATUS_ICONS.get(result["status"], "❔")
+    label = result["title"] or result["url"]
+    detail = result["error"] if result["status"] == "failed" else result["page_url"]
+    print(f"{icon} [{index}] {label} ({result['elapsed']:.1f}s) {detail}")
+
+
+def print_summary(results, elapsed):
+    """배치 처리 결과 요약 및 처리량 출력"""
+    counts = {status: 0 for status in STATUS_ICONS}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    total = len(results)
+    throughput = total / (elapsed / 60) if elapsed > 0 else 0.0
+
+    print("\n" + "=" * 50)
+    print(f"📊 배치 처리 결과: 총 {total}문제")
+    print(f"   ✅ 생성: {counts['created']}")
+    if counts["updated"]:
+        print(f"   🔄 갱신: {counts['updated']}")
+    print(f"   ⚠️ 이미 존재: {counts['exists']}")
+    print(f"   ❌ 실패: {counts['failed']}")
+    print(f"   ⏱️ 소요 시간: {elapsed:.1f}s ({throughput:.1f} 문제/분)")
+
+    failed = [r for r in results if r["status"] == "failed"]
+    if failed:
+        print("\n❌ 실패한 문제:")
+        for result in failed:
+            print(f"   - {result['url']}: {result['error']}")
+    print("=" * 50)
+
+
+def run_batch(urls, concurrency=None, refresh=False, sink=None):
+    """
+    URL 스트림을 한 프로세스 안에서 파이프라인으로 처리
+
+    Args:
+        urls: 백준 문제 URL iterable
+        concurrency: 단계별 동시 실행 수 (config.DEFAULT_CONCURRENCY 참고)
+        refresh: True면 이미 있는 페이지에서 바뀐 섹션만 갱신
+        sink: 출력 대상 (기본: Notion 페이지, sinks.py 참고)
+
+    Returns:
+        list: 문제별 처리 결과 리스트 (완료 순서)
+    """
+    from pipeline import process_problems
+
+    def on_event(event, item):
+        if event == "done":
+            print_result(item["index"], item["result"])
+
+    started = time.perf_counter()
+    results = process_problems(
+        prefetch_metadata(urls), concurrency=concurrency, on_event=on_event, refresh=refresh, sink=sink
+    )
+    print_summary(results, time.perf_counter() - started)
+    return results
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+파싱 프로세스 벤치마크
+
+저장해 둔 문제 페이지(bench/fixtures)를 여러 벌 복제해 파이프라인에 흘려보내고,
+parse 단계를 스레드에서 실행할 때와 프로세스 풀에서 실행할 때의 처리량(문제/초)을 비교합니다.
+페이지 가져오기, solved.ac 조회, 작성은 즉시 끝나는 대역으로 바꾸므로 파싱이 처리량을 결정합니다.
+프로세스 풀은 처음 만들 때 드는 시간(프로세스 시작, 모듈 import)을 빼고 잽니다.
+lxml이 설치되어 있으면 먼저 fixture마다 html.parser와 lxml의 파싱 결과를 비교하고,
+하나라도 다르면 종료 코드 1로 끝납니다 (HTML_PARSER=lxml을 쓰기 전에 확인).
+
+사용법:
+    python bench/bench_parse.py
+    python bench/bench_parse.py --copies 500 --processes 0 2 4 auto -o parse.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+
+def compare_backends(html_by_id):
+    """
+    html.parser와 lxml의 파싱 결과 비교
+
+    Returns:
+        list: 결과가 다른 (문제 번호, 필드) 목록 (lxml이 없으면 None)
+    """
+    import importlib.util
+    import scraper
+    from batch import PROBLEM_URL
+
+    if importlib.util.find_spec("lxml") is None:
+        return None
+
+    saved = scraper._PARSER_BACKEND
+    outputs = {}
+    try:
+        for backend in ("html.parser", "lxml"):
+            scraper._PARSER_BACKEND = backend
+            outputs[backend] = {
+                problem_id: {
+                    **scraper.parse_problem_html(html, PROBLEM_URL.format(problem_id)),
+                    "stats": scraper.parse_problem_stats(html),
+                }
+                for problem_id, html in html_by_id.items()
+            }
+    finally:
+        scraper._PARSER_BACKEND = saved
+
+    return [
+        (problem_id, field)
+        for problem_id, expected in outputs["html.parser"].items()
+        for field in expected
+        if outputs["lxml"][problem_id].get(field) != expected[field]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parse 단계 스레드/프로세스 처리량 비교")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--copies", type=int, default=100, help="문제 페이지 복제 수 (기본: 100)")
+    parser.add_argument("--processes", nargs="+", default=["0", "auto"],
+                        help="비교할 파싱 프로세스 수 (0: 스레드, auto: CPU 코어 수, 기본: 0 auto)")
+    args = parser.parse_args()
+
+    # 작성 단계는 대역을 쓰지만 설정 값은 읽으므로 지정 (요청은 보내지 않음)
+    os.environ.setdefault("NOTION_TOKEN", "bench")
+    os.environ.setdefault("NOTION_PARENT_PAGE_ID", "bench")
+
+    import pipeline
+    import solved_ac
+    import cache
+    from sinks import Sink
+    from scraper import get_problem_id
+    from batch import PROBLEM_URL
+    from run_bench import load_fixtures, load_solved_ac, ID_STRIDE
+
+    class NullSink(Sink):
+        label = "bench"
+        journal_scope = "bench"
+
+        def write(self, problem_data, refresh=False):
+            return "created", ""
+
+    html_by_id = {problem_id: html for problem_id, html in load_fixtures().values()}
+    solved = load_solved_ac()
+
+    mismatches = compare_backends(html_by_id)
+    if mismatches is None:
+        print("lxml이 없어 파서 결과 비교를 건너뜁니다.")
+    elif mismatches:
+        for problem_id, field in mismatches:
+            print(f"❌ {problem_id}번 {field}: html.parser와 lxml 결과가 다릅니다")
+        sys.exit(1)
+    else:
+        print(f"✅ html.parser와 lxml 파싱 결과 일치 (fixture {len(html_by_id)}개)")
+
+    pipeline.fetch_problem_page = lambda url, validators=None: (html_by_id[get_problem_id(url) % ID_STRIDE], None)
+    pipeline.prefetch_images = lambda urls: {}
+    solved_ac._lookup_chunk = lambda problem_ids: {
+        pid: solved_ac.parse_problem_info(solved[pid % ID_STRIDE]) for pid in problem_ids
+    }
+    cache.configure_cache(cache.CACHE_OFF)
+
+    urls = [
+        PROBLEM_URL.format(problem_id + copy * ID_STRIDE)
+        for copy in range(args.copies)
+        for problem_id in sorted(html_by_id)
+    ]
+
+    report = {"problems": len(urls), "cpu_count": os.cpu_count(), "runs": {}}
+    baseline = None
+    print(f"문제 {len(urls)}개, CPU {os.cpu_count()}개")
+    for processes in args.processes:
+        pipeline.configure_parse_processes(processes)
+        pool = pipeline.get_parse_pool()
+        if pool is not None:
+            # 프로세스 시작과 모듈 import를 측정에서 제외
+            list(pool.map(abs, range(pool._max_workers)))
+
+        start = time.perf_counter()
+        results = pipeline.process_problems(urls, sink=NullSink())
+        seconds = time.perf_counter() - start
+
+        failed = [r["error"] for r in results if r["status"] == "failed"]
+        rate = len(urls) / seconds
+        baseline = baseline or rate
+        report["runs"][str(processes)] = {
+            "seconds": round(seconds, 3),
+            "problems_per_sec": round(rate, 1),
+            "speedup": round(rate / baseline, 2),
+            "failed": len(failed),
+        }
+        label = "스레드" if pool is None else f"프로세스 {pool._max_workers}개"
+        print(f"{label:<12}{seconds:>8.2f}s{rate:>10.1f}문제/초{rate / baseline:>7.2f}x"
+              + (f"  실패 {len(failed)}: {failed[0]}" if failed else ""))
+
+    pipeline.configure_parse_processes(0)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+페이지 템플릿 마이크로벤치마크
+
+저장해 둔 문제 페이지(bench/fixtures)로 Notion 블록 생성을 두 가지 방식으로 비교합니다.
+
+    compiled : 한 번 컴파일한 템플릿에 문제별 내용만 채움 (실제 동작)
+    per_call : 페이지마다 템플릿 전체를 새로 만듦 (구분선, 제목, 테이블 머리글 등을 매번 할당)
+
+문제마다 호출당 시간(중앙값)과 만든 블록이 새로 차지하는 메모리(tracemalloc)를 출력합니다.
+
+사용법:
+    python bench/bench_template.py
+    python bench/bench_template.py --repeat 2000 -o template.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+
+def build_per_call(problem_data):
+    """컴파일 결과를 재사용하지 않는 기준 구현"""
+    from notion_api import compile_page_template, render_sections
+    from page_template import PAGE_TEMPLATE
+    return render_sections(compile_page_template(PAGE_TEMPLATE, precompiled_examples=0), problem_data)
+
+
+def retained_bytes(func, problem_data, repeat=20):
+    """func(problem_data) 결과가 새로 차지하는 메모리 (바이트, repeat번 평균)"""
+    func(problem_data)  # 지연 import, 캐시 등 첫 호출 비용 제외
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [func(problem_data) for _ in range(repeat)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del results
+    return (after - before) // repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 템플릿 컴파일 효과 측정")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--repeat", type=int, default=500, help="문제별 반복 횟수 (기본: 500)")
+    args = parser.parse_args()
+
+    # notion_api가 설정 값을 읽으므로 그 전에 지정 (요청은 보내지 않음)
+    os.environ.setdefault("NOTION_TOKEN", "bench")
+    os.environ.setdefault("NOTION_PARENT_PAGE_ID", "bench")
+
+    from run_bench import load_fixtures, load_solved_ac, time_calls
+    from scraper import parse_problem_html, build_problem_data
+    from solved_ac import parse_problem_info
+    from notion_api import build_problem_sections
+    from batch import PROBLEM_URL
+
+    solved = load_solved_ac()
+    report = {}
+    print(f"{'문제':<16}{'블록':>4}{'compiled':>12}{'per_call':>12}{'배속':>6}{'메모리(KB)':>15}")
+    for name, (problem_id, html) in load_fixtures().items():
+        page_data = parse_problem_html(html, PROBLEM_URL.format(problem_id))
+        problem_data = build_problem_data(page_data, parse_problem_info(solved[problem_id]))
+
+        compiled = time_calls(lambda: build_problem_sections(problem_data), args.repeat)
+        per_call = time_calls(lambda: build_per_call(problem_data), args.repeat)
+        compiled_bytes = retained_bytes(build_problem_sections, problem_data)
+        per_call_bytes = retained_bytes(build_per_call, problem_data)
+        blocks = sum(len(blocks) for _, blocks in build_problem_sections(problem_data))
+
+        report[name] = {
+            "blocks": blocks,
+            "compiled": {**compiled, "retained_bytes": compiled_bytes},
+            "per_call": {**per_call, "retained_bytes": per_call_bytes},
+            "speedup": round(per_call["median_ms"] / compiled["median_ms"], 2),
+        }
+        print(
+            f"{name:<18}{blocks:>6}{compiled['median_ms']:>10.3f}ms{per_call['median_ms']:>10.3f}ms"
+            f"{report[name]['speedup']:>7.2f}x{compiled_bytes / 1024:>9.1f} / {per_call_bytes / 1024:.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+시작 시간 회귀 검사
+
+`python -X importtime`으로 main.py의 가벼운 실행 경로(--help, 인자 오류, 모듈 import)를 실행해
+무거운 모듈을 불러오지 않는지, 불러온 모듈의 누적 시간이 예산 안인지 확인합니다.
+문제가 있으면 종료 코드 1을 반환하므로 CI나 커밋 전 훅에서 사용할 수 있습니다.
+
+사용법:
+    python bench/check_import_time.py
+    python bench/check_import_time.py --budget-ms 30 --verbose
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 가벼운 실행 경로에서 불러오면 안 되는 모듈 (최상위 패키지 이름)
+HEAVY_MODULES = ("notion_client", "httpx", "bs4", "requests", "urllib3", "dotenv", "selenium", "webdriver_manager")
+
+# (이름, main.py 인자 또는 -c 코드)
+SCENARIOS = [
+    ("--help", ["main.py", "--help"]),
+    ("인자 오류", ["main.py", "--browsers", "x"]),
+    ("import main", ["-c", "import main"]),
+]
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime 출력 파싱
+
+    Returns:
+        dict: {모듈 이름: 누적 시간(µs)} (최상위로 불러온 모듈 기준)
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue    # 머리글
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def run_scenario(args):
+    """시나리오 하나를 새 프로세스로 실행하고 불러온 모듈 반환"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT_DIR, capture_output=True, text=True, env=env
+    )
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="main.py 시작 시간 회귀 검사")
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="프로젝트 모듈 import 누적 시간 예산 (기본: 50ms)")
+    parser.add_argument("--verbose", action="store_true", help="불러온 프로젝트 모듈 시간 출력")
+    args = parser.parse_args()
+
+    project_modules = {
+        name[:-len(".py")] for name in os.listdir(ROOT_DIR) if name.endswith(".py")
+    }
+
+    failed = False
+    for name, scenario in SCENARIOS:
+        modules = run_scenario(scenario)
+        heavy = sorted({m.split(".")[0] for m in modules} & set(HEAVY_MODULES))
+        own = {m: us for m, us in modules.items() if m in project_modules}
+        # 중첩된 import는 바깥 모듈 누적 시간에 포함되므로 가장 큰 값이 전체 시간
+        total_ms = max(own.values(), default=0) / 1000
+
+        ok = not heavy and total_ms <= args.budget_ms
+        failed |= not ok
+        print(f"{'✅' if ok else '❌'} {name:<12} 프로젝트 모듈 {total_ms:6.1f}ms (예산 {args.budget_ms:.0f}ms)")
+        if heavy:
+            print(f"   무거운 모듈을 불러왔습니다: {', '.join(heavy)}")
+        if args.verbose:
+            for module, us in sorted(own.items(), key=lambda item: -item[1]):
+                print(f"   {module:<20} {us / 1000:6.1f}ms")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
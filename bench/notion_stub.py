@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""
+Notion API 로컬 대역 서버
+
+벤치마크에서 실제 Notion 대신 사용하는 HTTP 서버입니다.
+페이지/블록 생성, 하위 블록 조회·추가·수정·삭제를 메모리에서 처리하고,
+모든 요청을 엔드포인트별로 기록합니다.
+응답 모양은 Notion을 따릅니다: rich_text 항목에는 plain_text/href/annotations가 채워지고,
+목록 조회의 start_cursor는 그 블록부터(포함) 읽으며 next_cursor는 다음 블록의 ID입니다.
+휴지통으로 옮긴 페이지(pages.update의 in_trash/archived, blocks.delete)는 목록과 조회 결과에서 빠지고,
+pages.retrieve로 조회하면 in_trash가 True이며, 그 페이지와 안의 블록을 고치면 400(validation_error)입니다.
+데이터베이스(NOTION_DATABASE_ID)는 처음 조회할 때 제목 속성만 있는 데이터 소스 하나로 만들어지고,
+데이터 소스 조회는 number 속성의 equals 필터만 지원합니다.
+응답 지연과 429(rate_limited) 응답을 일정 비율로 끼워 넣을 수 있습니다.
+
+단독 실행:
+    python bench/notion_stub.py --port 8765 --latency-ms 150 --rate-limit-ratio 0.05
+"""
+
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+# (메서드, 경로 패턴) → 엔드포인트 이름
+ROUTES = [
+    ("GET", re.compile(r"^/v1/users/me$"), "users.me"),
+    ("POST", re.compile(r"^/v1/pages$"), "pages.create"),
+    ("GET", re.compile(r"^/v1/pages/([^/]+)$"), "pages.retrieve"),
+    ("PATCH", re.compile(r"^/v1/pages/([^/]+)$"), "pages.update"),
+    ("GET", re.compile(r"^/v1/blocks/([^/]+)/children$"), "blocks.children.list"),
+    ("PATCH", re.compile(r"^/v1/blocks/([^/]+)/children$"), "blocks.children.append"),
+    ("PATCH", re.compile(r"^/v1/blocks/([^/]+)$"), "blocks.update"),
+    ("DELETE", re.compile(r"^/v1/blocks/([^/]+)$"), "blocks.delete"),
+    ("GET", re.compile(r"^/v1/databases/([^/]+)$"), "databases.retrieve"),
+    ("GET", re.compile(r"^/v1/data_sources/([^/]+)$"), "data_sources.retrieve"),
+    ("PATCH", re.compile(r"^/v1/data_sources/([^/]+)$"), "data_sources.update"),
+    ("POST", re.compile(r"^/v1/data_sources/([^/]+)/query$"), "data_sources.query"),
+]
+
+
+DEFAULT_ANNOTATIONS = {
+    "bold": False, "italic": False, "strikethrough": False,
+    "underline": False, "code": False, "color": "default",
+}
+
+
+def new_id():
+    return str(uuid.uuid4())
+
+
+class StubError(Exception):
+    """Notion 오류 응답 ({"object": "error", "status", "code", "message"})"""
+
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def filled_rich_text(items):
+    """요청의 rich_text 항목을 Notion 응답 모양으로 (plain_text, href, 전체 annotations)"""
+    filled = []
+    for item in items:
+        text = item.get("text") or {}
+        filled.append({
+            **item,
+            "annotations": {**DEFAULT_ANNOTATIONS, **(item.get("annotations") or {})},
+            "plain_text": text.get("content", ""),
+            "href": (text.get("link") or {}).get("url"),
+        })
+    return filled
+
+
+def filled_block_body(body):
+    """블록 본문의 rich_text(표 행이면 cells)를 응답 모양으로"""
+    if not isinstance(body, dict):
+        return body
+    body = dict(body)
+    if "rich_text" in body:
+        body["rich_text"] = filled_rich_text(body["rich_text"])
+    if "cells" in body:
+        body["cells"] = [filled_rich_text(cell) for cell in body["cells"]]
+    return body
+
+
+def cursor_page(items, start_cursor, size):
+    """
+    목록 응답 한 쪽 (start_cursor는 그 항목부터 포함, next_cursor는 다음 항목의 ID)
+
+    Raises:
+        StubError: 목록에 없는 start_cursor
+    """
+    start = 0
+    if start_cursor:
+        start = next((i for i, item in enumerate(items) if item["id"] == start_cursor), None)
+        if start is None:
+            raise StubError(400, "validation_error", f"start_cursor provided is invalid: {start_cursor}")
+    has_more = start + size < len(items)
+    return {
+        "object": "list",
+        "results": items[start:start + size],
+        "has_more": has_more,
+        "next_cursor": items[start + size]["id"] if has_more else None,
+    }
+
+
+class NotionStub:
+    """
+    메모리 안의 Notion 워크스페이스와 요청 기록
+
+    - latency: 요청마다 기다릴 시간 (초)
+    - rate_limit_ratio: 429를 돌려줄 요청 비율 (0~1)
+    - retry_after: 429 응답의 Retry-After 값 (초)
+    """
+
+    def __init__(self, latency=0.0, rate_limit_ratio=0.0, retry_after=0.05, seed=0):
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._children = {}     # block_id → [block, ...]
+        self._databases = {}    # database_id → data_source_id
+        self._sources = {}      # data_source_id → {"properties": 스키마, "pages": [page, ...]}
+        self._pages = {}        # page_id → {"id", "parent_id", "in_trash"}
+        self.calls = Counter()
+        self.rate_limited = 0
+        self.request_bytes = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.rate_limited = 0
+            self.request_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "api_calls": sum(self.calls.values()),
+                "by_endpoint": dict(sorted(self.calls.items())),
+                "rate_limited": self.rate_limited,
+                "request_bytes": self.request_bytes,
+            }
+
+    def should_rate_limit(self):
+        with self._lock:
+            if self.rate_limit_ratio and self._random.random() < self.rate_limit_ratio:
+                self.rate_limited += 1
+                return True
+            return False
+
+    def record(self, endpoint, size):
+        with self._lock:
+            self.calls[endpoint] += 1
+            self.request_bytes += size
+
+    # --- 엔드포인트 ---
+
+    def _store_children(self, parent_id, blocks, after=None):
+        stored = []
+        for block in blocks:
+            block = dict(block, id=new_id(), has_children=False, archived=False, in_trash=False)
+            block.pop("children", None)
+            block[block.get("type")] = filled_block_body(block.get(block.get("type")))
+            stored.append(block)
+            self._children.setdefault(block["id"], [])
+
+            # 표 행처럼 하위 블록이 함께 온 경우
+            body = block.get(block.get("type"), {})
+            if isinstance(body, dict) and body.get("children"):
+                self._store_children(block["id"], body.pop("children"))
+                block["has_children"] = True
+
+        siblings = self._children.setdefault(parent_id, [])
+        if after:
+            position = next((i + 1 for i, b in enumerate(siblings) if b["id"] == after), len(siblings))
+            siblings[position:position] = stored
+        else:
+            siblings.extend(stored)
+        return stored
+
+    def _trash_page(self, page_id):
+        """페이지를 휴지통으로 (부모의 하위 블록과 데이터 소스 조회 결과에서 빠짐)"""
+        page = self._pages.get(page_id)
+        if page is None or page["in_trash"]:
+            return
+        page["in_trash"] = True
+        siblings = self._children.get(page["parent_id"], [])
+        siblings[:] = [b for b in siblings if b["id"] != page_id]
+        for source in self._sources.values():
+            source["pages"] = [p for p in source["pages"] if p["id"] != page_id]
+
+    def _check_editable(self, block_id):
+        """휴지통에 있는 페이지(또는 그 안의 블록)를 고치려 하면 Notion처럼 400"""
+        while block_id is not None:
+            page = self._pages.get(block_id)
+            if page is not None and page["in_trash"]:
+                raise StubError(400, "validation_error",
+                                "Can't edit block that is archived. You must unarchive the block before editing.")
+            block_id = next((parent for parent, blocks in self._children.items()
+                             if any(b["id"] == block_id for b in blocks)), None)
+
+    def handle(self, endpoint, match, body, query):
+        with self._lock:
+            if endpoint == "users.me":
+                return {"object": "user", "id": new_id(), "type": "bot", "name": "bench"}
+
+            if endpoint == "pages.create":
+                page_id = new_id()
+                source_id = body["parent"].get("data_source_id")
+                parent_id = source_id or body["parent"].get("page_id")
+                self._pages[page_id] = {"id": page_id, "parent_id": parent_id, "in_trash": False}
+                if source_id:
+                    self._sources[source_id]["pages"].append(
+                        {"object": "page", "id": page_id, "properties": body.get("properties", {})}
+                    )
+                else:
+                    title = "".join(
+                        part.get("text", {}).get("content", "")
+                        for part in body.get("properties", {}).get("title", {}).get("title", [])
+                    )
+                    self._children.setdefault(parent_id, []).append(
+                        {"object": "block", "id": page_id, "type": "child_page", "child_page": {"title": title},
+                         "has_children": True, "archived": False, "in_trash": False}
+                    )
+                self._children[page_id] = []
+                self._store_children(page_id, body.get("children", []))
+                return {"object": "page", "id": page_id, "url": f"https://www.notion.so/{page_id.replace('-', '')}"}
+
+            if endpoint == "pages.retrieve":
+                page = self._pages.get(match.group(1))
+                if page is None:
+                    raise StubError(404, "object_not_found", f"Could not find page with ID: {match.group(1)}")
+                return {"object": "page", "id": page["id"], "archived": page["in_trash"],
+                        "in_trash": page["in_trash"]}
+
+            if endpoint == "pages.update":
+                if body.get("in_trash") or body.get("archived"):
+                    self._trash_page(match.group(1))
+                else:
+                    self._check_editable(match.group(1))
+                for source in self._sources.values():
+                    for page in source["pages"]:
+                        if page["id"] == match.group(1):
+                            page["properties"].update(body.get("properties", {}))
+                return {"object": "page", "id": match.group(1)}
+
+            if endpoint == "databases.retrieve":
+                database_id = match.group(1)
+                if database_id not in self._databases:
+                    source_id = new_id()
+                    self._databases[database_id] = source_id
+                    self._sources[source_id] = {"properties": {"이름": {"type": "title", "title": {}}}, "pages": []}
+                return {
+                    "object": "database", "id": database_id, "title": [],
+                    "data_sources": [{"id": self._databases[database_id], "name": "bench"}],
+                }
+
+            if endpoint == "data_sources.retrieve":
+                return {"object": "data_source", "id": match.group(1),
+                        "properties": self._sources[match.group(1)]["properties"]}
+
+            if endpoint == "data_sources.update":
+                properties = self._sources[match.group(1)]["properties"]
+                for name, schema in body.get("properties", {}).items():
+                    kind = next(iter(schema))
+                    properties[name] = {"type": kind, kind: schema[kind]}
+                return {"object": "data_source", "id": match.group(1), "properties": properties}
+
+            if endpoint == "data_sources.query":
+                condition = body.get("filter", {})
+                results = [
+                    page for page in self._sources[match.group(1)]["pages"]
+                    if not condition or page["properties"].get(condition["property"], {}).get("number")
+                    == condition["number"]["equals"]
+                ]
+                return cursor_page(results, body.get("start_cursor"), body.get("page_size", 100))
+
+            if endpoint == "blocks.children.list":
+                return cursor_page(
+                    self._children.get(match.group(1), []),
+                    query.get("start_cursor", [None])[0],
+                    int(query.get("page_size", ["100"])[0]),
+                )
+
+            if endpoint == "blocks.children.append":
+                self._check_editable(match.group(1))
+                stored = self._store_children(match.group(1), body.get("children", []), body.get("after"))
+                return {"object": "list", "results": stored, "has_more": False, "next_cursor": None}
+
+            if endpoint == "blocks.update":
+                block_id = match.group(1)
+                self._check_editable(block_id)
+                for blocks in self._children.values():
+                    for block in blocks:
+                        if block["id"] == block_id:
+                            block.update({key: filled_block_body(value) for key, value in body.items()})
+                            return block
+                return {"object": "block", "id": block_id}
+
+            if endpoint == "blocks.delete":
+                block_id = match.group(1)
+                self._trash_page(block_id)
+                for blocks in self._children.values():
+                    blocks[:] = [b for b in blocks if b["id"] != block_id]
+                return {"object": "block", "id": block_id, "archived": True, "in_trash": True}
+
+        raise KeyError(endpoint)
+
+
+def make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload, headers=None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self):
+            parsed = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+
+            for method, pattern, endpoint in ROUTES:
+                match = pattern.match(parsed.path)
+                if method == self.command and match:
+                    break
+            else:
+                self._send(404, {"object": "error", "status": 404, "code": "object_not_found",
+                                 "message": f"{self.command} {parsed.path}"})
+                return
+
+            stub.record(endpoint, len(raw))
+            if stub.latency:
+                time.sleep(stub.latency)
+            if stub.should_rate_limit():
+                self._send(429, {"object": "error", "status": 429, "code": "rate_limited",
+                                 "message": "Rate limited (bench stub)"},
+                           {"Retry-After": str(stub.retry_after)})
+                return
+
+            body = json.loads(raw) if raw else {}
+            try:
+                payload = stub.handle(endpoint, match, body, parse_qs(parsed.query))
+            except StubError as e:
+                self._send(e.status, {"object": "error", "status": e.status, "code": e.code, "message": str(e)})
+                return
+            self._send(200, payload)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+    return Handler
+
+
+def start_stub(stub, host="127.0.0.1", port=0):
+    """
+    대역 서버를 백그라운드 스레드로 시작
+
+    Returns:
+        tuple: (서버, base_url) - port=0이면 빈 포트를 자동으로 고름
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(stub))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="notion-stub", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notion API 로컬 대역 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="요청마다 추가할 지연 (ms)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429를 돌려줄 요청 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="429 응답의 Retry-After (초)")
+    args = parser.parse_args()
+
+    stub = NotionStub(args.latency_ms / 1000, args.rate_limit_ratio, args.retry_after)
+    server, base_url = start_stub(stub, port=args.port)
+    print(f"🧪 Notion 대역 서버: {base_url}  (NOTION_BASE_URL={base_url})")
+    try:
+        while True:
+            time.sleep(5)
+            print(json.dumps(stub.stats(), ensure_ascii=False))
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
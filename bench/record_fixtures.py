@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크 fixture 녹화
+
+저장소의 fixture는 백준 페이지 구조를 흉내 내 만든 합성 페이지입니다
+(small-1000, huge-2000, many_examples-3000, image_heavy-4000: 메뉴/링크 자리 표시 문구,
+임의의 문제 번호와 solved.ac 응답). 이 스크립트는 그 자리에 실제 백준 문제 페이지와
+solved.ac lookup 응답을 녹화해 bench/fixtures/에 저장합니다.
+같은 이름의 기존 fixture는 지우므로, 이름을 그대로 쓰면 합성 페이지가 실제 페이지로 바뀝니다.
+(네트워크가 필요하며, 벤치마크 실행 자체는 저장된 파일만 사용합니다.)
+
+사용법:
+    python bench/record_fixtures.py <이름>=<문제 번호> ...
+    python bench/record_fixtures.py small=1000
+"""
+
+import os
+import sys
+import json
+import glob
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from fetcher import fetch_problem_html, get_http_session
+from solved_ac import API_BASE, HTTP_TIMEOUT
+from batch import PROBLEM_URL
+
+
+def main():
+    entries = []
+    for arg in sys.argv[1:]:
+        name, _, problem_id = arg.partition("=")
+        if not problem_id.isdigit() or "-" in name:
+            sys.exit(f"❌ 형식이 올바르지 않습니다: {arg} (예: small=1000)")
+        entries.append((name, int(problem_id)))
+    if not entries:
+        sys.exit(__doc__)
+
+    for name, problem_id in entries:
+        for old in glob.glob(os.path.join(FIXTURE_DIR, f"{name}-*.html")):
+            os.remove(old)
+        html = fetch_problem_html(PROBLEM_URL.format(problem_id))
+        with open(os.path.join(FIXTURE_DIR, f"{name}-{problem_id}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"💾 {name}-{problem_id}.html ({len(html.encode('utf-8')):,} bytes)")
+
+    # 모든 fixture의 solved.ac 응답을 한 번에 다시 녹화
+    problem_ids = sorted(
+        int(os.path.basename(path)[:-len(".html")].rsplit("-", 1)[1])
+        for path in glob.glob(os.path.join(FIXTURE_DIR, "*.html"))
+    )
+    response = get_http_session().get(
+        f"{API_BASE}/problem/lookup",
+        params={"problemIds": ",".join(map(str, problem_ids))},
+        headers={"Accept": "application/json"},
+        timeout=HTTP_TIMEOUT
+    )
+    response.raise_for_status()
+    with open(os.path.join(FIXTURE_DIR, "solved_ac_lookup.json"), "w", encoding="utf-8") as f:
+        json.dump(response.json(), f, ensure_ascii=False, indent=2)
+    print(f"💾 solved_ac_lookup.json ({len(problem_ids)}문제)")
+
+
+if __name__ == "__main__":
+    main()
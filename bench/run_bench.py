@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+오프라인 벤치마크
+
+네트워크 없이 다음 항목을 측정하고 JSON으로 저장합니다.
+
+    parse        : 저장해 둔 문제 페이지(bench/fixtures/*.html) 파싱 시간
+    build_blocks : Notion 블록 생성 시간
+    end_to_end   : 파이프라인 전체 처리량 (문제/초)과 Notion API 호출 수
+                   (새 페이지 작성 + 예제 섹션 하나를 바꾼 뒤 --refresh 재실행)
+
+백준 페이지와 solved.ac 응답은 fixtures에 저장해 둔 값을 사용하고
+(백준 페이지 구조를 흉내 낸 합성 페이지, 실제 페이지로 바꾸려면 bench/record_fixtures.py),
+Notion은 로컬 대역 서버(bench/notion_stub.py)를 NOTION_BASE_URL로 연결해
+실제 notion-client 요청 경로 그대로 호출합니다. 이미지 확인은 외부 서버가 필요하므로 제외합니다.
+
+사용법:
+    python bench/run_bench.py                                  # 결과를 표준 출력으로
+    python bench/run_bench.py -o before.json                   # 파일로 저장
+    python bench/run_bench.py -o after.json --compare before.json
+    python bench/run_bench.py --latency-ms 150 --rate-limit-ratio 0.05 --rate 3
+"""
+
+import io
+import os
+import sys
+import json
+import glob
+import time
+import uuid
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import contextlib
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+# 복제한 문제 번호 간격 (1000 → 11000, 21000, ...)
+ID_STRIDE = 10000
+
+# 이 비율 이상 달라진 지표만 표시 (측정 잡음 감안)
+COMPARE_THRESHOLD = 0.10
+
+
+def load_fixtures():
+    """
+    저장해 둔 문제 페이지 로드
+
+    Returns:
+        dict: {이름: (문제 번호, HTML)}  파일 이름 형식은 "<이름>-<문제 번호>.html"
+    """
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        name, problem_id = os.path.basename(path)[:-len(".html")].rsplit("-", 1)
+        with open(path, encoding="utf-8") as f:
+            fixtures[name] = (int(problem_id), f.read())
+    return fixtures
+
+
+def load_solved_ac():
+    """저장해 둔 solved.ac lookup 응답 {problem_id: 문제 객체}"""
+    with open(os.path.join(FIXTURE_DIR, "solved_ac_lookup.json"), encoding="utf-8") as f:
+        return {item["problemId"]: item for item in json.load(f)}
+
+
+def time_calls(func, repeat):
+    """func를 repeat번 실행한 시간 (ms) 통계"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+    }
+
+
+def bench_parse(fixtures, repeat):
+    from scraper import parse_problem_html
+    from batch import PROBLEM_URL
+
+    results = {}
+    for name, (problem_id, html) in fixtures.items():
+        url = PROBLEM_URL.format(problem_id)
+        results[name] = {
+            "bytes": len(html.encode("utf-8")),
+            **time_calls(lambda: parse_problem_html(html, url), repeat),
+        }
+    return results
+
+
+def bench_build(fixtures, solved, repeat):
+    from scraper import parse_problem_html, build_problem_data
+    from solved_ac import parse_problem_info
+    from notion_api import build_problem_blocks
+    from batch import PROBLEM_URL
+
+    results = {}
+    for name, (problem_id, html) in fixtures.items():
+        page_data = parse_problem_html(html, PROBLEM_URL.format(problem_id))
+        problem_data = build_problem_data(page_data, parse_problem_info(solved[problem_id]))
+        results[name] = {
+            "blocks": len(build_problem_blocks(problem_data)),
+            **time_calls(lambda: build_problem_blocks(problem_data), repeat),
+        }
+    return results
+
+
+def bench_end_to_end(fixtures, solved, stub, copies, concurrency):
+    import pipeline
+    import solved_ac
+    from solved_ac import parse_problem_info
+    from scraper import get_problem_id, parse_problem_html
+    from batch import PROBLEM_URL, prefetch_metadata
+
+    html_by_id = {problem_id: html for problem_id, html in fixtures.values()}
+
+    def fetch_fixture(url, validators=None):
+        return html_by_id[get_problem_id(url) % ID_STRIDE], None
+
+    def lookup_fixture(problem_ids):
+        return {
+            pid: parse_problem_info(solved[pid % ID_STRIDE])
+            for pid in problem_ids if pid % ID_STRIDE in solved
+        }
+
+    def parse_with_changed_example(html, url):
+        # --refresh가 실제로 섹션 하나를 갱신하도록 마지막 예제 출력을 바꿈
+        page_data = parse_problem_html(html, url)
+        if page_data["examples"]:
+            last = page_data["examples"][-1]
+            page_data["examples"][-1] = {**last, "output": last["output"] + "\n(bench)"}
+        return page_data
+
+    pipeline.fetch_problem_page = fetch_fixture
+    pipeline.prefetch_images = lambda urls: {}
+    solved_ac._lookup_chunk = lookup_fixture
+
+    urls = [
+        PROBLEM_URL.format(problem_id + copy * ID_STRIDE)
+        for copy in range(copies)
+        for problem_id in sorted(html_by_id)
+    ]
+
+    def run(refresh):
+        pipeline.parse_problem_html = parse_with_changed_example if refresh else parse_problem_html
+        solved_ac._info_cache.clear()
+        stub.reset_stats()
+        log = io.StringIO()
+        start = time.perf_counter()
+        # 재시도 경고 등은 결과 JSON과 섞이지 않도록 따로 모음
+        with contextlib.redirect_stdout(log):
+            results = pipeline.process_problems(
+                prefetch_metadata(urls), concurrency=concurrency, refresh=refresh
+            )
+        elapsed = time.perf_counter() - start
+
+        stats = stub.stats()
+        statuses = {}
+        for result in results:
+            statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+        return {
+            "problems": len(results),
+            "statuses": statuses,
+            "errors": sorted({r["error"] for r in results if r["error"]})[:5],
+            "seconds": round(elapsed, 3),
+            "problems_per_sec": round(len(results) / elapsed, 2) if elapsed else None,
+            "api_calls": stats["api_calls"],
+            "api_calls_per_problem": round(stats["api_calls"] / len(results), 2) if results else None,
+            "by_endpoint": stats["by_endpoint"],
+            "rate_limited": stats["rate_limited"],
+            "request_bytes": stats["request_bytes"],
+        }
+
+    return {"create": run(refresh=False), "refresh": run(refresh=True)}
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def iter_metrics(report):
+    """비교할 지표: (이름, 값, 클수록 좋은지)"""
+    for section in ("parse", "build_blocks"):
+        for name, values in report.get(section, {}).items():
+            yield f"{section}.{name}.median_ms", values["median_ms"], False
+    for run, values in report.get("end_to_end", {}).items():
+        yield f"end_to_end.{run}.problems_per_sec", values["problems_per_sec"], True
+        yield f"end_to_end.{run}.api_calls_per_problem", values["api_calls_per_problem"], False
+
+
+def print_comparison(baseline, report):
+    """이전 결과와 지표별 비교 출력 (표준 에러)"""
+    old = {key: value for key, value, _ in iter_metrics(baseline)}
+    print(f"\n📊 {baseline['meta'].get('commit')} → {report['meta'].get('commit')}", file=sys.stderr)
+    for key, value, higher_is_better in iter_metrics(report):
+        before = old.get(key)
+        if not before or value is None:
+            continue
+        ratio = value / before
+        better = ratio > 1 if higher_is_better else ratio < 1
+        changed = abs(ratio - 1) > COMPARE_THRESHOLD
+        mark = ("✅" if better else "⚠️") if changed else "  "
+        print(f"  {mark} {key:<45} {before:>10} → {value:>10}  ({ratio:.2f}x)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크 (저장해 둔 페이지 + Notion 대역 서버)")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로 (기본: 표준 출력)")
+    parser.add_argument("--compare", metavar="JSON", help="비교할 이전 결과 JSON")
+    parser.add_argument("--repeat", type=int, default=20, help="파싱/블록 생성 반복 횟수 (기본: 20)")
+    parser.add_argument("--copies", type=int, default=5, help="end-to-end에서 fixture를 복제할 횟수 (기본: 5)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Notion 대역 서버 응답 지연 (ms)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429를 돌려줄 요청 비율 (0~1)")
+    parser.add_argument("--rate", type=float, default=1000.0,
+                        help="Notion 초당 요청 수 제한 (기본: 1000, 실제 제한을 재현하려면 3)")
+    parser.add_argument("--write-workers", type=int, help="write 단계 동시 실행 수")
+    parser.add_argument("--skip-e2e", action="store_true", help="파싱/블록 생성만 측정")
+    args = parser.parse_args()
+
+    from notion_stub import NotionStub, start_stub
+
+    stub = NotionStub(args.latency_ms / 1000, args.rate_limit_ratio)
+    server, base_url = start_stub(stub)
+
+    # 설정은 모듈을 불러올 때 읽으므로 그 전에 환경 변수로 지정 (.env보다 우선)
+    cache_dir = tempfile.mkdtemp(prefix="boj-bench-")
+    os.environ.update({
+        "NOTION_TOKEN": "bench",
+        "NOTION_PARENT_PAGE_ID": str(uuid.uuid4()),
+        "NOTION_BASE_URL": base_url,
+        "NOTION_RATE_LIMIT": str(args.rate),
+        "CACHE_DIR": cache_dir,
+    })
+
+    import cache
+    cache.configure_cache(cache.CACHE_OFF)
+
+    fixtures = load_fixtures()
+    solved = load_solved_ac()
+
+    report = {
+        "meta": {
+            "commit": git_revision(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+            "copies": args.copies,
+            "latency_ms": args.latency_ms,
+            "rate_limit_ratio": args.rate_limit_ratio,
+            "rate": args.rate,
+        },
+        "parse": bench_parse(fixtures, args.repeat),
+        "build_blocks": bench_build(fixtures, solved, args.repeat),
+    }
+    if not args.skip_e2e:
+        concurrency = {"write": args.write_workers} if args.write_workers else None
+        report["end_to_end"] = bench_end_to_end(fixtures, solved, stub, args.copies, concurrency)
+
+    server.shutdown()
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"💾 {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
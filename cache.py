@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+문제 캐시 모듈
+
+scrape_problem 결과를 SQLite 파일에 저장해 두고 재실행 시 재사용합니다.
+자주 바뀌지 않는 정적 필드(문제 설명, 예제, 제한)와
+자주 바뀌는 통계 필드(제출, 정답, 정답 비율, 티어)의 유효 기간을 따로 관리하고,
+각 부분의 내용 해시를 함께 저장합니다.
+통계 필드만 만료된 문제는 정적 필드를 그대로 두고 통계 필드만 다시 가져와 저장합니다
+(정적 필드를 가져온 시각도 그대로이므로 정적 필드는 CACHE_STATIC_TTL_HOURS가 지나야 다시 가져옴).
+
+HTTP 응답의 검증자(ETag, Last-Modified)도 URL별로 저장해 두고,
+유효 기간이 지난 뒤에는 조건부 요청으로 바뀌었는지만 확인합니다 (304면 저장된 내용 재사용).
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+from config import CACHE_DIR, CACHE_STATIC_TTL_HOURS, CACHE_VOLATILE_TTL_HOURS
+from profiler import timed
+
+
+# 캐시 모드
+CACHE_USE = "use"            # 캐시 읽기 + 쓰기 (기본값)
+CACHE_REFRESH = "refresh"    # 캐시 무시하고 새로 가져와서 덮어쓰기
+CACHE_OFF = "off"            # 캐시 사용 안 함
+
+# 자주 바뀌는 필드 (나머지는 모두 정적 필드로 취급)
+VOLATILE_FIELDS = ("submissions", "accepted", "users", "accuracy", "tier", "tier_level", "tags")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    problem_id INTEGER PRIMARY KEY,
+    static_json TEXT NOT NULL,
+    static_hash TEXT NOT NULL,
+    static_fetched_at REAL NOT NULL,
+    volatile_json TEXT NOT NULL,
+    volatile_hash TEXT NOT NULL,
+    volatile_fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    payload TEXT,
+    stored_at REAL NOT NULL
+);
+"""
+
+
+def content_hash(data):
+    """딕셔너리 내용의 해시 (키 순서와 무관)"""
+    encoded = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def split_fields(problem_data):
+    """문제 딕셔너리를 (정적 필드, 통계 필드)로 분리"""
+    static = {k: v for k, v in problem_data.items() if k not in VOLATILE_FIELDS}
+    volatile = {k: v for k, v in problem_data.items() if k in VOLATILE_FIELDS}
+    return static, volatile
+
+
+class ProblemCache:
+    """
+    problem_id 기준 SQLite 문제 캐시
+
+    두 부분이 모두 유효 기간 안에 있을 때만 캐시 적중으로 보고,
+    정적 필드만 유효하면 load_static()으로 정적 필드를 재사용할 수 있습니다.
+    """
+
+    def __init__(self, path, static_ttl=CACHE_STATIC_TTL_HOURS * 3600,
+                 volatile_ttl=CACHE_VOLATILE_TTL_HOURS * 3600):
+        self.path = path
+        self.static_ttl = static_ttl
+        self.volatile_ttl = volatile_ttl
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def load(self, problem_id, ignore_ttl=False):
+        """
+        캐시에서 문제 읽기
+
+        Args:
+            ignore_ttl: True면 유효 기간이 지난 항목도 반환 (조건부 요청이 304일 때 재사용)
+
+        Returns:
+            dict or None: 유효한 캐시가 있으면 문제 딕셔너리, 없거나 만료되면 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT static_json, static_fetched_at, volatile_json, volatile_fetched_at "
+                "FROM problems WHERE problem_id = ?",
+                (problem_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        static_json, static_at, volatile_json, volatile_at = row
+        now = time.time()
+        if not ignore_ttl and (now - static_at > self.static_ttl or now - volatile_at > self.volatile_ttl):
+            return None
+
+        problem_data = json.loads(static_json)
+        problem_data.update(json.loads(volatile_json))
+        return problem_data
+
+    def load_static(self, problem_id):
+        """
+        정적 필드 읽기 (통계 필드의 유효 기간과 무관)
+
+        Returns:
+            dict or None: 정적 필드가 유효 기간 안이면 정적 필드 딕셔너리, 아니면 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT static_json, static_fetched_at FROM problems WHERE problem_id = ?",
+                (problem_id,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > self.static_ttl:
+            return None
+        return json.loads(row[0])
+
+    def is_fresh(self, problem_id):
+        """유효한 캐시가 있는지 확인 (내용은 읽지 않음)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT static_fetched_at, volatile_fetched_at FROM problems WHERE problem_id = ?",
+                (problem_id,)
+            ).fetchone()
+
+        if row is None:
+            return False
+        now = time.time()
+        return now - row[0] <= self.static_ttl and now - row[1] <= self.volatile_ttl
+
+    def store(self, problem_data, keep_static=False):
+        """
+        문제 저장 (내용이 바뀌지 않은 부분은 가져온 시각만 갱신)
+
+        Args:
+            keep_static: True면 (통계 필드만 새로 가져온 경우) 저장된 정적 필드와 가져온 시각을 그대로 둠
+
+        Returns:
+            dict: {"static": bool, "volatile": bool} 각 부분의 내용 변경 여부
+        """
+        static, volatile = split_fields(problem_data)
+        static_hash = content_hash(static)
+        volatile_hash = content_hash(volatile)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT static_hash, volatile_hash FROM problems WHERE problem_id = ?",
+                (problem_data["problem_id"],)
+            ).fetchone()
+
+            changed = {
+                "static": row is None or row[0] != static_hash,
+                "volatile": row is None or row[1] != volatile_hash,
+            }
+
+            if keep_static and row is not None:
+                self._conn.execute(
+                    "UPDATE problems SET volatile_json = ?, volatile_hash = ?, volatile_fetched_at = ? "
+                    "WHERE problem_id = ?",
+                    (json.dumps(volatile, ensure_ascii=False), volatile_hash, now, problem_data["problem_id"])
+                )
+                self._conn.commit()
+                return dict(changed, static=False)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO problems VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    problem_data["problem_id"],
+                    json.dumps(static, ensure_ascii=False), static_hash, now,
+                    json.dumps(volatile, ensure_ascii=False), volatile_hash, now,
+                )
+            )
+            self._conn.commit()
+
+        return changed
+
+    def load_validators(self, url):
+        """
+        URL의 검증자 읽기
+
+        Returns:
+            tuple or None: ({"etag", "last_modified"}, payload) 저장된 적이 없으면 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, payload FROM validators WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        payload = json.loads(row[2]) if row[2] is not None else None
+        return {"etag": row[0], "last_modified": row[1]}, payload
+
+    def store_validators(self, url, validators, payload=None):
+        """URL의 검증자 저장 (payload는 304 응답일 때 대신 쓸 내용)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO validators VALUES (?, ?, ?, ?, ?)",
+                (
+                    url, validators.get("etag"), validators.get("last_modified"),
+                    json.dumps(payload, ensure_ascii=False) if payload is not None else None,
+                    time.time(),
+                )
+            )
+            self._conn.commit()
+
+    def forget_validators(self, url):
+        """URL의 검증자 삭제 (다음 요청은 조건부 요청이 아님)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM validators WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def prune(self):
+        """
+        정적 필드 유효 기간이 지난 항목 삭제
+
+        Returns:
+            int: 삭제한 항목 수
+        """
+        cutoff = time.time() - self.static_ttl
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM problems WHERE static_fetched_at < ?", (cutoff,)
+            )
+            self._conn.commit()
+            deleted = cursor.rowcount
+            self._conn.execute("DELETE FROM validators WHERE stored_at < ?", (cutoff,))
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        return deleted
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_mode = CACHE_USE
+
+
+def configure_cache(mode=CACHE_USE):
+    """캐시 모드 설정 (use / refresh / off)"""
+    global _mode
+    if mode not in (CACHE_USE, CACHE_REFRESH, CACHE_OFF):
+        raise ValueError(f"알 수 없는 캐시 모드입니다: {mode}")
+    _mode = mode
+
+
+def get_cache_mode():
+    """현재 캐시 모드"""
+    return _mode
+
+
+def get_problem_cache():
+    """전역 문제 캐시 반환 (최초 호출 시 파일 열기)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ProblemCache(os.path.join(CACHE_DIR, "problems.sqlite3"))
+        return _cache
+
+
+@timed("cache.load")
+def load_cached_problem(problem_id):
+    """캐시 모드에 따라 캐시된 문제 반환 (없거나 사용하지 않으면 None)"""
+    if _mode != CACHE_USE:
+        return None
+    return get_problem_cache().load(problem_id)
+
+
+def load_cached_static(problem_id):
+    """캐시 모드에 따라 유효 기간 안의 정적 필드 반환 (통계 필드만 만료된 문제에 사용, 없으면 None)"""
+    if _mode != CACHE_USE:
+        return None
+    return get_problem_cache().load_static(problem_id)
+
+
+def is_problem_cached(problem_id):
+    """캐시 모드에 따라 유효한 캐시가 있는지 확인"""
+    if _mode != CACHE_USE:
+        return False
+    return get_problem_cache().is_fresh(problem_id)
+
+
+def store_problem(problem_data, keep_static=False):
+    """캐시 모드에 따라 문제 저장 (off 모드면 아무것도 하지 않고 None)"""
+    if _mode == CACHE_OFF:
+        return None
+    return get_problem_cache().store(problem_data, keep_static)
+
+
+def load_stale_problem(problem_id):
+    """
+    유효 기간과 관계없이 캐시된 문제 반환 (조건부 요청이 304일 때 재사용할 내용)
+
+    off 모드면 None
+    """
+    if _mode == CACHE_OFF:
+        return None
+    return get_problem_cache().load(problem_id, ignore_ttl=True)
+
+
+def load_validators(url):
+    """캐시 모드에 따라 URL의 검증자와 내용 반환 (없거나 off 모드면 None)"""
+    if _mode == CACHE_OFF:
+        return None
+    return get_problem_cache().load_validators(url)
+
+
+def store_validators(url, validators, payload=None):
+    """캐시 모드에 따라 URL의 검증자 저장 (검증자가 없는 응답이면 저장하지 않음)"""
+    if _mode == CACHE_OFF or not validators:
+        return
+    get_problem_cache().store_validators(url, validators, payload)
+
+
+def forget_validators(url):
+    """캐시 모드에 따라 URL의 검증자 삭제"""
+    if _mode == CACHE_OFF:
+        return
+    get_problem_cache().forget_validators(url)
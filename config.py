@@ -3,28 +3,97 @@
 환경 변수 관리 모듈
 
 .env 파일에서 Notion API 토큰과 데이터베이스 ID를 로드합니다.
+
+.env 파일은 설정 값을 처음 읽을 때 한 번만 로드합니다 (모듈 __getattr__).
+--help처럼 설정이 필요 없는 실행은 python-dotenv를 불러오지도 않습니다.
 """
 
 import os
-from dotenv import load_dotenv
 
-# .env 파일 로드
-load_dotenv()
 
-# Notion API 설정
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_PARENT_PAGE_ID = os.getenv("NOTION_PARENT_PAGE_ID")
+# 파이프라인 단계별 기본 동시 실행 수 (.env와 무관한 기본값)
+DEFAULT_CONCURRENCY = {
+    "fetch": 4,
+    "parse": 2,
+    "meta": 4,
+    "write": 2,
+}
+
+_loaded = False
+
+
+def _read_settings():
+    """환경 변수에서 설정 값 읽기"""
+    return {
+        # Notion API 설정
+        "NOTION_TOKEN": os.getenv("NOTION_TOKEN"),
+        "NOTION_PARENT_PAGE_ID": os.getenv("NOTION_PARENT_PAGE_ID"),
+        "NOTION_DATABASE_ID": os.getenv("NOTION_DATABASE_ID"),     # 설정하면 부모 페이지 대신 데이터베이스에 작성
+        "NOTION_BASE_URL": os.getenv("NOTION_BASE_URL"),     # 비워 두면 https://api.notion.com
+
+        # Chrome 드라이버 풀 설정
+        "CHROME_POOL_SIZE": int(os.getenv("CHROME_POOL_SIZE", "1")),      # 동시에 띄워 둘 브라우저 수
+        "CHROME_MAX_PAGES": int(os.getenv("CHROME_MAX_PAGES", "50")),     # 브라우저 재시작 주기 (페이지 수)
+
+        # Notion API 호출 제한 (Notion 제한: 평균 초당 3회)
+        "NOTION_RATE_LIMIT": float(os.getenv("NOTION_RATE_LIMIT", "2.5")),   # 초당 요청 수
+        "NOTION_MAX_RETRIES": int(os.getenv("NOTION_MAX_RETRIES", "5")),     # 429/5xx/타임아웃 재시도 횟수
+
+        # 상주 모드 (localhost HTTP 포트)
+        "DAEMON_PORT": int(os.getenv("DAEMON_PORT", "8788")),
+
+        # HTML 파서 (html.parser / lxml / auto: lxml이 설치되어 있으면 lxml)
+        # lxml은 bench/bench_parse.py의 결과 비교를 통과한 경우에만 지정
+        "HTML_PARSER": os.getenv("HTML_PARSER", "html.parser"),
+        # 파싱 프로세스 수 (0: parse 단계 스레드에서 파싱, auto: CPU 코어 수)
+        "PARSE_PROCESSES": os.getenv("PARSE_PROCESSES", "0"),
+
+        # 문제 이미지 확인 설정
+        "IMAGE_WORKERS": int(os.getenv("IMAGE_WORKERS", "4")),                          # 동시에 내려받을 이미지 수
+        "IMAGE_MAX_BYTES": int(os.getenv("IMAGE_MAX_BYTES", str(20 * 1024 * 1024))),    # 이미지 최대 크기
+        "IMAGE_WAIT_TIMEOUT": float(os.getenv("IMAGE_WAIT_TIMEOUT", "5")),              # 페이지 작성 전 최대 대기 (초)
+
+        # 로컬 캐시 설정
+        "CACHE_DIR": os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")),
+        "CACHE_STATIC_TTL_HOURS": float(os.getenv("CACHE_STATIC_TTL_HOURS", str(24 * 30))),   # 문제 설명/예제/제한
+        "CACHE_VOLATILE_TTL_HOURS": float(os.getenv("CACHE_VOLATILE_TTL_HOURS", "24")),       # 제출/정답/티어
+        "TAG_CACHE_TTL_HOURS": float(os.getenv("TAG_CACHE_TTL_HOURS", str(24 * 7))),         # solved.ac 태그 목록
+    }
+
+
+def load():
+    """.env 파일을 로드하고 설정 값을 모듈 속성으로 등록 (한 번만)"""
+    global _loaded
+    if _loaded:
+        return
+    from dotenv import load_dotenv
+
+    # .env 파일 로드
+    load_dotenv()
+    globals().update(_read_settings())
+    _loaded = True
+
+
+def __getattr__(name):
+    # 아직 로드하지 않은 설정 값에 처음 접근할 때 .env 로드
+    if not _loaded and not name.startswith("__"):
+        load()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def validate_config():
     """환경 변수가 제대로 설정되었는지 확인"""
+    load()
+    settings = globals()
     errors = []
     
-    if not NOTION_TOKEN:
+    if not settings.get("NOTION_TOKEN"):
         errors.append("NOTION_TOKEN이 설정되지 않았습니다.")
     
-    if not NOTION_PARENT_PAGE_ID:
-        errors.append("NOTION_PARENT_PAGE_ID가 설정되지 않았습니다.")
+    if not settings.get("NOTION_PARENT_PAGE_ID") and not settings.get("NOTION_DATABASE_ID"):
+        errors.append("NOTION_PARENT_PAGE_ID 또는 NOTION_DATABASE_ID가 설정되지 않았습니다.")
     
     if errors:
         print("❌ 환경 변수 설정 오류:")
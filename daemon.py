@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+"""
+상주(daemon) 모드 모듈
+
+한 번 띄워 두면 Notion 클라이언트, 중복 인덱스, HTTP 세션, Chrome 드라이버 풀을
+프로세스 안에 유지한 채 localhost HTTP로 작업을 받습니다.
+main.py는 데몬이 떠 있으면 작업만 넘기고 진행 상황을 받아서 출력하는 얇은 클라이언트가 됩니다.
+
+    POST /jobs       {"urls": [...], "solved_by": {...}, "concurrency": {...}, "refresh": false}
+                     → 진행 이벤트를 한 줄에 하나씩 JSON으로 스트리밍 (NDJSON)
+    GET  /status     → 데몬 상태
+    POST /shutdown   → 데몬 종료
+
+보안을 위해 127.0.0.1에만 바인딩하고, 다른 프로그램(브라우저에 열린 웹 페이지 등)이
+작업을 넘기지 못하도록 모든 요청을 확인합니다.
+
+    - 데몬을 시작할 때 임의의 토큰을 CACHE_DIR/daemon-<포트>.token(권한 0600)에 쓰고,
+      요청마다 X-Daemon-Token 헤더로 같은 토큰을 요구합니다.
+    - Host 헤더가 localhost/127.0.0.1이 아니면 거절합니다 (DNS 리바인딩 방지).
+    - POST는 Content-Type이 application/json이어야 합니다.
+    - 작업 요청의 필드 형식이 맞지 않으면 400으로 거절합니다.
+"""
+
+import os
+import hmac
+import importlib
+import json
+import time
+import secrets
+import threading
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import CACHE_DIR
+
+
+SERVICE_NAME = "baekjoon-notion"
+DAEMON_HOST = "127.0.0.1"
+ALLOWED_HOSTS = ("127.0.0.1", "localhost")
+TOKEN_HEADER = "X-Daemon-Token"
+
+# 데몬이 떠 있는지 확인할 때 기다리는 시간 (초)
+PROBE_TIMEOUT = 0.5
+
+
+class JobError(Exception):
+    """데몬이 작업을 거절한 경우 (잘못된 요청 등)"""
+
+
+def token_path(port):
+    return os.path.join(CACHE_DIR, f"daemon-{port}.token")
+
+
+def write_token(port):
+    """새 토큰을 만들어 소유자만 읽을 수 있는 파일에 저장"""
+    token = secrets.token_hex(32)
+    path = token_path(port)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    os.replace(temp_path, path)
+    return token
+
+
+def read_token(port):
+    """데몬 토큰 읽기 (파일이 없으면 None)"""
+    try:
+        with open(token_path(port), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def remove_token(port, token):
+    """데몬이 쓴 토큰 파일 삭제 (다른 데몬이 새로 쓴 파일은 그대로)"""
+    if read_token(port) == token:
+        try:
+            os.remove(token_path(port))
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# 서버
+# ---------------------------------------------------------------------------
+
+def validate_job(job):
+    """
+    POST /jobs 요청 본문 확인
+
+    Returns:
+        str or None: 잘못된 요청이면 오류 메시지, 올바르면 None
+    """
+    from pipeline import STAGES
+
+    if not isinstance(job, dict):
+        return "요청 본문은 JSON 객체여야 합니다."
+    urls = job.get("urls", [])
+    if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+        return "urls는 문자열 목록이어야 합니다."
+    solved_by = job.get("solved_by")
+    if solved_by is not None:
+        if not isinstance(solved_by, dict) or not isinstance(solved_by.get("handle"), str):
+            return "solved_by에는 문자열 handle이 있어야 합니다."
+        if any(solved_by.get(key) is not None and not isinstance(solved_by[key], str) for key in ("tier", "tag")):
+            return "solved_by의 tier/tag는 문자열이어야 합니다."
+    concurrency = job.get("concurrency")
+    if concurrency is not None:
+        if not isinstance(concurrency, dict) or any(
+            stage not in STAGES or isinstance(n, bool) or not isinstance(n, int) or n < 1
+            for stage, n in concurrency.items()
+        ):
+            return f"concurrency는 {{단계: 1 이상의 정수}} 객체여야 합니다 (단계: {', '.join(STAGES)})."
+    if not isinstance(job.get("refresh", False), bool):
+        return "refresh는 true/false여야 합니다."
+    return None
+
+
+def event_payload(event, item):
+    """파이프라인 이벤트를 클라이언트로 보낼 JSON 객체로 변환"""
+    payload = {"event": event, "index": item["index"], "url": item["url"]}
+    if event == "scraped":
+        problem_data = item["problem_data"]
+        payload.update(
+            title=problem_data["title"],
+            tier=problem_data["tier"],
+            tags=problem_data.get("tags", []),
+        )
+    elif event == "done":
+        payload["result"] = item["result"]
+    return payload
+
+
+class DaemonServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port, token):
+        super().__init__((DAEMON_HOST, port), DaemonHandler)
+        self.token = token
+        self.started_at = time.time()
+        self.jobs = 0
+        self.jobs_lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+
+    def next_job_id(self):
+        with self.jobs_lock:
+            self.jobs += 1
+            return self.jobs
+
+    def sync_index(self):
+        """다른 곳에서 만든 페이지를 반영하도록 작업마다 중복 인덱스 증분 동기화"""
+        from notion_api import get_notion_client
+        from duplicate_index import get_duplicate_index
+
+        with self.sync_lock:
+            client = get_notion_client()
+            get_duplicate_index(client).sync(client)
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    server_version = "BaekjoonNotionDaemon"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self):
+        """Host, 토큰(, POST면 Content-Type) 확인 후 거절했으면 False"""
+        host, _, port = (self.headers.get("Host") or "").rpartition(":")
+        if not host or not port.isdigit():
+            host, port = self.headers.get("Host") or "", ""
+        if host not in ALLOWED_HOSTS or (port and int(port) != self.server.server_address[1]):
+            self._send_json(403, {"error": "localhost로 보낸 요청만 받습니다."})
+            return False
+        token = self.headers.get(TOKEN_HEADER) or ""
+        if not hmac.compare_digest(token.encode("utf-8"), self.server.token.encode("utf-8")):
+            self._send_json(403, {"error": "데몬 토큰이 올바르지 않습니다."})
+            return False
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if self.command == "POST" and content_type != "application/json":
+            self._send_json(415, {"error": "Content-Type은 application/json이어야 합니다."})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path != "/status":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        from duplicate_index import get_duplicate_index
+        self._send_json(200, {
+            "service": SERVICE_NAME,
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.server.started_at, 1),
+            "jobs": self.server.jobs,
+            "indexed_pages": len(get_duplicate_index()),
+        })
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path == "/shutdown":
+            self._send_json(200, {"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if self.path != "/jobs":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            job = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "잘못된 JSON 요청입니다."})
+            return
+        error = validate_job(job)
+        if error:
+            self._send_json(400, {"error": error})
+            return
+        self._run_job(job)
+
+    def _run_job(self, job):
+        from pipeline import process_problems
+        from batch import iter_targets, prefetch_metadata
+
+        job_id = self.server.next_job_id()
+        solved_by = job.get("solved_by")
+        solved_ids = None
+        if solved_by:
+            from solved_ac import iter_solved_problems
+            solved_ids = iter_solved_problems(
+                solved_by["handle"], tier=solved_by.get("tier"), tag=solved_by.get("tag")
+            )
+
+        try:
+            self.server.sync_index()
+        except Exception as e:
+            print(f"⚠️ 중복 인덱스 동기화 실패 (기존 인덱스 사용): {e}")
+
+        # 진행 이벤트 스트리밍 (HTTP/1.0: 응답이 끝나면 연결을 닫아 끝을 알림)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.end_headers()
+
+        disconnected = False
+
+        def send(payload):
+            nonlocal disconnected
+            if disconnected:
+                return
+            try:
+                self.wfile.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except OSError:
+                # 클라이언트가 끊겨도 작업은 끝까지 진행
+                disconnected = True
+
+        print(f"📥 작업 #{job_id} 시작")
+        started = time.perf_counter()
+        try:
+            results = process_problems(
+                prefetch_metadata(iter_targets(job.get("urls", []), None, solved_ids)),
+                concurrency=job.get("concurrency"),
+                on_event=lambda event, item: send(event_payload(event, item)),
+                refresh=job.get("refresh", False),
+            )
+        except Exception as e:
+            send({"event": "error", "error": str(e)})
+            print(f"❌ 작업 #{job_id} 실패: {e}")
+            return
+
+        elapsed = time.perf_counter() - started
+        send({"event": "end", "elapsed": elapsed})
+        failed = sum(1 for r in results if r["status"] == "failed")
+        print(f"📤 작업 #{job_id} 완료: {len(results)}문제, 실패 {failed} ({elapsed:.1f}s)")
+
+
+def warm_up():
+    """요청을 받기 전에 Notion 클라이언트, 중복 인덱스, HTTP 세션 준비"""
+    from notion_api import get_notion_client
+    from duplicate_index import get_duplicate_index
+    from fetcher import get_http_session
+    # 파서, 파이프라인 모듈을 미리 불러옴
+    importlib.import_module("pipeline")
+
+    client = get_notion_client()
+    index = get_duplicate_index(client)
+    get_http_session()
+    return len(index)
+
+
+def serve(port):
+    """데몬 실행 (Ctrl+C 또는 POST /shutdown으로 종료)"""
+    print("🔥 데몬 준비 중...")
+    indexed = warm_up()
+    token = write_token(port)
+    server = DaemonServer(port, token)
+    print(f"✅ 데몬 실행 중: http://{DAEMON_HOST}:{port}  (등록된 문제 {indexed}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        remove_token(port, token)
+        print("👋 데몬 종료")
+
+
+# ---------------------------------------------------------------------------
+# 클라이언트
+# ---------------------------------------------------------------------------
+
+def _connection(port, timeout=None):
+    return http.client.HTTPConnection(DAEMON_HOST, port, timeout=timeout)
+
+
+def _headers(token):
+    return {"Content-Type": "application/json", TOKEN_HEADER: token}
+
+
+def get_daemon_status(port):
+    """
+    데몬 상태 조회
+
+    Returns:
+        dict or None: 데몬이 떠 있으면 상태, 아니면 None (토큰 파일이 없어도 None)
+    """
+    token = read_token(port)
+    if token is None:
+        return None
+    conn = _connection(port, timeout=PROBE_TIMEOUT)
+    try:
+        conn.request("GET", "/status", headers=_headers(token))
+        response = conn.getresponse()
+        if response.status != 200:
+            return None
+        status = json.loads(response.read())
+    except (OSError, ValueError, http.client.HTTPException):
+        return None
+    finally:
+        conn.close()
+    return status if status.get("service") == SERVICE_NAME else None
+
+
+def stop_daemon(port):
+    """데몬 종료 요청 (떠 있지 않았으면 False)"""
+    token = read_token(port)
+    if token is None:
+        return False
+    conn = _connection(port, timeout=PROBE_TIMEOUT)
+    try:
+        conn.request("POST", "/shutdown", body=b"{}", headers=_headers(token))
+        return conn.getresponse().status == 200
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        conn.close()
+
+
+def error_message(response):
+    """오류 응답에서 메시지 추출 (JSON이 아니면 본문 또는 상태 줄)"""
+    body = response.read()
+    try:
+        error = json.loads(body).get("error")
+    except (ValueError, AttributeError):
+        error = body.decode("utf-8", "replace").strip()[:200]
+    return error or f"HTTP {response.status} {response.reason}"
+
+
+def submit_job(port, urls, solved_by=None, concurrency=None, refresh=False):
+    """
+    데몬에 작업을 넘기고 진행 이벤트를 받는 대로 반환
+
+    Yields:
+        dict: {"event": "start" | "scraped" | "write" | "done" | "end", ...}
+
+    Raises:
+        JobError: 데몬이 작업을 거절했거나 도중에 실패한 경우
+    """
+    body = json.dumps({
+        "urls": urls,
+        "solved_by": solved_by,
+        "concurrency": concurrency,
+        "refresh": refresh,
+    }).encode("utf-8")
+
+    token = read_token(port)
+    if token is None:
+        raise JobError("데몬 토큰 파일이 없습니다.")
+    conn = _connection(port)
+    try:
+        conn.request("POST", "/jobs", body=body, headers=_headers(token))
+        response = conn.getresponse()
+        if response.status != 200:
+            raise JobError(error_message(response))
+
+        for line in response:
+            event = json.loads(line)
+            if event["event"] == "error":
+                raise JobError(event["error"])
+            yield event
+    finally:
+        conn.close()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Chrome 드라이버 풀 모듈
+
+headless Chrome을 미리 띄워 두고 크롤링 호출마다 빌려줍니다.
+브라우저 실행 비용을 문제마다가 아니라 워커마다 한 번만 지불합니다.
+"""
+
+import atexit
+import threading
+from contextlib import contextmanager
+
+from config import CHROME_POOL_SIZE, CHROME_MAX_PAGES
+from profiler import timed
+
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+class DriverPool:
+    """
+    headless Chrome 드라이버 풀
+
+    - 최대 size개의 브라우저를 유지하며 lease()로 빌려줍니다.
+    - 한 브라우저가 max_pages 페이지를 처리하면 종료 후 새로 띄웁니다.
+    - 브라우저가 죽으면(WebDriverException) 풀에 반납하지 않고 폐기합니다.
+    """
+
+    def __init__(self, size=CHROME_POOL_SIZE, max_pages=CHROME_MAX_PAGES):
+        if size < 1:
+            raise ValueError("드라이버 풀 크기는 1 이상이어야 합니다.")
+        self.size = size
+        self.max_pages = max_pages
+
+        self._cond = threading.Condition()
+        self._idle = []        # [(driver, 처리한 페이지 수)]
+        self._active = 0       # 현재 살아 있는 브라우저 수 (대여 중 + 대기 중)
+        self._closed = False
+        self._driver_path = None
+
+    @timed("browser.launch")
+    def _create_driver(self):
+        """새 headless Chrome 실행"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+
+        # chromedriver 경로는 한 번만 확인
+        if self._driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            self._driver_path = ChromeDriverManager().install()
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # 브라우저 창 숨김
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
+
+        return webdriver.Chrome(service=Service(self._driver_path), options=chrome_options)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("드라이버 풀이 이미 종료되었습니다.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._active < self.size:
+                    self._active += 1
+                    break
+                self._cond.wait()
+
+        # 브라우저 실행은 락 밖에서 (다른 워커를 막지 않도록)
+        try:
+            return self._create_driver(), 0
+        except Exception:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, driver, pages, broken):
+        recycle = broken or pages >= self.max_pages
+        with self._cond:
+            if recycle or self._closed:
+                self._active -= 1
+            else:
+                self._idle.append((driver, pages))
+            self._cond.notify()
+
+        if recycle or self._closed:
+            self._quit(driver)
+
+    @contextmanager
+    def lease(self):
+        """
+        브라우저 하나를 빌려 사용
+
+        사용 예:
+            with pool.lease() as driver:
+                driver.get(url)
+        """
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        driver, pages = self._acquire()
+        broken = False
+        try:
+            yield driver
+        except TimeoutException:
+            # 페이지 로드 대기 시간 초과는 브라우저 문제가 아님
+            raise
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self._release(driver, pages + 1, broken)
+
+    def shutdown(self):
+        """대기 중인 모든 브라우저 종료 (대여 중인 브라우저는 반납 시 종료)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._active -= len(idle)
+            self._cond.notify_all()
+
+        for driver, _ in idle:
+            self._quit(driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_driver_pool(size=CHROME_POOL_SIZE, max_pages=CHROME_MAX_PAGES):
+    """
+    전역 드라이버 풀 설정 (기존 풀이 있으면 종료 후 교체)
+
+    Args:
+        size: 동시에 유지할 브라우저 수
+        max_pages: 브라우저 하나가 처리할 최대 페이지 수 (이후 재시작)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = DriverPool(size=size, max_pages=max_pages)
+    return _pool
+
+
+def get_driver_pool():
+    """전역 드라이버 풀 반환 (최초 호출 시 기본 설정으로 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+        return _pool
+
+
+def shutdown_driver_pool():
+    """전역 드라이버 풀 종료"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+# 프로세스 종료 시 남은 브라우저 정리
+atexit.register(shutdown_driver_pool)
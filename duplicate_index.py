@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+중복 문제 인덱스 모듈
+
+부모 페이지의 하위 페이지를 한 번 끝까지 훑어서
+problem_id → page_id 매핑을 로컬 SQLite 파일에 저장합니다.
+이후 중복 체크는 API 호출 없이 메모리에서 바로 확인합니다.
+
+NOTION_DATABASE_ID를 설정하면 데이터베이스 ID 기준으로 기록하고, 하위 블록은 훑지 않습니다.
+인덱스에 없는 문제는 notion_api.check_duplicate가 문제 번호로 데이터베이스를 조회해서 채웁니다.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+
+from config import CACHE_DIR, NOTION_PARENT_PAGE_ID, NOTION_DATABASE_ID
+from rate_limit import notion_call
+from profiler import span
+
+
+# 페이지 제목에서 문제 번호 추출: "[백준 실버 I] 14716: 현수막"
+TITLE_PATTERN = re.compile(r'\] (\d+):')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    parent_id TEXT NOT NULL,
+    problem_id INTEGER NOT NULL,
+    page_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    PRIMARY KEY (parent_id, problem_id)
+);
+CREATE TABLE IF NOT EXISTS partial_writes (
+    parent_id TEXT NOT NULL,
+    problem_id INTEGER NOT NULL,
+    page_id TEXT NOT NULL,
+    written_blocks INTEGER NOT NULL,
+    total_blocks INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (parent_id, problem_id)
+);
+CREATE TABLE IF NOT EXISTS section_hashes (
+    parent_id TEXT NOT NULL,
+    problem_id INTEGER NOT NULL,
+    hashes TEXT NOT NULL,
+    PRIMARY KEY (parent_id, problem_id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    parent_id TEXT PRIMARY KEY,
+    cursor TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def page_url(page_id):
+    """페이지 ID로 Notion URL 생성"""
+    return f"https://www.notion.so/{page_id.replace('-', '')}"
+
+
+def parse_problem_id(title):
+    """페이지 제목에서 문제 번호 추출 (형식이 다르면 None)"""
+    match = TITLE_PATTERN.search(title)
+    return int(match.group(1)) if match else None
+
+
+class DuplicateIndex:
+    """
+    부모 페이지별 problem_id → page_id 인덱스
+
+    - sync(full=True): 하위 페이지 전체를 페이지네이션하며 다시 구성
+    - sync(): 마지막으로 본 블록부터 이어서 읽는 증분 동기화
+    - add(): 페이지 생성 직후 인덱스 갱신
+    - remove(): 휴지통으로 옮겨진 페이지 삭제
+    - mark_partial() / get_partial() / clear_partial(): 블록을 나눠 작성하는 중인 페이지 기록
+    - get_section_hashes() / save_section_hashes(): 페이지 섹션별 내용 해시 (--refresh용)
+
+    scan_children=False면 (데이터베이스) sync가 하위 블록을 훑지 않고, 전체 재구성 시 기록만 비웁니다.
+    """
+
+    def __init__(self, path, parent_id, scan_children=True):
+        self.path = path
+        self.parent_id = parent_id
+        self.scan_children = scan_children
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        rows = self._conn.execute(
+            "SELECT problem_id, page_id FROM pages WHERE parent_id = ?", (parent_id,)
+        ).fetchall()
+        self._pages = dict(rows)
+
+        state = self._conn.execute(
+            "SELECT cursor FROM sync_state WHERE parent_id = ?", (parent_id,)
+        ).fetchone()
+        self.synced = state is not None
+        self._cursor = state[0] if state else None
+
+    def lookup(self, problem_id):
+        """문제 번호로 페이지 ID 조회 (없으면 None)"""
+        with self._lock:
+            return self._pages.get(problem_id)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pages)
+
+    def _put(self, problem_id, page_id, title):
+        self._pages[problem_id] = page_id
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+            (self.parent_id, problem_id, page_id, title)
+        )
+
+    def _save_cursor(self, cursor):
+        self._cursor = cursor
+        self.synced = True
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+            (self.parent_id, cursor, time.time())
+        )
+
+    def add(self, problem_id, page_id, title=""):
+        """
+        새로 만든 페이지를 인덱스에 추가
+
+        증분 동기화 위치는 옮기지 않습니다. 그 사이 다른 곳(다른 프로세스, Notion 화면)에서
+        만든 페이지를 건너뛰지 않도록 다음 동기화는 이전 위치부터 다시 읽습니다.
+        """
+        with self._lock:
+            self._put(problem_id, page_id, title)
+            self._conn.commit()
+
+    def _delete(self, problem_id, page_id=None):
+        if page_id is not None and self._pages.get(problem_id) != page_id:
+            return
+        self._pages.pop(problem_id, None)
+        for table in ("pages", "section_hashes"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE parent_id = ? AND problem_id = ?", (self.parent_id, problem_id)
+            )
+
+    def remove(self, problem_id, page_id=None):
+        """
+        휴지통으로 옮겨진 페이지를 인덱스에서 삭제
+
+        page_id를 주면 인덱스의 페이지가 그 페이지일 때만 삭제합니다.
+        """
+        with self._lock:
+            self._delete(problem_id, page_id)
+            self._conn.commit()
+
+    def mark_partial(self, problem_id, page_id, written_blocks, total_blocks):
+        """블록 일부만 작성된 페이지의 진행 상황 기록"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO partial_writes VALUES (?, ?, ?, ?, ?, ?)",
+                (self.parent_id, problem_id, page_id, written_blocks, total_blocks, time.time())
+            )
+            self._conn.commit()
+
+    def get_partial(self, problem_id):
+        """
+        작성 도중 멈춘 페이지 조회
+
+        Returns:
+            tuple or None: (page_id, 작성된 블록 수)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_id, written_blocks FROM partial_writes "
+                "WHERE parent_id = ? AND problem_id = ?",
+                (self.parent_id, problem_id)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def clear_partial(self, problem_id):
+        """페이지 작성 완료 후 진행 기록 삭제"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM partial_writes WHERE parent_id = ? AND problem_id = ?",
+                (self.parent_id, problem_id)
+            )
+            self._conn.commit()
+
+    def get_section_hashes(self, problem_id):
+        """페이지에 마지막으로 작성한 섹션별 내용 해시 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT hashes FROM section_hashes WHERE parent_id = ? AND problem_id = ?",
+                (self.parent_id, problem_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_section_hashes(self, problem_id, hashes):
+        """페이지 섹션별 내용 해시 저장"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO section_hashes VALUES (?, ?, ?)",
+                (self.parent_id, problem_id, json.dumps(hashes))
+            )
+            self._conn.commit()
+
+    def _scan(self, client, start_cursor=None):
+        """부모 페이지의 하위 블록을 끝까지 읽으며 인덱스에 반영, 마지막 블록 ID 반환"""
+        cursor = start_cursor
+        last_block_id = start_cursor
+
+        while True:
+            kwargs = {"block_id": self.parent_id, "page_size": 100}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+            response = notion_call(client.blocks.children.list, **kwargs)
+
+            with self._lock:
+                for block in response.get("results", []):
+                    last_block_id = block.get("id", last_block_id)
+                    if block.get("type") != "child_page":
+                        continue
+                    title = block.get("child_page", {}).get("title", "")
+                    problem_id = parse_problem_id(title)
+                    if problem_id is None:
+                        continue
+                    if block.get("in_trash") or block.get("archived"):
+                        self._delete(problem_id, block["id"])
+                    else:
+                        self._put(problem_id, block["id"], title)
+
+            if not response.get("has_more"):
+                return last_block_id
+            cursor = response.get("next_cursor")
+
+    def sync(self, client, full=False):
+        """
+        Notion과 인덱스 동기화
+
+        Args:
+            client: Notion 클라이언트
+            full: True면 전체 재구성, False면 마지막 위치부터 증분 동기화
+        """
+        with self._sync_lock:
+            self._sync(client, full)
+
+    def _sync(self, client, full):
+        if not self.scan_children:
+            if full:
+                self._clear()
+                with self._lock:
+                    self._conn.commit()
+            return
+
+        if not full and self.synced and self._cursor:
+            try:
+                last_block_id = self._scan(client, start_cursor=self._cursor)
+                with self._lock:
+                    self._save_cursor(last_block_id)
+                    self._conn.commit()
+                return
+            except Exception as e:
+                # 마지막으로 본 블록이 삭제된 경우 등은 전체 동기화로 대체
+                print(f"⚠️ 중복 인덱스 증분 동기화 실패, 전체 동기화합니다: {e}")
+
+        self._clear()
+        last_block_id = self._scan(client)
+        with self._lock:
+            self._save_cursor(last_block_id)
+            self._conn.commit()
+
+    def _clear(self):
+        with self._lock:
+            self._pages.clear()
+            self._conn.execute("DELETE FROM pages WHERE parent_id = ?", (self.parent_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+_index_synced = False
+
+
+def get_duplicate_index(client=None, full_sync=False):
+    """
+    전역 중복 인덱스 반환
+
+    프로세스에서 처음 사용할 때 한 번만 Notion과 동기화합니다
+    (처음이면 전체, 이전 기록이 있으면 증분).
+    """
+    global _index, _index_synced
+    with _index_lock:
+        if _index is None:
+            _index = DuplicateIndex(
+                os.path.join(CACHE_DIR, "notion_index.sqlite3"),
+                NOTION_DATABASE_ID or NOTION_PARENT_PAGE_ID,
+                scan_children=not NOTION_DATABASE_ID,
+            )
+        if client is not None and (full_sync or not _index_synced):
+            with span("notion.index_sync"):
+                _index.sync(client, full=full_sync)
+            _index_synced = True
+        return _index
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+페이지 가져오기 전략 모듈
+
+백준 문제 페이지는 대부분 정적 HTML로 받을 수 있으므로
+먼저 requests 세션으로 가져오고, AWS WAF 챌린지가 감지될 때만
+Selenium(드라이버 풀)으로 렌더링합니다.
+호스트별로 최근에 성공한 전략을 기억해서 불필요한 시도를 줄입니다.
+
+이전 응답의 검증자(ETag, Last-Modified)를 넘기면 조건부 요청을 보내고,
+304 Not Modified면 본문을 받지 않습니다.
+"""
+
+import time
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from driver_pool import get_driver_pool, USER_AGENT
+from profiler import span, timed, count
+
+
+STRATEGY_HTTP = "http"
+STRATEGY_BROWSER = "browser"
+
+# 브라우저 전략을 기억하는 시간 (초). 지나면 다시 HTTP부터 시도
+STRATEGY_TTL = 600
+
+HTTP_TIMEOUT = 10
+
+# WAF 챌린지 페이지에서 보이는 흔적
+WAF_MARKERS = ("awswaf", "AwsWafIntegration", "challenge.js", "captcha.js")
+
+
+class ChallengeDetected(Exception):
+    """HTTP 응답이 WAF 챌린지 페이지일 때 발생"""
+
+
+_session = None
+_session_lock = threading.Lock()
+
+# 호스트별 최근 성공 전략: {host: (strategy, 기록 시각)}
+_host_strategy = {}
+_strategy_lock = threading.Lock()
+
+
+def get_http_session():
+    """연결을 재사용하는 공용 requests 세션 반환"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+            })
+            _session = session
+        return _session
+
+
+def is_challenge(response):
+    """
+    WAF 챌린지 응답인지 판별
+
+    - x-amzn-waf-action 헤더가 있거나
+    - 202/403/405 상태이거나
+    - 본문에 WAF 스크립트 흔적이 있고 문제 제목 요소가 없으면 챌린지로 판단
+    """
+    if response.headers.get("x-amzn-waf-action"):
+        return True
+    if response.status_code in (202, 403, 405):
+        return True
+
+    text = response.text
+    if 'id="problem_title"' in text:
+        return False
+    return any(marker in text for marker in WAF_MARKERS)
+
+
+def conditional_headers(validators):
+    """저장해 둔 검증자로 조건부 요청 헤더 만들기"""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(response):
+    """
+    응답의 검증자 추출
+
+    Returns:
+        dict or None: {"etag", "last_modified"} 둘 다 없으면 None
+    """
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return None
+    return {"etag": etag, "last_modified": last_modified}
+
+
+def fetch_with_http(url, validators=None):
+    """
+    requests 세션으로 페이지 HTML 가져오기
+
+    Args:
+        validators: 이전 응답의 검증자 (있으면 조건부 요청)
+
+    Returns:
+        tuple: (HTML, 응답 검증자) 304 Not Modified면 HTML이 None
+
+    Raises:
+        ChallengeDetected: WAF 챌린지가 감지된 경우
+        requests.HTTPError: 그 밖의 HTTP 오류 (404 등)
+    """
+    with span("fetch.http"):
+        response = get_http_session().get(url, headers=conditional_headers(validators), timeout=HTTP_TIMEOUT)
+    count("http.requests")
+    count("http.bytes", len(response.content))
+    if response.status_code == 304 and validators:
+        count("http.not_modified")
+        return None, validators
+    if is_challenge(response):
+        count("fetch.challenges")
+        raise ChallengeDetected(f"WAF 챌린지 감지 ({response.status_code})")
+    response.raise_for_status()
+    return response.text, response_validators(response)
+
+
+@timed("fetch.browser")
+def fetch_with_browser(url):
+    """드라이버 풀의 headless Chrome으로 페이지 렌더링 후 HTML 반환"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    with get_driver_pool().lease() as driver:
+        with span("browser.get"):
+            driver.get(url)
+
+        # 페이지 로드 대기 (문제 제목이 나타날 때까지)
+        with span("browser.wait"):
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.ID, "problem_title"))
+            )
+        return driver.page_source
+
+
+def get_host_strategy(host):
+    """호스트에 대해 최근 성공한 전략 반환 (기록이 없거나 만료되면 HTTP)"""
+    with _strategy_lock:
+        entry = _host_strategy.get(host)
+    if entry and time.monotonic() - entry[1] < STRATEGY_TTL:
+        return entry[0]
+    return STRATEGY_HTTP
+
+
+def remember_strategy(host, strategy):
+    """호스트별 성공 전략 기록"""
+    with _strategy_lock:
+        _host_strategy[host] = (strategy, time.monotonic())
+
+
+def fetch_problem_page(url, validators=None):
+    """
+    문제 페이지 HTML 가져오기 (HTTP 우선, WAF 챌린지 시 브라우저)
+
+    Args:
+        url: 백준 문제 URL
+        validators: 이전 응답의 검증자 (HTTP로 가져올 때만 조건부 요청)
+
+    Returns:
+        tuple: (HTML, 응답 검증자) 304 Not Modified면 HTML이 None,
+               브라우저로 가져왔거나 서버가 검증자를 주지 않으면 검증자가 None
+    """
+    host = urlparse(url).netloc
+
+    if get_host_strategy(host) == STRATEGY_HTTP:
+        try:
+            page = fetch_with_http(url, validators)
+            remember_strategy(host, STRATEGY_HTTP)
+            return page
+        except ChallengeDetected:
+            pass
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                raise ValueError(f"존재하지 않는 문제입니다: {url}") from e
+            raise
+
+    html = fetch_with_browser(url)
+    remember_strategy(host, STRATEGY_BROWSER)
+    return html, None
+
+
+def fetch_problem_html(url):
+    """문제 페이지 HTML 가져오기 (조건부 요청 없이)"""
+    return fetch_problem_page(url)[0]
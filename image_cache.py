@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+문제 이미지 캐시 모듈
+
+문제 설명/입력/출력에 포함된 이미지를 제한된 수의 워커로 동시에 내려받아
+상태 코드, Content-Type, 크기를 확인하고, 내용 해시(sha256)를 파일 이름으로 저장합니다.
+같은 이미지는 여러 문제에서 쓰이거나 다시 실행해도 한 번만 내려받습니다.
+"""
+
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    CACHE_DIR, CACHE_STATIC_TTL_HOURS, CACHE_VOLATILE_TTL_HOURS,
+    IMAGE_WORKERS, IMAGE_MAX_BYTES,
+)
+from fetcher import get_http_session
+from profiler import timed, count, start_thread
+
+
+IMAGE_FIELDS = ("description_images", "input_images", "output_images")
+
+HTTP_TIMEOUT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    url TEXT PRIMARY KEY,
+    ok INTEGER NOT NULL,
+    sha256 TEXT,
+    content_type TEXT,
+    size INTEGER,
+    reason TEXT,
+    checked_at REAL NOT NULL
+)
+"""
+
+
+class ImageCache:
+    """
+    URL → 내용 해시 기록과 내용 주소 방식(content-addressed) 이미지 저장소
+
+    - 정상 이미지는 정적 캐시 유효 기간 동안, 실패한 이미지는 통계 캐시 유효 기간 동안 다시 받지 않습니다.
+    """
+
+    def __init__(self, directory, ok_ttl=CACHE_STATIC_TTL_HOURS * 3600,
+                 bad_ttl=CACHE_VOLATILE_TTL_HOURS * 3600):
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, "objects")
+        self.ok_ttl = ok_ttl
+        self.bad_ttl = bad_ttl
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "images.sqlite3"), check_same_thread=False)
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    def object_path(self, sha256):
+        """내용 해시에 해당하는 파일 경로"""
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def lookup(self, url):
+        """
+        유효한 확인 기록 조회
+
+        Returns:
+            bool or None: 정상이면 True, 실패했으면 False, 기록이 없거나 만료되면 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ok, sha256, checked_at FROM images WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        ok, sha256, checked_at = row
+        ttl = self.ok_ttl if ok else self.bad_ttl
+        if time.time() - checked_at > ttl:
+            return None
+        if ok and not os.path.exists(self.object_path(sha256)):
+            return None
+        return bool(ok)
+
+    def store(self, url, data, content_type):
+        """이미지 내용 저장 (같은 내용이 이미 있으면 파일은 다시 쓰지 않음)"""
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.object_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        self._record(url, True, sha256, content_type, len(data), None)
+        return sha256
+
+    def mark_bad(self, url, reason):
+        """확인에 실패한 이미지 기록"""
+        self._record(url, False, None, None, None, reason)
+
+    def _record(self, url, ok, sha256, content_type, size, reason):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, int(ok), sha256, content_type, size, reason, time.time())
+            )
+            self._conn.commit()
+
+
+@timed("image.download")
+def download_image(url, max_bytes=IMAGE_MAX_BYTES):
+    """
+    이미지 내려받기 및 확인
+
+    Returns:
+        tuple: (내용 bytes, Content-Type)
+
+    Raises:
+        ValueError: 상태 코드, Content-Type, 크기 중 하나라도 맞지 않는 경우
+    """
+    count("http.requests")
+    with get_http_session().get(url, stream=True, timeout=HTTP_TIMEOUT) as response:
+        if response.status_code != 200:
+            raise ValueError(f"HTTP {response.status_code}")
+
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+        if not content_type.startswith("image/"):
+            raise ValueError(f"이미지가 아닙니다 ({content_type or 'Content-Type 없음'})")
+
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise ValueError(f"이미지가 너무 큽니다 ({declared} bytes)")
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"이미지가 너무 큽니다 ({size}+ bytes)")
+            chunks.append(chunk)
+        count("http.bytes", size)
+
+    if size == 0:
+        raise ValueError("빈 이미지입니다")
+    return b"".join(chunks), content_type
+
+
+_cache = None
+_executor = None
+_inflight = {}
+_lock = threading.Lock()
+
+
+def get_image_cache():
+    """전역 이미지 캐시 반환"""
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = ImageCache(os.path.join(CACHE_DIR, "images"))
+        return _cache
+
+
+def _verify(url):
+    cache = get_image_cache()
+    known = cache.lookup(url)
+    if known is not None:
+        return known
+
+    try:
+        data, content_type = download_image(url)
+    except Exception as e:
+        cache.mark_bad(url, str(e))
+        print(f"⚠️ 이미지 확인 실패 ({e}): {url}")
+        return False
+
+    cache.store(url, data, content_type)
+    return True
+
+
+def prefetch_images(urls):
+    """
+    이미지 확인 작업을 백그라운드 워커에 맡기고 바로 반환
+
+    같은 URL을 동시에 여러 번 요청해도 한 번만 내려받습니다.
+
+    Returns:
+        dict: {url: Future} (Future 결과는 정상 여부 bool)
+    """
+    global _executor
+    futures = {}
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=IMAGE_WORKERS, thread_name_prefix="image", initializer=start_thread
+            )
+        for url in urls:
+            future = _inflight.get(url)
+            if future is None:
+                future = _executor.submit(_verify, url)
+                _inflight[url] = future
+                future.add_done_callback(lambda _, url=url: _forget(url))
+            futures[url] = future
+    return futures
+
+
+def _forget(url):
+    with _lock:
+        _inflight.pop(url, None)
+
+
+def problem_image_urls(problem_data):
+    """문제 딕셔너리에 들어 있는 모든 이미지 URL"""
+    return [url for field in IMAGE_FIELDS for url in problem_data.get(field, [])]
+
+
+def with_verified_images(problem_data, futures):
+    """
+    확인에 실패한 이미지를 뺀 문제 딕셔너리 사본 반환
+
+    아직 확인이 끝나지 않은 이미지는 그대로 둡니다 (페이지 작성을 기다리게 하지 않음).
+    """
+    def ok(url):
+        future = futures.get(url)
+        if future is None or not future.done():
+            return True
+        try:
+            return future.result()
+        except Exception:
+            return True
+
+    filtered = dict(problem_data)
+    for field in IMAGE_FIELDS:
+        filtered[field] = [url for url in problem_data.get(field, []) if ok(url)]
+    return filtered
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+작업 저널 모듈
+
+대량 가져오기의 문제별 진행 상태를 SQLite 파일에 기록합니다.
+
+    pending → scraped → written
+                     ↘ failed (사유 기록)
+
+워커는 작업을 일정 시간짜리 임대(lease)로 가져가고, 처리 중에는 임대를 주기적으로 연장합니다.
+같은 저널 파일을 여러 프로세스(공유 디렉터리라면 여러 컴퓨터)가 함께 쓰면 작업을 나눠 처리하며,
+도중에 죽은 워커의 작업은 임대가 끝나면 다른 워커가 이어받습니다.
+다시 실행하면 written/failed가 아닌 작업부터 그대로 이어서 처리합니다.
+"""
+
+import os
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from itertools import islice
+
+
+STATE_PENDING = "pending"
+STATE_SCRAPED = "scraped"
+STATE_WRITTEN = "written"
+STATE_FAILED = "failed"
+STATES = (STATE_PENDING, STATE_SCRAPED, STATE_WRITTEN, STATE_FAILED)
+
+# 작업 임대 시간 (초). 처리 중인 작업은 LEASE_SECONDS / 3마다 연장
+LEASE_SECONDS = 120
+
+# 한 번에 가져오는 작업 수 (solved.ac 묶음 조회 단위이기도 함)
+CLAIM_BATCH = 25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    parent_id TEXT NOT NULL,
+    problem_id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    state TEXT NOT NULL,
+    reason TEXT,
+    page_url TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (parent_id, problem_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (parent_id, state);
+"""
+
+
+def new_worker_id():
+    """저널을 함께 쓰는 워커끼리 구분할 ID (호스트:PID:임의값)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def is_dead_local_worker(worker_id):
+    """
+    같은 컴퓨터에서 이미 종료된 워커인지 확인
+
+    Windows에서는 os.kill(pid, 0)이 프로세스를 종료시키므로 확인하지 않고 임대 만료를 기다립니다.
+    """
+    host, _, rest = worker_id.partition(":")
+    pid = rest.partition(":")[0]
+    if os.name != "posix" or host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class JobJournal:
+    """
+    출력 대상(Notion 부모 페이지, Markdown 디렉터리 등)별 문제 작업 저널
+
+    - enqueue(): 작업 추가 (이미 있는 작업은 상태 유지)
+    - claim(): 처리할 작업을 임대로 가져오기
+    - renew(): 처리 중인 작업 임대 연장
+    - mark_scraped() / complete(): 상태 기록 (임대한 워커만)
+    """
+
+    def __init__(self, path, parent_id, worker_id=None, lease_seconds=LEASE_SECONDS):
+        self.path = path
+        self.parent_id = parent_id
+        self.worker_id = worker_id or new_worker_id()
+        self.lease_seconds = lease_seconds
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 여러 프로세스가 함께 쓰므로 잠금을 기다리고, 트랜잭션은 직접 관리
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def _write(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def enqueue(self, jobs, chunk_size=500):
+        """
+        작업 추가 (스트림을 chunk_size개씩 나눠 저장)
+
+        Args:
+            jobs: (problem_id, url) iterable
+
+        Returns:
+            int: 새로 추가된 작업 수
+        """
+        added = 0
+        chunk = []
+
+        def flush():
+            nonlocal added
+            now = time.time()
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (parent_id, problem_id, url, state, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(self.parent_id, pid, url, STATE_PENDING, now) for pid, url in chunk]
+                )
+                added += self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            chunk.clear()
+
+        for job in jobs:
+            chunk.append(job)
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+        return added
+
+    def requeue_failed(self):
+        """실패한 작업을 다시 pending으로 (다시 시도할 때)"""
+        cursor = self._write(
+            "UPDATE jobs SET state = ?, reason = NULL, updated_at = ? WHERE parent_id = ? AND state = ?",
+            (STATE_PENDING, time.time(), self.parent_id, STATE_FAILED)
+        )
+        return cursor.rowcount
+
+    def claim(self, limit=CLAIM_BATCH):
+        """
+        처리할 작업을 임대로 가져오기
+
+        pending/scraped 상태이면서 아무도 임대하지 않았거나 임대가 끝난 작업을 추가된 순서대로 가져옵니다.
+
+        Returns:
+            list: [(problem_id, url), ...]
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT problem_id, url FROM jobs "
+                    "WHERE parent_id = ? AND state IN (?, ?) "
+                    "AND (lease_expires IS NULL OR lease_expires < ?) "
+                    "ORDER BY rowid LIMIT ?",
+                    (self.parent_id, STATE_PENDING, STATE_SCRAPED, now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE jobs SET lease_owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE parent_id = ? AND problem_id = ?",
+                    [(self.worker_id, now + self.lease_seconds, now, self.parent_id, pid) for pid, _ in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def reclaim_dead_workers(self):
+        """
+        같은 컴퓨터에서 비정상 종료된 워커의 임대 해제
+
+        임대 만료를 기다리지 않고 재시작하자마자 이어서 처리할 수 있도록 합니다.
+
+        Returns:
+            int: 해제한 작업 수
+        """
+        with self._lock:
+            owners = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT lease_owner FROM jobs WHERE parent_id = ? AND lease_owner IS NOT NULL",
+                (self.parent_id,)
+            )]
+        released = 0
+        for owner in owners:
+            if owner != self.worker_id and is_dead_local_worker(owner):
+                released += self._write(
+                    "UPDATE jobs SET lease_owner = NULL, lease_expires = NULL "
+                    "WHERE parent_id = ? AND lease_owner = ?",
+                    (self.parent_id, owner)
+                ).rowcount
+        return released
+
+    def renew(self):
+        """이 워커가 임대 중인 작업의 임대 연장"""
+        now = time.time()
+        self._write(
+            "UPDATE jobs SET lease_expires = ? WHERE parent_id = ? AND lease_owner = ? "
+            "AND state IN (?, ?)",
+            (now + self.lease_seconds, self.parent_id, self.worker_id, STATE_PENDING, STATE_SCRAPED)
+        )
+
+    def mark_scraped(self, problem_id):
+        """크롤링 완료 기록 (문제 내용은 로컬 캐시에 있으므로 재시작 시 다시 가져오지 않음)"""
+        self._write(
+            "UPDATE jobs SET state = ?, updated_at = ? "
+            "WHERE parent_id = ? AND problem_id = ? AND lease_owner = ? AND state = ?",
+            (STATE_SCRAPED, time.time(), self.parent_id, problem_id, self.worker_id, STATE_PENDING)
+        )
+
+    def complete(self, problem_id, state, page_url=None, reason=None):
+        """
+        처리 결과 기록 및 임대 해제
+
+        Returns:
+            bool: 기록했으면 True (임대가 끝나 다른 워커가 가져간 경우 False)
+        """
+        cursor = self._write(
+            "UPDATE jobs SET state = ?, page_url = ?, reason = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE parent_id = ? AND problem_id = ? AND lease_owner = ?",
+            (state, page_url, reason, time.time(), self.parent_id, problem_id, self.worker_id)
+        )
+        return cursor.rowcount > 0
+
+    def release(self):
+        """이 워커의 남은 임대를 모두 해제 (정상 종료 시 다른 워커가 바로 가져가도록)"""
+        self._write(
+            "UPDATE jobs SET lease_owner = NULL, lease_expires = NULL "
+            "WHERE parent_id = ? AND lease_owner = ?",
+            (self.parent_id, self.worker_id)
+        )
+
+    def counts(self):
+        """상태별 작업 수 {state: n}"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM jobs WHERE parent_id = ? GROUP BY state", (self.parent_id,)
+            ).fetchall()
+        counts = {state: 0 for state in STATES}
+        counts.update(rows)
+        return counts
+
+    def failures(self, limit=20):
+        """실패한 작업 [(url, 사유), ...]"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, reason FROM jobs WHERE parent_id = ? AND state = ? ORDER BY rowid LIMIT ?",
+                (self.parent_id, STATE_FAILED, limit)
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_journal(path, sink):
+    """출력 대상(sink)용 저널 열기 (Notion이면 부모 페이지별로 작업을 구분)"""
+    return JobJournal(path, sink.journal_scope)
+
+
+def print_journal_status(journal):
+    """저널 상태 요약 출력"""
+    counts = journal.counts()
+    total = sum(counts.values())
+    print("\n" + "=" * 50)
+    print(f"🗂️ 작업 저널: {journal.path} (총 {total}문제)")
+    print(f"   ⏳ 대기: {counts[STATE_PENDING]}")
+    print(f"   🔍 크롤링 완료: {counts[STATE_SCRAPED]}")
+    print(f"   ✅ 작성 완료: {counts[STATE_WRITTEN]}")
+    print(f"   ❌ 실패: {counts[STATE_FAILED]}")
+    failures = journal.failures()
+    if failures:
+        print("\n❌ 실패한 문제:")
+        for url, reason in failures:
+            print(f"   - {url}: {reason}")
+        if counts[STATE_FAILED] > len(failures):
+            print(f"   ... 외 {counts[STATE_FAILED] - len(failures)}개 (--retry-failed로 다시 시도)")
+    print("=" * 50)
+
+
+def run_journal(journal, urls, concurrency=None, refresh=False, retry_failed=False, sink=None):
+    """
+    URL 스트림을 저널에 추가해 가며, 저널에서 작업을 임대해 처리
+
+    스트림 전체를 먼저 추가하지 않고, 임대할 작업이 떨어질 때마다 solved.ac 묶음 조회 단위
+    (LOOKUP_BATCH_SIZE)만큼 추가하므로 --solved-by 검색이 길어도 첫 결과부터 바로 처리합니다.
+    중단되면 그때까지 추가한 작업만 저널에 남고, 같은 입력으로 다시 실행하면 나머지를 이어서 추가합니다.
+    같은 저널로 여러 워커를 실행하면 작업을 나눠 처리합니다.
+    urls가 비어 있으면 저널에 남은 작업만 처리합니다.
+
+    Returns:
+        list: 이번 실행에서 처리한 문제별 결과
+    """
+    from scraper import get_problem_id
+    from pipeline import process_problems
+    from batch import prefetch_metadata, print_result, print_summary
+    from solved_ac import LOOKUP_BATCH_SIZE
+
+    jobs = ((pid, url) for pid, url in ((get_problem_id(url), url) for url in urls) if pid)
+    reclaimed = journal.reclaim_dead_workers()
+    if reclaimed:
+        print(f"♻️ 비정상 종료된 워커의 작업 {reclaimed}개를 이어서 처리합니다.")
+    if retry_failed:
+        requeued = journal.requeue_failed()
+        if requeued:
+            print(f"🔁 실패한 작업 {requeued}개를 다시 시도합니다.")
+    counts = journal.counts()
+    remaining = counts[STATE_PENDING] + counts[STATE_SCRAPED]
+    print(f"🗂️ 작업 저널: 남은 작업 {remaining}개 (워커 {journal.worker_id})")
+
+    def claimed_urls():
+        exhausted = False
+        while True:
+            claimed = journal.claim()
+            if claimed:
+                for _, url in claimed:
+                    yield url
+                continue
+            if exhausted:
+                return
+            # 임대할 작업이 없으면 입력에서 다음 묶음을 추가
+            window = list(islice(jobs, LOOKUP_BATCH_SIZE))
+            exhausted = len(window) < LOOKUP_BATCH_SIZE
+            added = journal.enqueue(window)
+            if added:
+                print(f"🗂️ 작업 저널에 새 작업 {added}개 추가")
+
+    # 처리 중인 작업의 임대를 주기적으로 연장
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(journal.lease_seconds / 3):
+            try:
+                journal.renew()
+            except sqlite3.Error as e:
+                print(f"⚠️ 작업 임대 연장 실패: {e}")
+
+    def on_event(event, item):
+        problem_id = get_problem_id(item["url"])
+        if event == "scraped":
+            journal.mark_scraped(problem_id)
+        elif event == "done":
+            result = item["result"]
+            if result["status"] == "failed":
+                recorded = journal.complete(problem_id, STATE_FAILED, reason=result["error"])
+            else:
+                recorded = journal.complete(problem_id, STATE_WRITTEN, page_url=result["page_url"])
+            if not recorded:
+                print(f"⚠️ 임대가 만료되어 결과를 기록하지 못했습니다: {item['url']}")
+            print_result(item["index"], result)
+
+    thread = threading.Thread(target=heartbeat, name="journal-heartbeat", daemon=True)
+    thread.start()
+    started = time.perf_counter()
+    try:
+        results = process_problems(
+            prefetch_metadata(claimed_urls(), window=CLAIM_BATCH),
+            concurrency=concurrency, on_event=on_event, refresh=refresh, sink=sink
+        )
+    finally:
+        stop.set()
+        journal.release()
+
+    print_summary(results, time.perf_counter() - started)
+    print_journal_status(journal)
+    return results
@@ -5,17 +5,197 @@
 
 사용법:
     python main.py <백준 문제 URL>
+    python main.py <URL | 문제 번호 | 번호 범위> ... [-f 파일]
 
 예시:
     python main.py https://www.acmicpc.net/problem/14716
+    python main.py 1000 1001 2000-2010
+    python main.py -f problems.txt
 """
 
 import sys
 import argparse
 
-from config import validate_config
-from scraper import scrape_problem
-from notion_api import create_problem_page, test_connection
+# 무거운 모듈(notion_client, bs4, requests, dotenv 등)은 필요한 분기에서만 불러옴
+# (--help, 인자 오류에서는 불러오지 않도록). bench/check_import_time.py로 확인
+import config
+
+
+def print_progress(event, item, label="Notion 페이지"):
+    """단일 문제 처리 진행 상황 출력 (파이프라인 콜백)"""
+    if event == "start":
+        print(f"🔍 문제 크롤링 중: {item['url']}")
+    elif event == "scraped":
+        problem_data = item["problem_data"]
+        print(f"   ✓ 문제: {problem_data['title']}")
+        print(f"   ✓ 난이도: {problem_data['tier']}")
+        if problem_data.get("tags"):
+            print(f"   ✓ 태그: {', '.join(problem_data['tags'][:5])}")  # 최대 5개만 표시
+    elif event == "write":
+        print(f"📝 {label} 생성 중...")
+
+
+def finish_profile(args):
+    """--profile 결과 출력 및 저장"""
+    import profiler
+
+    report = profiler.get_report()
+    profiler.print_report(report)
+    if args.profile_json:
+        profiler.save_json(args.profile_json, report)
+        print(f"💾 구간별 소요 시간: {args.profile_json}")
+    if args.profile_cprofile:
+        profiler.save_cprofile(args.profile_cprofile)
+        print(f"💾 cProfile: {args.profile_cprofile}  (python -m pstats {args.profile_cprofile})")
+
+
+def create_sink(args):
+    """출력 대상 생성 (기본: Notion 페이지)"""
+    from sinks import NotionSink, MarkdownSink, JsonlSink
+
+    if args.markdown:
+        return MarkdownSink(args.markdown)
+    if args.jsonl:
+        return JsonlSink(args.jsonl)
+    return NotionSink()
+
+
+def run_problems(args, urls, concurrency, solved_ids, sink):
+    """배치 모드 또는 단일 문제 처리 (실패 시 종료 코드 1)"""
+    import sqlite3
+    import requests
+    from pipeline import process_problems
+    from batch import iter_targets, run_batch
+
+    # 작업 저널: 진행 상태를 기록하며 처리 (중단된 곳부터 이어서, 여러 워커가 나눠서)
+    if args.journal:
+        from journal import open_journal, run_journal
+        journal = open_journal(args.journal, sink)
+        try:
+            results = run_journal(
+                journal,
+                iter_targets(args.targets, args.file, solved_ids),
+                concurrency=concurrency,
+                refresh=args.refresh,
+                retry_failed=args.retry_failed,
+                sink=sink
+            )
+        except (OSError, sqlite3.Error, requests.RequestException) as e:
+            print(f"❌ 오류: {e}")
+            sys.exit(1)
+        finally:
+            journal.close()
+        if any(r["status"] == "failed" for r in results):
+            sys.exit(1)
+        return
+
+    # 배치 모드: 여러 문제, 범위, 입력 파일, solved.ac 사용자
+    if args.file or args.solved_by or len(urls) != 1:
+        try:
+            results = run_batch(
+                iter_targets(args.targets, args.file, solved_ids),
+                concurrency=concurrency,
+                refresh=args.refresh,
+                sink=sink
+            )
+        except (OSError, requests.RequestException) as e:
+            print(f"❌ 오류: {e}")
+            sys.exit(1)
+        if any(r["status"] == "failed" for r in results):
+            sys.exit(1)
+        return
+    
+    # 단일 문제: 같은 파이프라인에 문제 하나만 흘려보냄
+    result = process_problems(
+        urls,
+        concurrency=concurrency,
+        on_event=lambda event, item: print_progress(event, item, sink.label),
+        refresh=args.refresh,
+        sink=sink
+    )[0]
+    print_single_result(result, sink.label)
+
+
+def print_single_result(result, label="Notion 페이지"):
+    """단일 문제 처리 결과 출력 (실패 시 종료 코드 1)"""
+    if result["status"] == "failed":
+        print(f"\n❌ 오류 발생: {result['error']}")
+        sys.exit(1)
+    
+    print("\n" + "=" * 50)
+    if result["status"] == "exists":
+        print("⚠️ 이미 등록된 문제입니다!")
+        print(f"📄 기존 {label}: {result['page_url']}")
+    elif result["status"] == "updated":
+        print("🔄 바뀐 내용을 갱신했습니다!")
+        print(f"📄 {label}: {result['page_url']}")
+    else:
+        print("✅ 완료!")
+        print(f"📄 {label}: {result['page_url']}")
+    print("=" * 50)
+
+
+def uses_local_only_options(args):
+    """데몬에 넘길 수 없고 이 프로세스에서 직접 처리해야 하는 옵션이 있는지"""
+    return bool(
+        args.local or args.test or args.no_cache or args.refresh_cache or args.prune_cache
+        or args.resync_index or args.journal or args.journal_status or args.markdown or args.jsonl
+        or args.profile or args.profile_json or args.profile_cprofile
+        or args.browsers is not None or args.recycle_after is not None or args.parse_processes is not None
+    )
+
+
+def run_via_daemon(args, port, concurrency):
+    """실행 중인 데몬에 작업을 넘기고 진행 상황 출력 (얇은 클라이언트)"""
+    from daemon import submit_job, JobError
+    from batch import expand_target, iter_targets, print_result, print_summary
+
+    if (args.tier or args.tag) and not args.solved_by:
+        print("❌ 오류: --tier, --tag는 --solved-by와 함께 사용해야 합니다.")
+        sys.exit(1)
+
+    # 항목 유효성 검사는 로컬에서 (입력 파일 / stdin도 여기서 읽어서 넘김)
+    try:
+        urls = [url for entry in args.targets for url in expand_target(entry)]
+    except ValueError as e:
+        print(f"❌ 오류: {e}")
+        print("   예시: https://www.acmicpc.net/problem/14716, 14716, 1000-1999")
+        sys.exit(1)
+    try:
+        all_urls = list(iter_targets(args.targets, args.file))
+    except OSError as e:
+        print(f"❌ 오류: {e}")
+        sys.exit(1)
+
+    solved_by = None
+    if args.solved_by:
+        print(f"📚 solved.ac에서 {args.solved_by}님이 푼 문제를 가져옵니다...")
+        solved_by = {"handle": args.solved_by, "tier": args.tier, "tag": args.tag}
+
+    batch_mode = bool(args.file or args.solved_by or len(urls) != 1)
+    results = []
+    try:
+        for event in submit_job(port, all_urls, solved_by, concurrency, args.refresh):
+            if event["event"] == "done":
+                results.append(event["result"])
+                if batch_mode:
+                    print_result(event["index"], event["result"])
+            elif event["event"] == "end":
+                if batch_mode:
+                    print_summary(results, event["elapsed"])
+            elif not batch_mode:
+                item = {"url": event["url"]}
+                if event["event"] == "scraped":
+                    item["problem_data"] = event
+                print_progress(event["event"], item)
+    except (OSError, JobError) as e:
+        print(f"❌ 데몬 작업 실패: {e}")
+        sys.exit(1)
+
+    if not batch_mode and results:
+        print_single_result(results[0])
+    elif any(r["status"] == "failed" for r in results):
+        sys.exit(1)
 
 
 def main():
@@ -27,12 +207,158 @@ def main():
 예시:
     python main.py https://www.acmicpc.net/problem/14716
     python main.py https://www.acmicpc.net/problem/1000 --test
+    python main.py 1000 1001 2000-2010
+    python main.py -f problems.txt
+    cat problems.txt | python main.py -f -
+    python main.py --solved-by myhandle --tier g5..g1 --tag dp
+    python main.py --solved-by myhandle --journal import.sqlite3
+    python main.py --journal import.sqlite3          # 중단된 곳부터 이어서
+    python main.py 1000-1999 --markdown notes/       # Notion 대신 Markdown 파일로
+    python main.py -f problems.txt --jsonl corpus.jsonl
         """
     )
     parser.add_argument(
-        "url",
-        nargs="?",
-        help="백준 문제 URL (예: https://www.acmicpc.net/problem/14716)"
+        "targets",
+        nargs="*",
+        metavar="url",
+        help="백준 문제 URL, 문제 번호 또는 번호 범위 (예: 14716, 1000-1999)"
+    )
+    parser.add_argument(
+        "-f", "--file",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="한 줄에 하나씩 항목이 적힌 입력 파일 ('-'이면 stdin, 여러 번 지정 가능)"
+    )
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        metavar="N",
+        help="동시에 띄워 둘 headless Chrome 수 (기본값: .env의 CHROME_POOL_SIZE, 없으면 1)"
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        metavar="K",
+        help="브라우저 하나로 K개 페이지를 처리하면 재시작 (기본값: .env의 CHROME_MAX_PAGES, 없으면 50)"
+    )
+    parser.add_argument(
+        "--solved-by",
+        metavar="HANDLE",
+        help="solved.ac 사용자가 푼 문제를 모두 가져옵니다"
+    )
+    parser.add_argument(
+        "--tier",
+        metavar="RANGE",
+        help="--solved-by 결과를 티어로 거릅니다 (예: g5..g1, s)"
+    )
+    parser.add_argument(
+        "--tag",
+        metavar="KEY",
+        help="--solved-by 결과를 알고리즘 태그로 거릅니다 (예: dp, graphs)"
+    )
+    for stage, help_text in (
+        ("fetch", "페이지 가져오기"),
+        ("parse", "HTML 파싱"),
+        ("meta", "solved.ac 조회"),
+        ("write", "Notion 페이지 작성"),
+    ):
+        parser.add_argument(
+            f"--{stage}-workers",
+            type=int,
+            metavar="N",
+            help=f"{help_text} 단계 동시 실행 수 (기본값: {config.DEFAULT_CONCURRENCY[stage]})"
+        )
+    parser.add_argument(
+        "--parse-processes",
+        metavar="N",
+        help="HTML 파싱을 N개 프로세스에서 실행합니다 (auto: CPU 코어 수, 0: 스레드에서 파싱, "
+             "기본값: .env의 PARSE_PROCESSES 또는 0). 문제가 많을 때 파싱이 코어 수만큼 빨라집니다"
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="로컬 캐시를 읽지도 쓰지도 않습니다"
+    )
+    cache_group.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="캐시를 무시하고 새로 가져온 뒤 캐시를 갱신합니다"
+    )
+    parser.add_argument(
+        "--prune-cache",
+        action="store_true",
+        help="유효 기간이 지난 캐시 항목을 삭제합니다"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="이미 등록된 문제는 바뀐 섹션(통계, 티어, 태그 등)만 갱신합니다 "
+             "(최신 통계가 필요하면 --refresh-cache와 함께 사용)"
+    )
+    parser.add_argument(
+        "--resync-index",
+        action="store_true",
+        help="Notion 부모 페이지를 처음부터 다시 읽어 중복 인덱스를 재구성합니다"
+    )
+    output_group = parser.add_mutually_exclusive_group()
+    output_group.add_argument(
+        "--markdown",
+        metavar="DIR",
+        help="Notion 대신 문제마다 Markdown 파일(DIR/<문제 번호>.md)로 저장합니다"
+    )
+    output_group.add_argument(
+        "--jsonl",
+        metavar="PATH",
+        help="Notion 대신 한 줄에 문제 하나씩 JSON으로 PATH에 이어 씁니다"
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="PATH",
+        help="문제별 진행 상태를 SQLite 작업 저널에 기록합니다. 같은 저널로 다시 실행하면 "
+             "중단된 곳부터 이어서 처리하고, 여러 프로세스가 함께 쓰면 작업을 나눠 처리합니다"
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="작업 저널에서 실패한 문제를 다시 시도합니다 (--journal과 함께 사용)"
+    )
+    parser.add_argument(
+        "--journal-status",
+        metavar="PATH",
+        help="작업 저널의 상태별 문제 수와 실패 사유를 출력합니다"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="실행이 끝나면 구간별 소요 시간(p50/p95)과 HTTP/재시도 카운터를 출력합니다"
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="구간별 소요 시간을 JSON 파일로 저장합니다 (--profile 포함)"
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        metavar="PATH",
+        help="모든 작업 스레드의 cProfile 결과를 pstats 파일로 저장합니다 (--profile 포함)"
+    )
+    daemon_group = parser.add_mutually_exclusive_group()
+    daemon_group.add_argument(
+        "--daemon",
+        action="store_true",
+        help="브라우저, Notion 클라이언트, 중복 인덱스를 유지하는 상주 프로세스로 실행합니다"
+    )
+    daemon_group.add_argument(
+        "--daemon-stop",
+        action="store_true",
+        help="실행 중인 데몬을 종료합니다"
+    )
+    daemon_group.add_argument(
+        "--local",
+        action="store_true",
+        help="데몬이 실행 중이어도 이 프로세스에서 직접 처리합니다"
     )
     parser.add_argument(
         "--test",
@@ -42,55 +368,161 @@ def main():
     
     args = parser.parse_args()
     
-    # 환경 변수 검증
-    if not validate_config():
+    # 파이프라인 단계별 동시 실행 수 (지정한 단계만, 나머지는 config.DEFAULT_CONCURRENCY)
+    concurrency = {
+        stage: n for stage, n in (
+            ("fetch", args.fetch_workers),
+            ("parse", args.parse_workers),
+            ("meta", args.meta_workers),
+            ("write", args.write_workers),
+        ) if n is not None
+    }
+    if any(n < 1 for n in concurrency.values()):
+        print("❌ 오류: 동시 실행 수는 1 이상이어야 합니다.")
+        sys.exit(1)
+    
+    # 데몬 종료
+    if args.daemon_stop:
+        from daemon import stop_daemon
+        if stop_daemon(config.DAEMON_PORT):
+            print("👋 데몬을 종료했습니다.")
+        else:
+            print(f"⚠️ 실행 중인 데몬이 없습니다 (포트 {config.DAEMON_PORT}).")
+        sys.exit(0)
+    
+    # 데몬이 떠 있으면 작업만 넘김
+    if not args.daemon and not uses_local_only_options(args) and (args.targets or args.file or args.solved_by):
+        from daemon import get_daemon_status
+        if get_daemon_status(config.DAEMON_PORT):
+            run_via_daemon(args, config.DAEMON_PORT, concurrency)
+            return
+    
+    # 환경 변수 검증 (Markdown/JSONL로 저장할 때는 Notion 설정이 필요 없음)
+    offline = bool(args.markdown or args.jsonl) and not args.test and not args.resync_index
+    if not offline and not config.validate_config():
         sys.exit(1)
     
     # 연결 테스트 모드
     if args.test:
+        from notion_api import test_connection
         print("🔌 Notion 연결 테스트 중...")
         if test_connection():
             print("✅ 연결 테스트 성공!")
         sys.exit(0)
     
-    # URL 필수 확인
-    if not args.url:
+    from cache import configure_cache, get_problem_cache, CACHE_USE, CACHE_REFRESH, CACHE_OFF
+    
+    # 캐시 설정
+    if args.no_cache:
+        configure_cache(CACHE_OFF)
+    elif args.refresh_cache:
+        configure_cache(CACHE_REFRESH)
+    else:
+        configure_cache(CACHE_USE)
+    
+    # 캐시 정리
+    if args.prune_cache:
+        deleted = get_problem_cache().prune()
+        print(f"🧹 만료된 캐시 {deleted}개를 삭제했습니다.")
+        if not args.targets and not args.file:
+            sys.exit(0)
+    
+    # 중복 인덱스 전체 재구성
+    if args.resync_index:
+        from notion_api import get_notion_client
+        from duplicate_index import get_duplicate_index
+        print("🔄 중복 인덱스 재구성 중...")
+        try:
+            index = get_duplicate_index(get_notion_client(), full_sync=True)
+        except Exception as e:
+            print(f"❌ 중복 인덱스 재구성 실패: {e}")
+            sys.exit(1)
+        print(f"   ✓ 등록된 문제 {len(index)}개")
+        if not args.targets and not args.file:
+            sys.exit(0)
+    
+    # 출력 대상
+    try:
+        sink = create_sink(args)
+    except OSError as e:
+        print(f"❌ 오류: {e}")
+        sys.exit(1)
+    
+    # 작업 저널 상태 확인
+    if args.journal_status:
+        from journal import open_journal, print_journal_status
+        journal = open_journal(args.journal_status, sink)
+        print_journal_status(journal)
+        journal.close()
+        sys.exit(0)
+
+    if args.retry_failed and not args.journal:
+        print("❌ 오류: --retry-failed는 --journal과 함께 사용해야 합니다.")
+        sys.exit(1)
+
+    # URL 필수 확인 (작업 저널은 남은 작업만 이어서 처리할 수 있음)
+    if not args.daemon and not args.journal and not args.targets and not args.file and not args.solved_by:
         parser.print_help()
         print("\n❌ 오류: 백준 문제 URL을 입력해주세요.")
         sys.exit(1)
     
-    # URL 유효성 검사
-    if "acmicpc.net/problem/" not in args.url:
-        print(f"❌ 오류: 올바른 백준 URL이 아닙니다: {args.url}")
-        print("   예시: https://www.acmicpc.net/problem/14716")
+    # 브라우저 풀 설정
+    from driver_pool import configure_driver_pool
+    browsers = args.browsers if args.browsers is not None else config.CHROME_POOL_SIZE
+    recycle_after = args.recycle_after if args.recycle_after is not None else config.CHROME_MAX_PAGES
+    try:
+        configure_driver_pool(size=browsers, max_pages=recycle_after)
+    except ValueError as e:
+        print(f"❌ 오류: {e}")
+        sys.exit(1)
+    
+    # 파싱 프로세스 설정
+    from pipeline import configure_parse_processes
+    parse_processes = args.parse_processes if args.parse_processes is not None else config.PARSE_PROCESSES
+    try:
+        configure_parse_processes(parse_processes)
+    except ValueError as e:
+        print(f"❌ 오류: {e}")
         sys.exit(1)
     
-    print(f"🔍 문제 크롤링 중: {args.url}")
+    # 상주 모드
+    if args.daemon:
+        from daemon import serve
+        serve(config.DAEMON_PORT)
+        return
     
+    # 항목 유효성 검사 (URL / 문제 번호 / 범위)
+    from batch import expand_target
     try:
-        # 1. 백준 문제 크롤링
-        problem_data = scrape_problem(args.url)
-        print(f"   ✓ 문제: {problem_data['title']}")
-        print(f"   ✓ 난이도: {problem_data['tier']}")
-        if problem_data.get("tags"):
-            print(f"   ✓ 태그: {', '.join(problem_data['tags'][:5])}")  # 최대 5개만 표시
-        
-        # 2. Notion 페이지 생성
-        print("📝 Notion 페이지 생성 중...")
-        page_url = create_problem_page(problem_data)
-        
-        print("\n" + "=" * 50)
-        if "(이미 존재)" in page_url:
-            print("⚠️ 이미 등록된 문제입니다!")
-            print(f"📄 기존 페이지: {page_url.replace('(이미 존재) ', '')}")
-        else:
-            print("✅ 완료!")
-            print(f"📄 Notion 페이지: {page_url}")
-        print("=" * 50)
-        
-    except Exception as e:
-        print(f"\n❌ 오류 발생: {e}")
+        urls = [url for entry in args.targets for url in expand_target(entry)]
+    except ValueError as e:
+        print(f"❌ 오류: {e}")
+        print("   예시: https://www.acmicpc.net/problem/14716, 14716, 1000-1999")
+        sys.exit(1)
+    
+    if (args.tier or args.tag) and not args.solved_by:
+        print("❌ 오류: --tier, --tag는 --solved-by와 함께 사용해야 합니다.")
         sys.exit(1)
+    
+    # solved.ac에서 사용자가 푼 문제 스트리밍
+    solved_ids = None
+    if args.solved_by:
+        from solved_ac import iter_solved_problems
+        print(f"📚 solved.ac에서 {args.solved_by}님이 푼 문제를 가져옵니다...")
+        solved_ids = iter_solved_problems(args.solved_by, tier=args.tier, tag=args.tag)
+    
+    # 구간별 소요 시간 측정
+    profiling = args.profile or args.profile_json or args.profile_cprofile
+    if profiling:
+        import profiler
+        profiler.enable(cprofile=bool(args.profile_cprofile))
+    try:
+        run_problems(args, urls, concurrency, solved_ids, sink)
+    finally:
+        sink.close()
+        # 실패로 종료하는 경우에도 측정 결과는 남김
+        if profiling:
+            finish_profile(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+solved.ac 티어/태그 메타데이터 모듈
+
+티어 레벨(0~30)마다 이름, 기본 티어, 아이콘, 색상, 한국어 이름을 모듈을 불러올 때 한 번 표로 만들어 둡니다.
+solved.ac 전체 태그 목록(/api/v3/tag/list)은 처음 필요할 때 한 번 받아
+CACHE_DIR/solved_ac_tags.json에 저장해 두고 TAG_CACHE_TTL_HOURS 동안 재사용합니다.
+데몬처럼 오래 도는 프로세스는 유효 기간이 지나면 다시 준비하고,
+받아 오지 못했으면 TAG_RETRY_SECONDS 뒤에 다시 시도합니다.
+문제마다 티어/태그 이름을 정할 때는 표에서 찾아보기만 합니다.
+"""
+
+import os
+import json
+import time
+import threading
+
+from config import CACHE_DIR, TAG_CACHE_TTL_HOURS
+from profiler import timed, count
+
+
+TAG_LIST_URL = "https://solved.ac/api/v3/tag/list"
+
+HTTP_TIMEOUT = 10
+
+# 태그 목록 페이지 수 상한 (응답이 이상해도 끝없이 요청하지 않도록)
+MAX_TAG_PAGES = 50
+
+# 태그 목록을 받아 오지 못했을 때 다시 시도하기까지 기다리는 시간 (초)
+TAG_RETRY_SECONDS = 300
+
+TIER_BASES = ("Bronze", "Silver", "Gold", "Platinum", "Diamond", "Ruby")
+TIER_DIVISIONS = ("V", "IV", "III", "II", "I")
+
+# 티어별 아이콘
+TIER_ICONS = {
+    "Unrated": "❓",
+    "Bronze": "🥉",
+    "Silver": "🥈",
+    "Gold": "🥇",
+    "Platinum": "💎",
+    "Diamond": "💠",
+    "Ruby": "💎"
+}
+
+# 티어별 색상 (Notion API 지원 색상)
+TIER_COLORS = {
+    "Unrated": "default",
+    "Bronze": "brown",
+    "Silver": "gray",
+    "Gold": "yellow",
+    "Platinum": "green",
+    "Diamond": "blue",
+    "Ruby": "red"
+}
+
+# 티어 한국어 이름 (페이지 제목: [백준 실버 I])
+TIER_KOREAN = {
+    "Bronze": "브론즈",
+    "Silver": "실버",
+    "Gold": "골드",
+    "Platinum": "플래티넘",
+    "Diamond": "다이아몬드",
+    "Ruby": "루비"
+}
+
+
+def build_tier(level, name, base, division=""):
+    """티어 하나의 표 항목"""
+    korean = f"{TIER_KOREAN[base]} {division}" if base in TIER_KOREAN else name
+    return {
+        "level": level,
+        "name": name,
+        "base": base,
+        "icon": TIER_ICONS[base],
+        "color": TIER_COLORS[base],
+        "korean": korean,
+    }
+
+
+# 레벨 순서 티어 표: TIERS[0]은 Unrated, TIERS[1]은 Bronze V, ..., TIERS[30]은 Ruby I
+TIERS = (build_tier(0, "Unrated", "Unrated"),) + tuple(
+    build_tier(i * len(TIER_DIVISIONS) + j + 1, f"{base} {division}", base, division)
+    for i, base in enumerate(TIER_BASES)
+    for j, division in enumerate(TIER_DIVISIONS)
+)
+
+# solved.ac 정보를 가져오지 못한 문제
+UNKNOWN_TIER = build_tier(0, "Unknown", "Unrated")
+
+TIERS_BY_NAME = {tier["name"]: tier for tier in TIERS + (UNKNOWN_TIER,)}
+
+_tag_names = {}
+_tag_expires_at = 0.0
+_tag_lock = threading.Lock()
+
+
+def tier_by_level(level):
+    """solved.ac 레벨로 티어 찾기 (범위 밖이면 Unknown)"""
+    return TIERS[level] if 0 <= level < len(TIERS) else UNKNOWN_TIER
+
+
+def tier_by_name(name):
+    """티어 이름("Silver I")으로 티어 찾기 (모르는 이름이면 Unknown)"""
+    return TIERS_BY_NAME.get(name, UNKNOWN_TIER)
+
+
+def get_tag_name(tag):
+    """태그 이름 선택 (한국어 우선, 없으면 영어, 그것도 없으면 key)"""
+    ko_name = None
+    en_name = None
+    for name in tag.get("displayNames", []):
+        if name.get("language") == "ko":
+            ko_name = name.get("name")
+        elif name.get("language") == "en":
+            en_name = name.get("name")
+    return ko_name or en_name or tag.get("key", "")
+
+
+@timed("solved_ac.tag_list")
+def fetch_tag_names():
+    """
+    solved.ac 전체 태그 목록을 페이지 단위로 받아 {key: 표시 이름}으로
+
+    Raises:
+        requests.RequestException: 요청 실패
+    """
+    from fetcher import get_http_session
+
+    names = {}
+    for page in range(1, MAX_TAG_PAGES + 1):
+        response = get_http_session().get(
+            TAG_LIST_URL,
+            params={"page": page},
+            headers={"Accept": "application/json"},
+            timeout=HTTP_TIMEOUT
+        )
+        count("http.requests")
+        count("http.bytes", len(response.content))
+        response.raise_for_status()
+        data = response.json()
+
+        items = data.get("items", [])
+        for item in items:
+            names[item["key"]] = get_tag_name(item)
+        if not items or len(names) >= data.get("count", 0):
+            break
+    return names
+
+
+def tag_cache_path():
+    return os.path.join(CACHE_DIR, "solved_ac_tags.json")
+
+
+def read_tag_cache(path):
+    """
+    저장해 둔 태그 목록 읽기
+
+    Returns:
+        tuple: (가져온 시각, {key: 표시 이름}) 파일이 없거나 깨졌으면 (0, None)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+        return stored["fetched_at"], stored["names"]
+    except (OSError, ValueError, KeyError):
+        return 0, None
+
+
+def write_tag_cache(path, names):
+    """태그 목록 저장 (중간에 멈춰도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"fetched_at": time.time(), "names": names}, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def load_tag_names():
+    """
+    캐시 모드에 따라 태그 목록 준비
+
+    - use: 유효 기간 안의 파일이 있으면 그대로, 없으면 새로 받아 저장
+    - refresh: 새로 받아 저장
+    - off: 사용하지 않음 (문제마다 응답의 displayNames에서 고름)
+    받아 오지 못하면 유효 기간이 지난 파일이라도 사용합니다.
+
+    Returns:
+        tuple: ({key: 표시 이름}, 목록을 가져온 시각) 준비하지 못했으면 ({}, 0)
+    """
+    from cache import get_cache_mode, CACHE_USE, CACHE_OFF
+
+    mode = get_cache_mode()
+    if mode == CACHE_OFF:
+        return {}, 0
+
+    path = tag_cache_path()
+    fetched_at, names = read_tag_cache(path)
+    if names is not None and mode == CACHE_USE and time.time() - fetched_at <= TAG_CACHE_TTL_HOURS * 3600:
+        return names, fetched_at
+
+    try:
+        fresh = fetch_tag_names()
+    except Exception as e:
+        print(f"⚠️ solved.ac 태그 목록을 가져올 수 없습니다: {e}")
+        return (names, fetched_at) if names else ({}, 0)
+
+    try:
+        write_tag_cache(path, fresh)
+    except OSError as e:
+        print(f"⚠️ solved.ac 태그 목록을 저장할 수 없습니다: {e}")
+    return fresh, time.time()
+
+
+def get_tag_names():
+    """
+    태그 key → 표시 이름 사전
+
+    처음 호출할 때 준비하고 TAG_CACHE_TTL_HOURS가 지나면 다시 준비합니다.
+    받아 오지 못했거나 유효 기간이 지난 파일만 읽었으면 (빈 결과는 저장하지 않고)
+    TAG_RETRY_SECONDS 뒤에 다시 시도합니다.
+    """
+    global _tag_names, _tag_expires_at
+    with _tag_lock:
+        now = time.time()
+        if now >= _tag_expires_at:
+            names, fetched_at = load_tag_names()
+            if names:
+                _tag_names = names
+            _tag_expires_at = max(fetched_at + TAG_CACHE_TTL_HOURS * 3600, now + TAG_RETRY_SECONDS)
+        return _tag_names
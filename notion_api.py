@@ -3,69 +3,112 @@
 Notion API 연동 모듈
 
 크롤링한 백준 문제를 Notion 페이지로 생성합니다.
+
+NOTION_DATABASE_ID를 설정하면 부모 페이지 대신 데이터베이스에 만들고,
+문제 번호/티어/태그/제한/정답 비율을 데이터베이스 속성으로 기록합니다.
 """
 
-from notion_client import Client
-from config import NOTION_TOKEN, NOTION_PARENT_PAGE_ID
+import json
+import time
+import threading
 
+from notion_client import Client, APIResponseError
+from config import NOTION_TOKEN, NOTION_PARENT_PAGE_ID, NOTION_DATABASE_ID, NOTION_BASE_URL, NOTION_MAX_RETRIES
+from duplicate_index import get_duplicate_index, page_url
+from rate_limit import notion_call, is_uncertain, backoff_delay
+from profiler import timed
+from cache import content_hash
+from page_template import PAGE_TEMPLATE
+from metadata import TIERS, tier_by_name
 
-# 티어별 아이콘 매핑
-TIER_ICONS = {
-    "Unrated": "❓",
-    "Bronze": "🥉",
-    "Silver": "🥈", 
-    "Gold": "🥇",
-    "Platinum": "💎",
-    "Diamond": "💠",
-    "Ruby": "💎"
-}
 
-# 티어별 색상 매핑 (Notion API 지원 색상)
-TIER_COLORS = {
-    "Unrated": "default",
-    "Bronze": "brown",
-    "Silver": "gray",
-    "Gold": "yellow",
-    "Platinum": "green",
-    "Diamond": "blue",
-    "Ruby": "red"
+# 섹션 제목 (페이지 갱신 시 섹션 경계를 찾는 표식으로도 사용)
+SECTION_HEADINGS = {
+    section["key"]: section["heading"] for section in PAGE_TEMPLATE if section.get("heading")
 }
 
+# Notion API 요청 제한: 요청당 블록 100개, 본문 500KB (여유를 두고 사용)
+MAX_BLOCKS_PER_REQUEST = 100
+MAX_PAYLOAD_BYTES = 400 * 1024
+
+# 블록 텍스트 제한: rich_text 항목당 2000자(UTF-16 단위), 블록당 항목 100개
+# 블록 하나가 요청 하나에 들어가도록 블록당 텍스트 크기도 제한
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+MAX_BLOCK_TEXT_BYTES = MAX_PAYLOAD_BYTES // 4
+
 # 백준 관련 커버 이미지 URL
 COVER_IMAGE_URL = "https://d2gd6pc034wcta.cloudfront.net/images/logo@2x.png"
 
+# 데이터베이스 속성 이름 (NOTION_DATABASE_ID를 설정했을 때, 제목 속성은 데이터베이스의 것을 그대로 사용)
+DATABASE_PROPERTIES = {
+    "problem_id": "번호",
+    "tier": "티어",
+    "tier_level": "티어 레벨",
+    "tags": "태그",
+    "time_limit": "시간 제한",
+    "memory_limit": "메모리 제한",
+    "accuracy": "정답 비율",
+}
 
-def get_notion_client():
-    """Notion 클라이언트 생성"""
-    if not NOTION_TOKEN:
-        raise ValueError("NOTION_TOKEN이 설정되지 않았습니다.")
-    return Client(auth=NOTION_TOKEN)
+# 프로세스 안에서 재사용하는 Notion 클라이언트 (배치 처리 시 연결 재사용)
+_client = None
+_client_lock = threading.Lock()
+
+_database = None
+_database_lock = threading.Lock()
 
 
-def get_tier_base(tier):
-    """티어에서 기본 이름 추출 (예: 'Silver I' -> 'Silver')"""
-    for base in ["Bronze", "Silver", "Gold", "Platinum", "Diamond", "Ruby"]:
-        if base in tier:
-            return base
-    return "Unrated"
+def get_notion_client():
+    """Notion 클라이언트 반환 (최초 호출 시 한 번만 생성)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if not NOTION_TOKEN:
+                raise ValueError("NOTION_TOKEN이 설정되지 않았습니다.")
+            options = {"auth": NOTION_TOKEN}
+            if NOTION_BASE_URL:
+                # 로컬 대역 서버(bench/notion_stub.py) 등으로 요청을 보낼 때
+                options["base_url"] = NOTION_BASE_URL
+            try:
+                # 재시도는 rate_limit.notion_call에서 처리 (SDK 자체 재시도와 중복 방지)
+                _client = Client(**options, retry=False)
+            except TypeError:
+                # retry 옵션이 없는 notion-client 2.x
+                _client = Client(**options)
+        return _client
 
 
 def get_tier_icon(tier):
     """티어에 맞는 아이콘 반환"""
-    base = get_tier_base(tier)
-    return TIER_ICONS.get(base, "🥚")
+    return tier_by_name(tier)["icon"]
 
 
 def get_tier_color(tier):
     """티어에 맞는 색상 반환"""
-    base = get_tier_base(tier)
-    return TIER_COLORS.get(base, "default")
+    return tier_by_name(tier)["color"]
 
 
+def is_page_alive(client, page_id):
+    """페이지가 휴지통에 있지 않은지 확인 (삭제되어 찾을 수 없으면 False)"""
+    try:
+        page = notion_call(client.pages.retrieve, page_id=page_id)
+    except APIResponseError as e:
+        if e.code == "object_not_found":
+            return False
+        raise
+    return not (page.get("in_trash") or page.get("archived"))
+
+
+@timed("notion.duplicate_check")
 def check_duplicate(client, problem_id):
     """
     이미 등록된 문제인지 확인
     
+    로컬 중복 인덱스(duplicate_index.py)에서 API 호출 없이 조회합니다.
+    휴지통으로 옮긴 페이지는 전체 동기화(--resync-index)나 --refresh 갱신이 실패할 때 인덱스에서 빠집니다.
+    데이터베이스에 작성할 때는 인덱스에 없는 문제만 문제 번호 필터로 한 번 조회합니다.
+    
     Args:
         client: Notion 클라이언트
         problem_id: 백준 문제 번호
@@ -74,18 +117,14 @@ def check_duplicate(client, problem_id):
         str or None: 중복된 페이지 URL (없으면 None)
     """
     try:
-        # 부모 페이지의 하위 페이지들 검색
-        response = client.blocks.children.list(block_id=NOTION_PARENT_PAGE_ID)
-        
-        for block in response.get("results", []):
-            if block.get("type") == "child_page":
-                page_title = block.get("child_page", {}).get("title", "")
-                # 문제 번호가 제목에 포함되어 있는지 확인
-                if f"] {problem_id}:" in page_title:
-                    # 페이지 ID로 URL 생성
-                    page_id = block.get("id", "").replace("-", "")
-                    return f"https://www.notion.so/{page_id}"
-        
+        index = get_duplicate_index(client)
+        page_id = index.lookup(problem_id)
+        if page_id is None and NOTION_DATABASE_ID:
+            page_id = get_notion_database(client).find_page(problem_id)
+            if page_id:
+                index.add(problem_id, page_id)
+        if page_id:
+            return page_url(page_id)
         return None
     except Exception as e:
         print(f"⚠️ 중복 체크 실패: {e}")
@@ -97,292 +136,882 @@ def test_connection():
     try:
         client = get_notion_client()
         # 사용자 정보 조회로 연결 테스트
-        response = client.users.me()
+        response = notion_call(client.users.me)
         print(f"✅ Connected to Notion!")
         print(f"   Bot: {response.get('name', 'Unknown')}")
+        if NOTION_DATABASE_ID:
+            print(f"   Database: {get_notion_database(client).title or NOTION_DATABASE_ID}")
         return True
     except Exception as e:
         print(f"❌ Notion 연결 실패: {e}")
         return False
 
 
-def create_problem_page(problem_data, skip_duplicate=True):
+def build_page_title(problem_data):
+    """페이지 제목 생성: [백준 실버 1] 14716: 현수막"""
+    tier_korean = tier_by_name(problem_data["tier"])["korean"]
+    return f"[백준 {tier_korean}] {problem_data['problem_id']}: {problem_data['title']}"
+
+
+def parse_ratio(text):
+    """정답 비율 문자열을 0~1 숫자로 ("45.123%" -> 0.45123, 형식이 다르면 None)"""
+    try:
+        return round(float(text.strip().rstrip("%")) / 100, 7)
+    except ValueError:
+        return None
+
+
+def build_database_schema():
+    """데이터베이스에 있어야 하는 속성 스키마 (제목 속성 제외)"""
+    names = DATABASE_PROPERTIES
+    return {
+        names["problem_id"]: {"number": {"format": "number"}},
+        names["tier"]: {
+            "select": {"options": [{"name": tier["name"], "color": tier["color"]} for tier in TIERS]}
+        },
+        names["tier_level"]: {"number": {"format": "number"}},
+        names["tags"]: {"multi_select": {"options": []}},
+        names["time_limit"]: {"rich_text": {}},
+        names["memory_limit"]: {"rich_text": {}},
+        names["accuracy"]: {"number": {"format": "percent"}},
+    }
+
+
+def build_database_properties(problem_data):
+    """문제 하나의 데이터베이스 속성 값 (제목 속성 제외)"""
+    names = DATABASE_PROPERTIES
+    # 선택 옵션 이름에는 쉼표를 쓸 수 없고 최대 100자
+    tags = dict.fromkeys(tag.replace(",", " ")[:100] for tag in problem_data["tags"])
+    return {
+        names["problem_id"]: {"number": problem_data["problem_id"]},
+        names["tier"]: {"select": {"name": problem_data["tier"]}},
+        names["tier_level"]: {"number": problem_data["tier_level"]},
+        names["tags"]: {"multi_select": [{"name": tag} for tag in tags]},
+        names["time_limit"]: {"rich_text": [rich_text(problem_data["time_limit"])] if problem_data["time_limit"] else []},
+        names["memory_limit"]: {"rich_text": [rich_text(problem_data["memory_limit"])] if problem_data["memory_limit"] else []},
+        names["accuracy"]: {"number": parse_ratio(problem_data["accuracy"])},
+    }
+
+
+class NotionDatabase:
     """
-    백준 문제를 Notion 페이지로 생성
+    문제 페이지를 만들 Notion 데이터베이스
+
+    처음 열 때 DATABASE_PROPERTIES 중 없는 속성을 추가합니다.
+    notion-client 3.x(API 2025-09-03)는 속성과 조회가 데이터베이스의 데이터 소스에 있으므로
+    첫 번째 데이터 소스를 사용하고, 2.x는 데이터베이스에 바로 요청합니다.
+    """
+
+    def __init__(self, client, database_id):
+        self.client = client
+        self.database_id = database_id
+
+        database = notion_call(client.databases.retrieve, database_id=database_id)
+        self.title = "".join(part.get("plain_text", "") for part in database.get("title", []))
+        if hasattr(client, "data_sources"):
+            sources = database.get("data_sources") or []
+            if not sources:
+                raise ValueError(f"데이터 소스가 없는 데이터베이스입니다: {database_id}")
+            self.data_source_id = sources[0]["id"]
+            properties = notion_call(client.data_sources.retrieve, data_source_id=self.data_source_id)["properties"]
+        else:
+            self.data_source_id = None
+            properties = database["properties"]
+
+        self.title_property = next(name for name, prop in properties.items() if prop["type"] == "title")
+        self._ensure_schema(properties)
+
+    def _ensure_schema(self, properties):
+        """없는 속성 추가 (같은 이름의 속성이 종류가 다르면 ValueError)"""
+        missing = {}
+        for name, schema in build_database_schema().items():
+            expected = next(iter(schema))
+            if name not in properties:
+                missing[name] = schema
+            elif properties[name]["type"] != expected:
+                raise ValueError(
+                    f"데이터베이스 속성 '{name}'의 종류가 {properties[name]['type']}입니다 ({expected}이어야 함)"
+                )
+        if not missing:
+            return
+        if self.data_source_id:
+            notion_call(self.client.data_sources.update, data_source_id=self.data_source_id, properties=missing)
+        else:
+            notion_call(self.client.databases.update, database_id=self.database_id, properties=missing)
+
+    def parent(self):
+        """pages.create의 parent 값"""
+        if self.data_source_id:
+            return {"type": "data_source_id", "data_source_id": self.data_source_id}
+        return {"database_id": self.database_id}
+
+    @timed("notion.database_query")
+    def find_page(self, problem_id):
+        """문제 번호로 페이지 ID 조회 (없으면 None)"""
+        query = {
+            "filter": {"property": DATABASE_PROPERTIES["problem_id"], "number": {"equals": problem_id}},
+            "page_size": 1,
+        }
+        if self.data_source_id:
+            response = notion_call(self.client.data_sources.query, data_source_id=self.data_source_id, **query)
+        else:
+            response = notion_call(self.client.databases.query, database_id=self.database_id, **query)
+        results = response.get("results", [])
+        return results[0]["id"] if results else None
+
+
+def get_notion_database(client):
+    """NOTION_DATABASE_ID의 데이터베이스 반환 (최초 호출 시 한 번만 조회하고 스키마 확인)"""
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = NotionDatabase(client, NOTION_DATABASE_ID)
+        return _database
+
+
+def build_page_properties(problem_data):
+    """페이지 속성 (데이터베이스에 작성하면 제목과 함께 문제 정보 속성)"""
+    title = {"title": [{"type": "text", "text": {"content": build_page_title(problem_data)}}]}
+    if not NOTION_DATABASE_ID:
+        return {"title": title}
+    database = get_notion_database(get_notion_client())
+    return {database.title_property: title, **build_database_properties(problem_data)}
+
+
+def build_image_blocks(image_urls):
+    """이미지 URL 리스트를 외부 이미지 블록으로 변환"""
+    return [
+        {
+            "object": "block",
+            "type": "image",
+            "image": {"type": "external", "external": {"url": url}}
+        }
+        for url in image_urls
+    ]
+
+
+def rich_text(content, link=None, color=None):
+    """rich_text 항목 하나"""
+    text = {"content": content}
+    if link:
+        text["link"] = {"url": link}
+    item = {"type": "text", "text": text}
+    if color:
+        item["annotations"] = {"color": color}
+    return item
+
+
+def paragraph_block(*contents):
+    return {
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {"rich_text": [rich_text(content) for content in contents]}
+    }
+
+
+def heading_block(level, content, color=None):
+    block_type = f"heading_{level}"
+    return {
+        "object": "block",
+        "type": block_type,
+        block_type: {"rich_text": [rich_text(content, color=color)]}
+    }
+
+
+def callout_block(items, icon, color):
+    return {
+        "object": "block",
+        "type": "callout",
+        "callout": {"rich_text": items, "icon": icon, "color": color}
+    }
+
+
+def table_row_block(values):
+    return {
+        "object": "block",
+        "type": "table_row",
+        "table_row": {"cells": [[rich_text(value)] for value in values]}
+    }
+
+
+def code_block(content, language):
+    return {
+        "object": "block",
+        "type": "code",
+        "code": {"rich_text": [rich_text(content)], "language": language}
+    }
+
+
+DIVIDER_BLOCK = {"object": "block", "type": "divider", "divider": {}}
+
+# 예제 번호별 제목 블록을 미리 만들어 둘 개수 (넘는 예제는 그때그때 생성)
+PRECOMPILED_EXAMPLES = 20
+
+
+def compile_block(spec, precompiled_examples=PRECOMPILED_EXAMPLES):
+    """
+    템플릿 블록 선언 하나를 컴파일
+
+    Returns:
+        tuple or callable: 고정 블록 튜플, 또는 문제 딕셔너리를 받아 블록 리스트를 만드는 함수
+    """
+    kind = spec["type"]
+    
+    if kind == "paragraph":
+        return (paragraph_block(spec["text"]),)
+    
+    if kind == "text":
+        field = spec["field"]
+        return lambda problem_data: [paragraph_block(*segments) for segments in pack_text(problem_data.get(field, ""))]
+    
+    if kind == "images":
+        field = spec["field"]
+        return lambda problem_data: build_image_blocks(problem_data.get(field, []))
+    
+    if kind == "tag_callout":
+        icon = {"type": "emoji", "emoji": spec["icon"]}
+        
+        def fill_tags(problem_data):
+            tags = problem_data.get("tags", [])
+            if not tags:
+                return []
+            return [callout_block([rich_text(" | ".join(f"#{tag}" for tag in tags))], icon, spec["color"])]
+        return fill_tags
+    
+    if kind == "link_callout":
+        icon = {"type": "emoji", "emoji": spec["icon"]}
+        label = rich_text(spec["label"])
+        
+        def fill_link(problem_data):
+            url = problem_data["url"]
+            return [callout_block([label, rich_text(url, link=url)], icon, spec["color"])]
+        return fill_link
+    
+    if kind == "info_table":
+        headers, fields = zip(*spec["columns"])
+        header_row = table_row_block(headers)
+        
+        def fill_table(problem_data):
+            return [{
+                "object": "block",
+                "type": "table",
+                "table": {
+                    "table_width": len(fields),
+                    "has_column_header": True,
+                    "has_row_header": False,
+                    "children": [header_row, table_row_block(problem_data.get(field, "") for field in fields)]
+                }
+            }]
+        return fill_table
+    
+    if kind == "examples":
+        language = spec["language"]
+        
+        def labels(i):
+            return (heading_block(3, spec["input_label"].format(i)), heading_block(3, spec["output_label"].format(i)))
+        precompiled = [labels(i) for i in range(1, precompiled_examples + 1)]
+        
+        def fill_examples(problem_data):
+            blocks = []
+            for i, example in enumerate(problem_data.get("examples", []), 1):
+                input_label, output_label = precompiled[i - 1] if i <= precompiled_examples else labels(i)
+                blocks.append(input_label)
+                blocks.append(code_block(example.get("input", ""), language))
+                blocks.append(output_label)
+                blocks.append(code_block(example.get("output", ""), language))
+            return blocks
+        return fill_examples
+    
+    raise ValueError(f"알 수 없는 템플릿 블록 종류: {kind}")
+
+
+def compile_page_template(template, precompiled_examples=PRECOMPILED_EXAMPLES):
+    """
+    페이지 템플릿을 섹션별 조각 리스트로 컴파일
+    
+    구분선, 섹션 제목처럼 문제와 무관한 블록은 여기서 한 번만 만들고,
+    이웃한 고정 블록은 하나의 튜플로 합칩니다.
+    고정 블록은 모든 페이지가 같은 객체를 공유하므로 만든 블록을 수정하면 안 됩니다.
+    
+    Returns:
+        list: [(섹션 키, [고정 블록 튜플 또는 채우기 함수])]
+    """
+    compiled = []
+    for section in template:
+        parts = []
+        static = []
+        if section.get("divider"):
+            static.append(DIVIDER_BLOCK)
+        if section.get("heading"):
+            static.append(heading_block(2, section["heading"], section.get("heading_color")))
+        
+        for spec in section["blocks"]:
+            part = compile_block(spec, precompiled_examples)
+            if callable(part):
+                if static:
+                    parts.append(tuple(static))
+                    static = []
+                parts.append(part)
+            else:
+                static.extend(part)
+        if static:
+            parts.append(tuple(static))
+        compiled.append((section["key"], parts))
+    return compiled
+
+
+COMPILED_TEMPLATE = compile_page_template(PAGE_TEMPLATE)
+
+
+def render_sections(compiled, problem_data):
+    """컴파일한 템플릿에 문제 내용을 채워 [(섹션 키, 블록 리스트)] 생성"""
+    sections = []
+    for key, parts in compiled:
+        blocks = []
+        for part in parts:
+            blocks.extend(part(problem_data) if callable(part) else part)
+        sections.append((key, blocks))
+    return sections
+
+
+@timed("notion.build_blocks")
+def build_problem_sections(problem_data):
+    """
+    문제 페이지 본문을 섹션별 블록 리스트로 생성
+    
+    컴파일해 둔 페이지 템플릿(page_template.py)에 문제별 내용만 채웁니다.
+    구분선은 뒤따르는 섹션에 포함됩니다.
     
     Args:
         problem_data: scraper.py에서 반환한 문제 딕셔너리
-        skip_duplicate: True면 중복 시 스킵, False면 그래도 생성
     
     Returns:
-        str: 생성된 페이지 URL (또는 기존 페이지 URL)
+        list: [(섹션 키, 블록 리스트)]
     """
-    client = get_notion_client()
+    return render_sections(COMPILED_TEMPLATE, problem_data)
+
+
+def build_problem_blocks(problem_data):
+    """
+    문제 페이지 본문 블록 리스트 생성
     
-    # 중복 체크
-    if skip_duplicate:
-        existing_url = check_duplicate(client, problem_data["problem_id"])
-        if existing_url:
-            return f"(이미 존재) {existing_url}"
+    Args:
+        problem_data: scraper.py에서 반환한 문제 딕셔너리
     
-    # 한국어 티어 변환
-    tier_korean = problem_data["tier"].replace("Bronze", "브론즈").replace("Silver", "실버").replace("Gold", "골드").replace("Platinum", "플래티넘").replace("Diamond", "다이아몬드").replace("Ruby", "루비")
+    Returns:
+        list: Notion 블록 리스트
+    """
+    return [block for _, blocks in build_problem_sections(problem_data) for block in blocks]
+
+
+def chunk_blocks(blocks, max_count=MAX_BLOCKS_PER_REQUEST, max_bytes=MAX_PAYLOAD_BYTES):
+    """
+    블록 리스트를 한 번의 요청에 담을 수 있는 묶음으로 분할
     
-    # 페이지 제목 생성: [백준 실버 1] 14716: 현수막
-    page_title = f"[백준 {tier_korean}] {problem_data['problem_id']}: {problem_data['title']}"
+    블록 개수(최대 100개)와 JSON 크기를 함께 제한합니다.
     
-    # 티어별 아이콘 및 색상
-    tier_icon = get_tier_icon(problem_data["tier"])
-    tier_color = get_tier_color(problem_data["tier"])
+    Yields:
+        list: 블록 묶음
+    """
+    batch = []
+    batch_bytes = 0
+    for block in blocks:
+        size = len(json.dumps(block, ensure_ascii=False).encode("utf-8"))
+        if batch and (len(batch) >= max_count or batch_bytes + size > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(block)
+        batch_bytes += size
     
-    # Notion 블록 구성
-    children = []
+    if batch:
+        yield batch
+
+
+def find_created_page(client, problem_id):
+    """
+    응답을 받지 못한 pages.create가 실제로는 페이지를 만들었는지 확인
     
-    # 0. 알고리즘 태그 섹션 (태그가 있을 때만)
-    tags = problem_data.get("tags", [])
-    if tags:
-        tag_text = " | ".join([f"#{tag}" for tag in tags])
-        children.append({
-            "object": "block",
-            "type": "callout",
-            "callout": {
-                "rich_text": [{"type": "text", "text": {"content": tag_text}}],
-                "icon": {"type": "emoji", "emoji": "🏷️"},
-                "color": "purple_background"
-            }
-        })
-    
-    # 1. 링크 섹션 (Callout)
-    children.append({
-        "object": "block",
-        "type": "callout",
-        "callout": {
-            "rich_text": [
-                {"type": "text", "text": {"content": "www.acmicpc.net\n"}},
-                {"type": "text", "text": {"content": problem_data["url"], "link": {"url": problem_data["url"]}}}
-            ],
-            "icon": {"type": "emoji", "emoji": "🔗"},
-            "color": "gray_background"
-        }
-    })
+    Returns:
+        str or None: 문제 번호로 찾은 페이지 ID
+    """
+    if NOTION_DATABASE_ID:
+        return get_notion_database(client).find_page(problem_id)
+    index = get_duplicate_index(client)
+    index.sync(client)
+    return index.lookup(problem_id)
+
+
+def create_page(client, problem_id, **kwargs):
+    """
+    pages.create 호출
     
-    # 2. 구분선
-    children.append({"object": "block", "type": "divider", "divider": {}})
+    다시 보내면 페이지가 두 번 생길 수 있으므로, 응답을 받지 못했으면(타임아웃, 5xx)
+    문제 번호로 페이지를 찾아보고 없을 때만 다시 보냅니다.
     
-    # 3. 문제 정보 테이블
-    children.append({
-        "object": "block",
-        "type": "table",
-        "table": {
-            "table_width": 6,
-            "has_column_header": True,
-            "has_row_header": False,
-            "children": [
-                {
-                    "object": "block",
-                    "type": "table_row",
-                    "table_row": {
-                        "cells": [
-                            [{"type": "text", "text": {"content": "시간 제한"}}],
-                            [{"type": "text", "text": {"content": "메모리 제한"}}],
-                            [{"type": "text", "text": {"content": "제출"}}],
-                            [{"type": "text", "text": {"content": "정답"}}],
-                            [{"type": "text", "text": {"content": "맞힌 사람"}}],
-                            [{"type": "text", "text": {"content": "정답 비율"}}]
-                        ]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "table_row",
-                    "table_row": {
-                        "cells": [
-                            [{"type": "text", "text": {"content": problem_data.get("time_limit", "")}}],
-                            [{"type": "text", "text": {"content": problem_data.get("memory_limit", "")}}],
-                            [{"type": "text", "text": {"content": problem_data.get("submissions", "")}}],
-                            [{"type": "text", "text": {"content": problem_data.get("accepted", "")}}],
-                            [{"type": "text", "text": {"content": problem_data.get("users", "")}}],
-                            [{"type": "text", "text": {"content": problem_data.get("accuracy", "")}}]
-                        ]
-                    }
-                }
-            ]
-        }
-    })
+    Returns:
+        dict: 만든 페이지 (찾은 경우 {"id", "url"})
+    """
+    known = get_duplicate_index().lookup(problem_id)
+    attempt = 0
+    while True:
+        try:
+            return notion_call(client.pages.create, **kwargs)
+        except Exception as e:
+            if attempt >= NOTION_MAX_RETRIES or not is_uncertain(e):
+                raise
+            time.sleep(backoff_delay(attempt))
+            page_id = find_created_page(client, problem_id)
+            if page_id and page_id != known:
+                print(f"   ↻ 응답은 받지 못했지만 페이지가 만들어져 있습니다: {problem_id}")
+                return {"id": page_id, "url": page_url(page_id)}
+            attempt += 1
+            print(f"⚠️ 페이지가 만들어지지 않아 다시 보냅니다 {attempt}/{NOTION_MAX_RETRIES}: {e}")
+
+
+def append_batch(client, page_id, batch, written):
+    """
+    blocks.children.append 호출
     
-    # 4. 문제 섹션
-    children.append({"object": "block", "type": "divider", "divider": {}})
-    children.append({
-        "object": "block",
-        "type": "heading_2",
-        "heading_2": {
-            "rich_text": [{
-                "type": "text", 
-                "text": {"content": "📋 문제"},
-                "annotations": {"color": "blue"}
-            }]
-        }
-    })
+    다시 보내면 블록이 두 번 붙을 수 있으므로, 응답을 받지 못했으면(타임아웃, 5xx)
+    페이지의 블록 수를 세어 붙지 않았을 때만 다시 보냅니다.
     
-    # 문제 설명 (길이 제한: Notion API는 블록당 2000자)
-    description = problem_data.get("description", "")
-    for chunk in split_text(description, 2000):
-        children.append({
-            "object": "block",
-            "type": "paragraph",
-            "paragraph": {"rich_text": [{"type": "text", "text": {"content": chunk}}]}
-        })
+    Args:
+        written: 붙이기 전 페이지의 최상위 블록 수
+    """
+    attempt = 0
+    while True:
+        try:
+            notion_call(client.blocks.children.append, block_id=page_id, children=batch)
+            return
+        except Exception as e:
+            if attempt >= NOTION_MAX_RETRIES or not is_uncertain(e):
+                raise
+            time.sleep(backoff_delay(attempt))
+            actual = len(list_children(client, page_id))
+            if actual == written + len(batch):
+                return
+            if actual != written:
+                raise ValueError(f"페이지 블록 수가 맞지 않아 이어 붙일 수 없습니다 (예상 {written}, 실제 {actual})") from e
+            attempt += 1
+            print(f"⚠️ 블록이 붙지 않아 다시 보냅니다 {attempt}/{NOTION_MAX_RETRIES}: {e}")
+
+
+def append_blocks(client, problem_id, page_id, children, written):
+    """
+    children[written:]을 페이지에 묶음 단위로 이어 붙이기
     
+    묶음 하나를 붙일 때마다 진행 상황을 기록하므로,
+    중간에 실패해도 다음 실행에서 남은 블록부터 이어서 작성합니다.
+    """
+    index = get_duplicate_index()
+    for batch in chunk_blocks(children[written:]):
+        append_batch(client, page_id, batch, written)
+        written += len(batch)
+        if written < len(children):
+            index.mark_partial(problem_id, page_id, written, len(children))
+    index.clear_partial(problem_id)
 
-    # 5. 입력 섹션
-    children.append({"object": "block", "type": "divider", "divider": {}})
-    children.append({
-        "object": "block",
-        "type": "heading_2",
-        "heading_2": {
-            "rich_text": [{
-                "type": "text", 
-                "text": {"content": "📥 입력"},
-                "annotations": {"color": "blue"}
-            }]
-        }
-    })
+
+def list_children(client, block_id):
+    """블록의 하위 블록 전체 조회 (페이지네이션)"""
+    blocks = []
+    cursor = None
+    while True:
+        kwargs = {"block_id": block_id, "page_size": 100}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        response = notion_call(client.blocks.children.list, **kwargs)
+        blocks.extend(response.get("results", []))
+        if not response.get("has_more"):
+            return blocks
+        cursor = response.get("next_cursor")
+
+
+def rich_text_signature(rich_text):
+    """
+    rich_text 비교용 값 (내용, 링크, 색상만 비교)
+
+    링크와 색상이 같은 이웃 항목은 합쳐서 비교하므로 조각을 나눈 위치와 무관합니다.
+    """
+    signature = []
+    for item in rich_text:
+        text = item.get("text") or {}
+        link = text.get("link") or {}
+        color = (item.get("annotations") or {}).get("color", "default")
+        content = text.get("content", item.get("plain_text", ""))
+        if signature and signature[-1][1:] == [link.get("url"), color]:
+            signature[-1][0] += content
+        else:
+            signature.append([content, link.get("url"), color])
+    return signature
+
+
+def block_signature(block):
+    """
+    블록 비교용 값
     
-    input_desc = problem_data.get("input", "")
-    for chunk in split_text(input_desc, 2000):
-        children.append({
-            "object": "block",
-            "type": "paragraph",
-            "paragraph": {"rich_text": [{"type": "text", "text": {"content": chunk}}]}
-        })
+    직접 만든 블록과 Notion API가 돌려준 블록을 같은 기준으로 비교할 수 있도록
+    내용에 영향을 주는 속성만 뽑습니다.
+    """
+    block_type = block.get("type")
+    body = block.get(block_type) or {}
+    if block_type == "table_row":
+        return [block_type, [rich_text_signature(cell) for cell in body.get("cells", [])]]
+    return [
+        block_type,
+        rich_text_signature(body.get("rich_text", [])),
+        (body.get("icon") or {}).get("emoji"),
+        body.get("color", "default"),
+        body.get("language"),
+        body.get("table_width"),
+        (body.get("external") or {}).get("url"),
+    ]
+
+
+def compute_section_hashes(problem_data, sections=None):
+    """페이지 제목/아이콘과 섹션별 블록의 내용 해시"""
+    page = {
+        "title": build_page_title(problem_data),
+        "icon": get_tier_icon(problem_data["tier"]),
+    }
+    if NOTION_DATABASE_ID:
+        page["properties"] = build_database_properties(problem_data)
+    hashes = {"page": content_hash(page)}
+    if sections is None:
+        sections = build_problem_sections(problem_data)
+    for key, blocks in sections:
+        hashes[key] = content_hash(blocks)
+    return hashes
+
+
+def split_page_sections(blocks):
+    """
+    기존 페이지의 최상위 블록을 섹션별로 나누기
+    
+    첫 섹션 제목 전의 테이블은 info, 섹션 제목(heading_2)은 각 섹션의 시작으로 보고,
+    구분선은 뒤따르는 섹션에 붙입니다.
+    풀이 섹션 제목부터 페이지 끝까지는 직접 작성한 내용이므로 나누지 않고 "solution"에 모읍니다.
+    
+    템플릿의 섹션이 빠짐없이 순서대로 있지 않거나 풀이 섹션 앞에 모르는 heading_2가 있으면
+    (섹션 제목을 바꾸거나 직접 추가한 페이지) 블록이 어느 섹션에 속하는지 알 수 없으므로 None을 반환합니다.
+    
+    Returns:
+        dict or None: {섹션 키: [블록]}
+    """
+    heading_keys = {text: key for key, text in SECTION_HEADINGS.items()}
+    expected = iter([section["key"] for section in PAGE_TEMPLATE[1:]])
+    sections = {"header": []}
+    current = "header"
+    pending = []
+    
+    for block in blocks:
+        if current == "solution":
+            sections[current].append(block)
+            continue
+        
+        block_type = block.get("type")
+        if block_type == "divider":
+            pending.append(block)
+            continue
+        
+        key = None
+        if block_type == "table" and current == "header":
+            key = "info"
+        elif block_type == "heading_2":
+            rich_text = block["heading_2"].get("rich_text", [])
+            key = heading_keys.get("".join(item.get("plain_text", "") for item in rich_text))
+            if key is None:
+                return None
+        
+        if key:
+            if key != next(expected, None):
+                return None
+            current = key
+            sections[key] = pending + [block]
+        else:
+            sections[current].extend(pending + [block])
+        pending = []
     
+    if next(expected, None) is not None:
+        return None
+    sections[current].extend(pending)
+    return sections
 
-    # 6. 출력 섹션
-    children.append({"object": "block", "type": "divider", "divider": {}})
-    children.append({
-        "object": "block",
-        "type": "heading_2",
-        "heading_2": {
-            "rich_text": [{
-                "type": "text", 
-                "text": {"content": "📤 출력"},
-                "annotations": {"color": "blue"}
-            }]
-        }
-    })
+
+def sync_table(client, old_table, new_table):
+    """
+    테이블 행 중 내용이 바뀐 행만 수정
     
-    output_desc = problem_data.get("output", "")
-    for chunk in split_text(output_desc, 2000):
-        children.append({
-            "object": "block",
-            "type": "paragraph",
-            "paragraph": {"rich_text": [{"type": "text", "text": {"content": chunk}}]}
-        })
+    Returns:
+        int or None: 수정한 행 수 (행 수가 달라 제자리 수정이 불가능하면 None)
+    """
+    old_rows = list_children(client, old_table["id"])
+    new_rows = new_table["table"]["children"]
+    if len(old_rows) != len(new_rows):
+        return None
     
+    updated = 0
+    for old_row, new_row in zip(old_rows, new_rows):
+        if block_signature(old_row) != block_signature(new_row):
+            notion_call(client.blocks.update, block_id=old_row["id"], table_row=new_row["table_row"])
+            updated += 1
+    return updated
 
-    # 7. 예제 섹션
-    children.append({"object": "block", "type": "divider", "divider": {}})
-    children.append({
-        "object": "block",
-        "type": "heading_2",
-        "heading_2": {
-            "rich_text": [{
-                "type": "text", 
-                "text": {"content": "💻 예제"},
-                "annotations": {"color": "blue"}
-            }]
-        }
-    })
+
+def sync_section(client, page_id, old_blocks, new_blocks, after_id):
+    """
+    섹션 하나를 새 블록 리스트에 맞게 수정
     
-    examples = problem_data.get("examples", [])
-    for i, example in enumerate(examples, 1):
-        # 예제 입력
-        children.append({
-            "object": "block",
-            "type": "heading_3",
-            "heading_3": {"rich_text": [{"type": "text", "text": {"content": f"예제 입력 {i}"}}]}
-        })
-        children.append({
-            "object": "block",
-            "type": "code",
-            "code": {
-                "rich_text": [{"type": "text", "text": {"content": example.get("input", "")}}],
-                "language": "plain text"
-            }
-        })
+    앞에서부터 같은 종류의 블록은 내용이 다를 때만 제자리 수정하고,
+    남는 기존 블록은 삭제, 모자라는 블록은 직전 블록 뒤에 삽입합니다.
+    
+    Returns:
+        tuple: (변경한 블록 수, 섹션의 마지막 블록 ID)
+    """
+    changed = 0
+    prev_id = after_id
+    i = 0
+    
+    while i < min(len(old_blocks), len(new_blocks)):
+        old_block, new_block = old_blocks[i], new_blocks[i]
+        block_type = new_block["type"]
+        if old_block.get("type") != block_type:
+            break
         
-        # 예제 출력
-        children.append({
-            "object": "block",
-            "type": "heading_3",
-            "heading_3": {"rich_text": [{"type": "text", "text": {"content": f"예제 출력 {i}"}}]}
-        })
-        children.append({
-            "object": "block",
-            "type": "code",
-            "code": {
-                "rich_text": [{"type": "text", "text": {"content": example.get("output", "")}}],
-                "language": "plain text"
-            }
-        })
-    
-    # 8. 풀이 섹션 (빈 공간)
-    children.append({"object": "block", "type": "divider", "divider": {}})
-    children.append({
-        "object": "block",
-        "type": "heading_2",
-        "heading_2": {
-            "rich_text": [{
-                "type": "text", 
-                "text": {"content": "✏️ 풀이"},
-                "annotations": {"color": "blue"}
-            }]
-        }
-    })
-    children.append({
-        "object": "block",
-        "type": "paragraph",
-        "paragraph": {"rich_text": [{"type": "text", "text": {"content": "여기에 풀이를 작성하세요..."}}]}
-    })
+        if block_type == "table":
+            updated = sync_table(client, old_block, new_block)
+            if updated is None:
+                break
+            changed += updated
+        elif block_signature(old_block) != block_signature(new_block):
+            notion_call(client.blocks.update, block_id=old_block["id"], **{block_type: new_block[block_type]})
+            changed += 1
+        
+        prev_id = old_block["id"]
+        i += 1
+    
+    for old_block in old_blocks[i:]:
+        notion_call(client.blocks.delete, block_id=old_block["id"])
+        changed += 1
+    
+    remaining = new_blocks[i:]
+    if remaining and prev_id is None:
+        raise ValueError("기존 페이지에서 섹션 위치를 찾을 수 없습니다.")
+    
+    # 응답을 받지 못하면 다시 보내지 않고 실패로 끝냄 (섹션 해시를 저장하지 않으므로 다음 갱신에서 맞춰짐)
+    for batch in chunk_blocks(remaining):
+        response = notion_call(client.blocks.children.append, block_id=page_id, children=batch, after=prev_id)
+        results = response.get("results", [])
+        if results:
+            prev_id = results[-1]["id"]
+        changed += len(batch)
+    
+    return changed, prev_id
+
+
+@timed("notion.refresh")
+def refresh_problem_page(client, problem_id, page_id, problem_data):
+    """
+    기존 페이지에서 내용이 바뀐 섹션만 수정
+    
+    섹션별 내용 해시를 저장해 두고 비교하므로, 바뀐 섹션이 없으면 API를 호출하지 않습니다.
+    풀이 섹션부터 페이지 끝까지는 직접 작성한 내용이 있으므로 건드리지 않고,
+    섹션 제목이 템플릿과 달라 섹션을 나눌 수 없는 페이지는 아무것도 바꾸지 않습니다.
+    
+    Returns:
+        int: 변경한 블록 수 (제목/아이콘 변경 포함)
+    """
+    index = get_duplicate_index()
+    sections = build_problem_sections(problem_data)
+    new_hashes = compute_section_hashes(problem_data, sections)
+    old_hashes = index.get_section_hashes(problem_id) or {}
+    changed_keys = {
+        key for key, value in new_hashes.items()
+        if key != "solution" and old_hashes.get(key) != value
+    }
+    if not changed_keys:
+        return 0
+    
+    # 본문을 고치기 전에 섹션을 나눌 수 있는지부터 확인 (직접 쓴 블록을 지우지 않도록)
+    old_sections = None
+    if changed_keys - {"page"}:
+        old_sections = split_page_sections(list_children(client, page_id))
+        if old_sections is None:
+            print(f"⚠️ {problem_id}번 페이지의 섹션 제목이 템플릿과 달라 갱신하지 않습니다.")
+            return 0
+    
+    changed = 0
+    
+    # 제목(티어)과 아이콘 (데이터베이스면 문제 정보 속성도)
+    if "page" in changed_keys:
+        notion_call(
+            client.pages.update,
+            page_id=page_id,
+            icon={"type": "emoji", "emoji": get_tier_icon(problem_data["tier"])},
+            properties=build_page_properties(problem_data)
+        )
+        changed += 1
+    
+    # 본문 섹션
+    if old_sections is not None:
+        prev_id = None
+        for key, new_blocks in sections:
+            if key == "solution":
+                break
+            old_blocks = old_sections.get(key, [])
+            if key in changed_keys:
+                section_changed, prev_id = sync_section(client, page_id, old_blocks, new_blocks, prev_id)
+                changed += section_changed
+            elif old_blocks:
+                prev_id = old_blocks[-1]["id"]
+    
+    index.save_section_hashes(problem_id, new_hashes)
+    return changed
+
+
+@timed("notion.write")
+def create_problem_page(problem_data, skip_duplicate=True, refresh=False):
+    """
+    백준 문제를 Notion 페이지로 생성
     
-    # 페이지 생성 (부모 페이지 아래에 하위 페이지로)
-    new_page = client.pages.create(
-        parent={"page_id": NOTION_PARENT_PAGE_ID},
+    블록이 많으면 첫 묶음으로 페이지를 만들고 나머지는 blocks.children.append로 이어 붙입니다.
+    이전 실행에서 작성하다 실패한 페이지가 있으면 남은 블록부터 이어서 작성합니다.
+    
+    Args:
+        problem_data: scraper.py에서 반환한 문제 딕셔너리
+        skip_duplicate: True면 중복 시 스킵, False면 그래도 생성
+        refresh: True면 이미 있는 페이지에서 바뀐 섹션만 갱신
+    
+    Returns:
+        str: 생성된 페이지 URL (또는 "(이미 존재) URL", "(갱신됨) URL")
+    """
+    client = get_notion_client()
+    problem_id = problem_data["problem_id"]
+    
+    # 작성 도중 실패한 페이지가 있으면 이어서 작성
+    partial = get_duplicate_index(client).get_partial(problem_id)
+    
+    # 중복 체크
+    if skip_duplicate and not partial:
+        existing_url = check_duplicate(client, problem_id)
+        if existing_url and refresh:
+            page_id = get_duplicate_index().lookup(problem_id)
+            try:
+                if refresh_problem_page(client, problem_id, page_id, problem_data):
+                    return f"(갱신됨) {existing_url}"
+            except APIResponseError:
+                # 갱신이 실패했을 때만 페이지가 휴지통에 있는지 확인하고, 있으면 새로 만듦
+                if is_page_alive(client, page_id):
+                    raise
+                print(f"⚠️ {problem_id}번 페이지가 휴지통에 있어 새로 만듭니다.")
+                get_duplicate_index().remove(problem_id, page_id)
+                existing_url = None
+        if existing_url:
+            return f"(이미 존재) {existing_url}"
+    
+    page_title = build_page_title(problem_data)
+    
+    # 티어별 아이콘
+    tier_icon = get_tier_icon(problem_data["tier"])
+    
+    sections = build_problem_sections(problem_data)
+    children = [block for _, blocks in sections for block in blocks]
+    index = get_duplicate_index()
+    
+    if partial:
+        page_id, written = partial
+        # 묶음을 붙인 뒤 기록하기 전에 멈췄을 수 있으므로 실제 블록 수부터 이어서 작성
+        actual = len(list_children(client, page_id))
+        if actual != written:
+            print(f"   ⚠️ 기록된 블록 수({written})와 페이지의 블록 수({actual})가 달라 실제 블록 수부터 이어서 작성합니다")
+            written = min(actual, len(children))
+        print(f"   ↻ 작성 중이던 페이지 이어서 작성 ({written}/{len(children)} 블록)")
+        append_blocks(client, problem_id, page_id, children, written)
+        index.save_section_hashes(problem_id, compute_section_hashes(problem_data, sections))
+        return page_url(page_id)
+    
+    # 페이지 생성 (부모 페이지 아래 하위 페이지 또는 데이터베이스 항목으로, 첫 묶음만 포함)
+    if NOTION_DATABASE_ID:
+        parent = get_notion_database(client).parent()
+    else:
+        parent = {"page_id": NOTION_PARENT_PAGE_ID}
+    first_batch = next(chunk_blocks(children))
+    new_page = create_page(
+        client,
+        problem_id,
+        parent=parent,
         icon={"type": "emoji", "emoji": tier_icon},
-        properties={
-            "title": {
-                "title": [{"type": "text", "text": {"content": page_title}}]
-            }
-        },
-        children=children
+        properties=build_page_properties(problem_data),
+        children=first_batch
     )
     
+    # 중복 인덱스 갱신 (다음 중복 체크부터 바로 반영)
+    try:
+        index.add(problem_id, new_page["id"], page_title)
+    except Exception as e:
+        print(f"⚠️ 중복 인덱스 갱신 실패: {e}")
+    
+    # 나머지 블록 이어 붙이기
+    if len(first_batch) < len(children):
+        index.mark_partial(problem_id, new_page["id"], len(first_batch), len(children))
+        append_blocks(client, problem_id, new_page["id"], children, len(first_batch))
+    
+    # 다음 갱신(--refresh) 때 비교할 섹션별 내용 해시 저장
+    index.save_section_hashes(problem_id, compute_section_hashes(problem_data, sections))
+    
     return new_page.get("url", "URL 없음")
 
 
-def split_text(text, max_length):
+def utf16_length(text):
+    """Notion이 길이를 재는 방식(UTF-16 코드 단위)으로 센 문자열 길이"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def pack_text(text, max_length=MAX_TEXT_LENGTH, max_items=MAX_RICH_TEXT_ITEMS, max_bytes=MAX_BLOCK_TEXT_BYTES):
     """
-    텍스트를 최대 길이로 분할
-    Notion API는 한 블록에 2000자 제한이 있음
+    텍스트를 블록별 rich_text 조각으로 분할
+    
+    텍스트를 앞에서부터 한 번만 훑으면서 조각(최대 max_length UTF-16 단위)을 잘라
+    블록 하나에 최대 max_items개, UTF-8 약 max_bytes까지 담습니다.
+    블록 안의 조각은 이어서 보이므로 아무 데서나 자르고,
+    블록 경계는 마지막 줄바꿈으로 옮겨 문단이 줄 중간에서 나뉘지 않게 합니다 (경계의 줄바꿈은 생략).
+    
+    Yields:
+        list: 블록 하나에 들어갈 조각 문자열 리스트
     """
-    if not text:
-        return [""]
+    ascii_only = text.isascii()
+    # BMP 밖 문자(이모지 등)는 UTF-16으로 2단위이므로 있을 때만 실제 길이를 잼
+    astral = not ascii_only and utf16_length(text) != len(text)
+    if len(text) <= max_length and not astral:
+        yield [text]
+        return
     
-    chunks = []
-    while text:
-        if len(text) <= max_length:
-            chunks.append(text)
-            break
+    # 블록 크기는 문자당 UTF-8 최대 바이트 수로 어림 (조각마다 인코딩하지 않도록)
+    char_bytes = 1 if ascii_only else 4 if astral else 3
+    n = len(text)
+    pos = 0
+    
+    while pos < n:
+        block_start = pos
+        block_end = min(n, pos + max(max_bytes // char_bytes, 1))
+        spans = []
+        while pos < block_end and len(spans) < max_items:
+            end = min(block_end, pos + max_length)
+            if astral:
+                while (over := utf16_length(text[pos:end]) - max_length) > 0:
+                    end -= (over + 1) // 2
+            spans.append((pos, end))
+            pos = end
         
-        # 줄바꿈 기준으로 자르기
-        split_point = text.rfind('\n', 0, max_length)
-        if split_point == -1:
-            split_point = max_length
+        # 블록이 가득 찼으면 블록 경계를 마지막 줄바꿈으로
+        if pos < n:
+            newline = text.rfind("\n", block_start, pos)
+            if newline > block_start:
+                spans = [(start, min(end, newline)) for start, end in spans if start < newline]
+                pos = newline + 1
         
-        chunks.append(text[:split_point])
-        text = text[split_point:].lstrip('\n')
-    
-    return chunks
+        yield [text[start:end] for start, end in spans]
 
 
 # 테스트용 코드
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+문제 페이지 템플릿
+
+Notion 페이지 본문의 섹션 순서, 제목, 색상, 문제 정보 테이블 항목 등을 선언합니다.
+notion_api.py가 프로세스 시작 시 한 번 컴파일해서 고정된 블록(구분선, 제목, 테이블 머리글,
+풀이 안내 문구 등)은 미리 만들어 두고, 페이지마다 문제별 내용만 채웁니다.
+
+레이아웃을 바꿀 때는 이 파일만 수정하면 됩니다.
+단, 이미 만든 페이지를 --refresh로 갱신할 때 섹션 제목으로 섹션 경계를 찾으므로
+제목을 바꾸면 기존 페이지는 섹션을 찾지 못해 갱신하지 않고 그대로 둡니다.
+
+섹션:
+    key       섹션 키 (페이지 갱신 시 섹션별 내용 해시의 키)
+    divider   True면 섹션 앞에 구분선
+    heading   섹션 제목 (heading_2), heading_color로 색상 지정
+    blocks    섹션 내용 (아래 블록 종류)
+
+블록 종류:
+    tag_callout    알고리즘 태그 (#태그 | #태그), 태그가 없으면 생략
+    link_callout   label 다음 줄에 문제 링크
+    info_table     columns: [(머리글, 문제 필드)] 두 줄짜리 테이블
+    text           문제 필드 텍스트를 문단으로 (블록 하나에 rich_text 조각을 최대한 담아 분할)
+    images         문제 필드의 이미지 URL을 이미지 블록으로
+    examples       예제 입력/출력 (input_label, output_label의 {}에 예제 번호)
+    paragraph      고정 문구
+"""
+
+
+PAGE_TEMPLATE = [
+    {
+        "key": "header",
+        "blocks": [
+            {"type": "tag_callout", "icon": "🏷️", "color": "purple_background"},
+            {"type": "link_callout", "icon": "🔗", "color": "gray_background", "label": "www.acmicpc.net\n"},
+        ],
+    },
+    {
+        "key": "info",
+        "divider": True,
+        "blocks": [
+            {
+                "type": "info_table",
+                "columns": [
+                    ("시간 제한", "time_limit"),
+                    ("메모리 제한", "memory_limit"),
+                    ("제출", "submissions"),
+                    ("정답", "accepted"),
+                    ("맞힌 사람", "users"),
+                    ("정답 비율", "accuracy"),
+                ],
+            },
+        ],
+    },
+    {
+        "key": "description",
+        "divider": True,
+        "heading": "📋 문제",
+        "heading_color": "blue",
+        "blocks": [
+            {"type": "text", "field": "description"},
+            {"type": "images", "field": "description_images"},
+        ],
+    },
+    {
+        "key": "input",
+        "divider": True,
+        "heading": "📥 입력",
+        "heading_color": "blue",
+        "blocks": [
+            {"type": "text", "field": "input"},
+            {"type": "images", "field": "input_images"},
+        ],
+    },
+    {
+        "key": "output",
+        "divider": True,
+        "heading": "📤 출력",
+        "heading_color": "blue",
+        "blocks": [
+            {"type": "text", "field": "output"},
+            {"type": "images", "field": "output_images"},
+        ],
+    },
+    {
+        "key": "examples",
+        "divider": True,
+        "heading": "💻 예제",
+        "heading_color": "blue",
+        "blocks": [
+            {
+                "type": "examples",
+                "input_label": "예제 입력 {}",
+                "output_label": "예제 출력 {}",
+                "language": "plain text",
+            },
+        ],
+    },
+    {
+        # 직접 작성하는 섹션이므로 --refresh에서 건드리지 않음
+        "key": "solution",
+        "divider": True,
+        "heading": "✏️ 풀이",
+        "heading_color": "blue",
+        "blocks": [
+            {"type": "paragraph", "text": "여기에 풀이를 작성하세요..."},
+        ],
+    },
+]
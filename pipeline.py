@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 처리 파이프라인 모듈
+
+문제 하나를 처리하는 과정을 네 단계로 나누고 단계 사이를 크기 제한 큐로 연결합니다.
+
+    페이지 가져오기(fetch) → 파싱(parse) → solved.ac 조회(meta) → 작성(write)
+
+작성 단계는 출력 대상(sinks.py)에 문제를 하나씩 기록합니다 (기본: Notion 페이지).
+
+캐시가 만료된 문제는 조건부 요청으로 페이지를 다시 확인하고, 304 Not Modified면 파싱을 건너뜁니다.
+solved.ac 정보까지 그대로라 내용이 캐시와 같으면 refresh여도 기존 페이지를 다시 쓰지 않습니다.
+통계 필드만 만료되고 정적 필드는 유효하면 페이지에서 통계 필드만 추출하고 정적 필드는 캐시에서 가져옵니다.
+
+단계마다 동시 실행 수를 따로 정할 수 있어서,
+한 문제가 Notion 응답을 기다리는 동안 다른 문제의 페이지를 가져올 수 있습니다.
+문제 하나만 처리하는 경우도 같은 파이프라인을 그대로 사용합니다.
+
+파싱(BeautifulSoup, 정규식)은 GIL을 잡는 CPU 작업이므로 문제가 많으면 configure_parse_processes()로
+parse 단계를 프로세스 풀에서 실행할 수 있습니다. 풀은 처음 사용할 때 만들어 프로세스가 끝날 때까지
+재사용합니다 (데몬에서는 작업 사이에도 유지).
+"""
+
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from scraper import (
+    get_problem_id, parse_problem_html, page_data_with_stats, get_solved_ac_info,
+    build_problem_data, cache_problem, load_revalidation, cached_page_data, init_parse_worker,
+)
+from fetcher import fetch_problem_page
+from cache import load_cached_problem, load_cached_static, store_validators, forget_validators
+from sinks import NotionSink
+from image_cache import prefetch_images, problem_image_urls, with_verified_images
+from config import IMAGE_WAIT_TIMEOUT, DEFAULT_CONCURRENCY
+from profiler import span, start_thread
+
+
+STAGES = ("fetch", "parse", "meta", "write")
+
+# 단계 사이 큐 크기 (앞 단계가 너무 앞서 나가지 않도록)
+QUEUE_SIZE = 16
+
+
+# parse 단계 프로세스 수 (0이면 parse 단계 스레드에서 파싱)
+_parse_processes = 0
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def configure_parse_processes(processes=0):
+    """
+    parse 단계를 프로세스 풀에서 실행하도록 설정
+
+    Args:
+        processes: 프로세스 수 (0이면 스레드에서 파싱, "auto"면 CPU 코어 수)
+    """
+    global _parse_processes, _parse_pool
+    if processes == "auto":
+        processes = os.cpu_count() or 1
+    try:
+        processes = int(processes)
+    except (TypeError, ValueError):
+        raise ValueError(f"파싱 프로세스 수가 올바르지 않습니다: {processes}") from None
+    if processes < 0:
+        raise ValueError(f"파싱 프로세스 수는 0 이상이어야 합니다: {processes}")
+
+    with _parse_pool_lock:
+        if _parse_pool is not None and processes != _parse_processes:
+            _parse_pool.shutdown(wait=True)
+            _parse_pool = None
+        _parse_processes = processes
+
+
+def get_parse_pool():
+    """파싱 프로세스 풀 반환 (프로세스를 쓰지 않으면 None)"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if not _parse_processes:
+            return None
+        if _parse_pool is None:
+            # 파이프라인 스레드가 도는 중에 fork하면 잠긴 락이 복사될 수 있으므로 spawn
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=_parse_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_parse_worker,
+            )
+        return _parse_pool
+
+
+def new_result(url):
+    """문제 하나의 처리 결과 기본값"""
+    return {"url": url, "status": "failed", "title": "", "page_url": "", "error": "", "elapsed": 0.0}
+
+
+async def run_pipeline(urls, concurrency=None, queue_size=QUEUE_SIZE, on_event=None, refresh=False, sink=None):
+    """
+    URL 스트림을 파이프라인으로 처리
+
+    Args:
+        urls: 백준 문제 URL iterable (지연 생성 가능)
+        concurrency: 단계별 동시 실행 수 {"fetch": 4, ...} (일부만 지정 가능)
+                     파싱 프로세스를 쓰면 parse는 프로세스 수가 기본값이고, 지정하면 둘 중 작은 값
+        queue_size: 단계 사이 큐 크기
+        on_event: 진행 상황 콜백 on_event(event, item)
+                  event는 "start" / "scraped" / "write" / "done"
+        refresh: True면 이미 있는 페이지에서 바뀐 섹션만 갱신
+        sink: 출력 대상 (기본: NotionSink)
+
+    Returns:
+        list: 문제별 처리 결과 리스트 (완료 순서)
+    """
+    requested = concurrency or {}
+    concurrency = {**DEFAULT_CONCURRENCY, **requested}
+    sink = sink or NotionSink()
+    loop = asyncio.get_running_loop()
+
+    # 파싱 프로세스를 쓰면 프로세스마다 파싱 하나씩 맡도록 parse 단계 동시 실행 수를 맞춤
+    # (parse 동시 실행 수를 지정했으면 그보다 많이 띄우지 않음)
+    parse_pool = get_parse_pool()
+    if parse_pool is not None:
+        concurrency["parse"] = min(requested.get("parse") or _parse_processes, _parse_processes)
+
+    executors = {
+        stage: ThreadPoolExecutor(
+            max_workers=concurrency[stage], thread_name_prefix=f"pipeline-{stage}", initializer=start_thread
+        )
+        for stage in STAGES
+    }
+    # 입력 스트림(stdin, 묶음 조회 등)은 블로킹일 수 있으므로 별도 스레드에서 읽기
+    source_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-source")
+    queues = {stage: asyncio.Queue(maxsize=queue_size) for stage in STAGES}
+    results = []
+
+    def emit(event, item):
+        if on_event:
+            on_event(event, item)
+
+    def run(stage, func, *args):
+        return loop.run_in_executor(executors[stage], func, *args)
+
+    def finish(item):
+        item["result"]["elapsed"] = time.perf_counter() - item["started"]
+        results.append(item["result"])
+        emit("done", item)
+
+    # --- 단계별 처리 함수: 다음 단계 이름을 반환 (None이면 완료) ---
+
+    async def fetch(item):
+        problem_id = get_problem_id(item["url"])
+        if not problem_id:
+            raise ValueError(f"올바른 백준 URL이 아닙니다: {item['url']}")
+
+        # 로컬 캐시에 있으면 바로 작성 단계로
+        # (SQLite 조회도 fetch 스레드에서: 다른 단계의 캐시 쓰기가 잠금을 잡고 있으면 이벤트 루프가 멈추므로)
+        cached = await run("fetch", load_cached_problem, problem_id)
+        if cached:
+            item["problem_data"] = cached
+            item["image_futures"] = prefetch_images(problem_image_urls(cached))
+            emit("scraped", item)
+            return "write"
+
+        # 만료된 캐시가 있으면 조건부 요청 (304면 캐시된 페이지 정보로 바로 solved.ac 조회 단계로)
+        stale, validators = await run("fetch", load_revalidation, problem_id, item["url"])
+        html, item["validators"] = await run("fetch", fetch_problem_page, item["url"], validators)
+        if html is None:
+            item["stale"] = stale
+            item["page_data"] = cached_page_data(stale)
+            item["image_futures"] = prefetch_images(problem_image_urls(stale))
+            return "meta"
+
+        item["html"] = html
+        # 통계 필드만 만료됐으면 정적 필드는 캐시에서 (파싱은 통계 필드만)
+        item["static"] = await run("fetch", load_cached_static, problem_id)
+        return "parse"
+
+    async def parse(item):
+        static = item.pop("static", None)
+        if static is not None:
+            page_data = await run("parse", page_data_with_stats, static, item.pop("html"))
+            item["keep_static"] = True
+        elif parse_pool is not None:
+            page_data = await loop.run_in_executor(parse_pool, parse_problem_html, item.pop("html"), item["url"])
+        else:
+            page_data = await run("parse", parse_problem_html, item.pop("html"), item["url"])
+        # 이미지 확인은 백그라운드에서 시작 (solved.ac 조회와 겹쳐서 진행)
+        item["image_futures"] = prefetch_images(problem_image_urls(page_data))
+        item["page_data"] = page_data
+        return "meta"
+
+    async def meta(item):
+        page_data = item.pop("page_data")
+        solved_info = await run("meta", get_solved_ac_info, page_data["problem_id"])
+        problem_data = build_problem_data(page_data, solved_info)
+        changed = await run("meta", cache_problem, problem_data, item.get("keep_static", False))
+        item["cached"] = changed is not None
+        stale = item.pop("stale", None)
+        item["unchanged"] = stale is not None and item["cached"] and not any(changed.values())
+        if stale is not None and not item["unchanged"]:
+            # 페이지는 그대로지만 solved.ac 정보가 바뀜: 작성이 끝나기 전에 멈추면
+            # 다음 실행에서 304로 갱신을 건너뛰지 않도록 검증자를 먼저 지움 (작성 후 다시 저장)
+            await run("meta", forget_validators, item["url"])
+        item["problem_data"] = problem_data
+        emit("scraped", item)
+        return "write"
+
+    async def write(item):
+        problem_data = item["problem_data"]
+        result = item["result"]
+
+        # 이미지 확인 결과 반영 (끝나지 않은 이미지는 최대 IMAGE_WAIT_TIMEOUT초까지만 기다림)
+        image_futures = item.pop("image_futures", None)
+        if image_futures:
+            await asyncio.wait(
+                [asyncio.wrap_future(future) for future in image_futures.values()],
+                timeout=IMAGE_WAIT_TIMEOUT
+            )
+            problem_data = with_verified_images(problem_data, image_futures)
+
+        result["title"] = f"{problem_data['problem_id']}: {problem_data['title']}"
+
+        emit("write", item)
+        # 캐시와 내용이 같으면 refresh여도 갱신하지 않고 페이지가 있는지만 확인
+        result["status"], result["page_url"] = await run(
+            "write", sink.write, problem_data, refresh and not item.get("unchanged")
+        )
+
+        # 페이지 검증자는 작성까지 끝난 뒤에 저장
+        # (작성에 실패하면 다음 실행에서 304가 아닌 새 내용을 받아 다시 갱신)
+        if item.get("cached") and item.get("validators"):
+            await run("write", store_validators, item["url"], item["validators"])
+        return None
+
+    handlers = {"fetch": fetch, "parse": parse, "meta": meta, "write": write}
+
+    async def worker(stage):
+        queue = queues[stage]
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            try:
+                with span(f"stage.{stage}"):
+                    next_stage = await handlers[stage](item)
+            except Exception as e:
+                item["result"]["error"] = str(e)
+                finish(item)
+                continue
+            if next_stage is None:
+                finish(item)
+            else:
+                await queues[next_stage].put(item)
+
+    async def source():
+        iterator = iter(urls)
+        index = 0
+        while True:
+            url = await loop.run_in_executor(source_executor, next, iterator, None)
+            if url is None:
+                return
+            index += 1
+            item = {"index": index, "url": url, "started": time.perf_counter(), "result": new_result(url)}
+            emit("start", item)
+            await queues["fetch"].put(item)
+
+    try:
+        workers = {
+            stage: [asyncio.create_task(worker(stage)) for _ in range(concurrency[stage])]
+            for stage in STAGES
+        }
+
+        try:
+            await source()
+        finally:
+            # 항목은 앞 단계에서 뒤 단계로만 이동하므로, 앞 단계부터 차례로 종료
+            for stage in STAGES:
+                for _ in workers[stage]:
+                    await queues[stage].put(None)
+                await asyncio.gather(*workers[stage])
+    finally:
+        source_executor.shutdown(wait=False)
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+
+    return results
+
+
+def process_problems(urls, concurrency=None, queue_size=QUEUE_SIZE, on_event=None, refresh=False, sink=None):
+    """run_pipeline의 동기 버전"""
+    return asyncio.run(run_pipeline(
+        urls, concurrency=concurrency, queue_size=queue_size, on_event=on_event, refresh=refresh, sink=sink
+    ))
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+구간별 실행 시간 측정 모듈
+
+span("이름") / @timed("이름")으로 감싼 구간의 실행 시간과
+count("이름", n)으로 올린 카운터(HTTP 요청 수, 재시도 수, 바이트 수 등)를 모아
+--profile 실행이 끝나면 구간별 p50/p95를 출력합니다.
+
+측정을 켜지 않으면 span()은 미리 만들어 둔 빈 컨텍스트를, count()는 바로 반환하므로
+평소 실행에는 사실상 비용이 없습니다.
+"""
+
+import json
+import time
+import threading
+import functools
+from contextlib import nullcontext
+
+
+_enabled = False
+_lock = threading.Lock()
+_samples = {}      # 구간 이름 → [소요 시간(초), ...]
+_counters = {}     # 카운터 이름 → 값
+
+_NULL_SPAN = nullcontext()
+
+# cProfile은 스레드마다 따로 붙여야 하므로 스레드별 Profile을 모아 두었다가 합침
+_cprofile_enabled = False
+_profiles = []
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        with _lock:
+            _samples.setdefault(self.name, []).append(elapsed)
+        return False
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(cprofile=False):
+    """
+    측정 시작
+
+    Args:
+        cprofile: True면 호출한 스레드와 이후 start_thread()를 부르는 작업 스레드에 cProfile 연결
+    """
+    global _enabled, _cprofile_enabled
+    _enabled = True
+    if cprofile:
+        _cprofile_enabled = True
+        start_thread()
+
+
+def start_thread():
+    """
+    작업 스레드 시작 시 호출 (ThreadPoolExecutor initializer)
+
+    cProfile을 켠 경우에만 현재 스레드용 Profile을 만들어 붙입니다.
+    """
+    if not _cprofile_enabled:
+        return
+    import cProfile
+    profile = cProfile.Profile()
+    with _lock:
+        _profiles.append(profile)
+    profile.enable()
+
+
+def span(name):
+    """
+    구간 실행 시간 측정 컨텍스트
+
+    Example:
+        with span("notion.pages.create"):
+            ...
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name):
+    """함수 전체를 span(name)으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    """카운터 증가 (측정 중일 때만)"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def percentile(sorted_values, p):
+    """정렬된 값의 p 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def get_report():
+    """
+    측정 결과 요약
+
+    Returns:
+        dict: {"spans": {이름: {count, total_s, p50_ms, p95_ms, max_ms}}, "counters": {이름: 값}}
+    """
+    with _lock:
+        samples = {name: sorted(values) for name, values in _samples.items()}
+        counters = dict(_counters)
+
+    spans = {}
+    for name, values in sorted(samples.items(), key=lambda item: -sum(item[1])):
+        spans[name] = {
+            "count": len(values),
+            "total_s": round(sum(values), 4),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+    return {"spans": spans, "counters": dict(sorted(counters.items()))}
+
+
+def print_report(report=None):
+    """구간별 소요 시간 표 출력 (합계가 큰 순서)"""
+    report = report or get_report()
+
+    print("\n" + "=" * 82)
+    print("⏱️  구간별 소요 시간")
+    print("=" * 82)
+    # 한글은 두 칸을 차지하므로 머리글 폭을 그만큼 줄임
+    print(f"{'구간':<34}{'횟수':>6}{'합계(s)':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'최대(ms)':>8}")
+    for name, stats in report["spans"].items():
+        print(
+            f"{name:<36}{stats['count']:>6}{stats['total_s']:>10.2f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+        )
+
+    if report["counters"]:
+        print("-" * 82)
+        for name, value in report["counters"].items():
+            print(f"{name:<36}{value:>12,}")
+    print("=" * 82)
+
+
+def save_json(path, report=None):
+    """측정 결과를 JSON 파일로 저장"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report or get_report(), f, ensure_ascii=False, indent=2)
+
+
+def save_cprofile(path):
+    """스레드별 cProfile 결과를 합쳐 pstats 파일로 저장 (snakeviz, pstats로 열람)"""
+    import pstats
+
+    with _lock:
+        profiles = list(_profiles)
+    for profile in profiles:
+        profile.disable()
+
+    stats = None
+    for profile in profiles:
+        profile.create_stats()
+        if not profile.stats:
+            continue
+        if stats is None:
+            stats = pstats.Stats(profile)
+        else:
+            stats.add(profile)
+    if stats is not None:
+        stats.dump_stats(path)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Notion API 호출 속도 제한 모듈
+
+Notion API는 통합(integration)당 평균 초당 약 3회로 요청을 제한합니다.
+모든 Notion 호출을 하나의 토큰 버킷으로 통과시켜 제한 바로 아래 속도를 유지하고,
+429(Retry-After), 5xx, 타임아웃은 지수 백오프(지터 포함)로 재시도합니다.
+
+페이지 생성과 블록 추가는 다시 보내면 페이지나 블록이 두 번 생길 수 있으므로,
+서버가 처리하지 않은 것이 확실한 오류(429, 요청을 보내기 전의 연결 실패)만 재시도합니다.
+서버가 처리했는지 알 수 없는 오류(is_uncertain)는 호출한 쪽에서 결과를 확인한 뒤 다시 보냅니다.
+"""
+
+import re
+import time
+import random
+import threading
+
+from config import NOTION_RATE_LIMIT, NOTION_MAX_RETRIES
+from profiler import span, count, is_enabled
+
+
+# 재시도 대기 시간 (초)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+# 다시 보내면 결과가 달라지는 엔드포인트
+NON_IDEMPOTENT_ENDPOINTS = frozenset({"pages.create", "blocks.children.append"})
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷
+
+    - 초당 rate개씩 토큰이 채워지고, 최대 capacity개까지 모입니다.
+    - pause()로 모든 호출자를 일정 시간 멈출 수 있습니다 (429 Retry-After 공유).
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("초당 요청 수는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._updated:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    # pause() 중
+                    wait = self._updated - now
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """지금부터 seconds초 동안 모든 호출자를 멈춤"""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._updated:
+                self._updated = resume_at
+                self._tokens = 0
+
+
+def get_retry_after(error):
+    """오류 응답의 Retry-After 헤더 값(초) 반환 (없으면 None)"""
+    headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def was_not_sent(error):
+    """
+    요청이 서버에 닿기 전에 실패했는지 (연결 실패, 연결/연결 풀 대기 시간 초과)
+
+    notion-client는 httpx의 시간 초과를 RequestTimeoutError로 바꿔 던지므로 원래 예외(__context__)도 봅니다.
+    """
+    import httpx
+
+    not_sent = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+    return isinstance(error, not_sent) or isinstance(error.__context__, not_sent)
+
+
+def is_uncertain(error):
+    """서버가 요청을 처리했는지 알 수 없는 오류인지 (5xx, 응답 대기 시간 초과, 응답 도중 연결 끊김)"""
+    import httpx
+    from notion_client.errors import RequestTimeoutError
+
+    if was_not_sent(error):
+        return False
+    if isinstance(error, (RequestTimeoutError, httpx.TimeoutException, httpx.TransportError)):
+        return True
+    status = getattr(error, "status", None)
+    return isinstance(status, int) and status >= 500
+
+
+def is_retryable(error, idempotent=True):
+    """
+    재시도할 만한 오류인지 판별
+
+    429와 요청을 보내기 전의 연결 오류는 항상, 5xx와 타임아웃은 idempotent한 요청만 재시도합니다.
+    """
+    if getattr(error, "status", None) == 429 or was_not_sent(error):
+        return True
+    return idempotent and is_uncertain(error)
+
+
+def backoff_delay(attempt):
+    """지수 백오프 + full jitter 대기 시간"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def endpoint_name(func):
+    """
+    SDK 메서드의 엔드포인트 이름 (측정용)
+
+    client.blocks.children.append → "blocks.children.append"
+    """
+    owner = getattr(func, "__self__", None)
+    if owner is None:
+        return func.__name__
+    prefix = re.sub(r"(?<!^)(?=[A-Z])", ".", type(owner).__name__.replace("Endpoint", ""))
+    return f"{prefix.lower()}.{func.__name__}"
+
+
+def call_with_retry(limiter, func, *args, max_retries=NOTION_MAX_RETRIES, **kwargs):
+    """
+    속도 제한을 지키며 func 호출, 일시적 오류는 재시도
+
+    Args:
+        limiter: TokenBucket
+        func: 호출할 함수 (예: client.pages.create)
+        max_retries: 최대 재시도 횟수
+    """
+    endpoint = endpoint_name(func)
+    idempotent = endpoint not in NON_IDEMPOTENT_ENDPOINTS
+    name = f"notion.api.{endpoint}" if is_enabled() else None
+
+    attempt = 0
+    while True:
+        with span("notion.throttle"):
+            limiter.acquire()
+        count("notion.calls")
+        try:
+            with span(name):
+                return func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e, idempotent):
+                raise
+            count("notion.retries")
+
+            retry_after = get_retry_after(e)
+            if getattr(e, "status", None) == 429:
+                # 제한에 걸리면 모든 워커가 함께 쉬도록 버킷 자체를 멈춤
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                limiter.pause(delay)
+                count("notion.rate_limited")
+            else:
+                delay = backoff_delay(attempt)
+                time.sleep(delay)
+
+            attempt += 1
+            print(f"⚠️ Notion API 재시도 {attempt}/{max_retries} ({delay:.1f}s 후): {e}")
+
+
+# 모든 Notion 호출이 공유하는 버킷
+notion_limiter = TokenBucket(NOTION_RATE_LIMIT)
+
+
+def notion_call(func, *args, **kwargs):
+    """공용 Notion 속도 제한기를 거쳐 API 호출"""
+    return call_with_retry(notion_limiter, func, *args, **kwargs)
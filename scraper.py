@@ -6,8 +6,35 @@
 """
 
 import re
-import requests
-from bs4 import BeautifulSoup
+import importlib.util
+from bs4 import BeautifulSoup, SoupStrainer
+
+from fetcher import fetch_problem_page
+from solved_ac import get_problem_info, empty_info
+from cache import (
+    load_cached_problem, load_cached_static, load_stale_problem, store_problem, load_validators, store_validators,
+)
+from profiler import timed
+from config import HTML_PARSER
+
+
+# 문제 페이지에서 실제로 사용하는 요소의 id
+PROBLEM_ELEMENT_IDS = frozenset({
+    "problem_title", "problem-info", "problem_description", "problem_input", "problem_output",
+})
+SAMPLE_ID_PREFIXES = ("sample-input-", "sample-output-")
+
+# 문제 딕셔너리에서 solved.ac에서 가져오는 필드 (나머지는 문제 페이지에서 추출)
+SOLVED_AC_FIELDS = ("tier", "tier_level", "tags")
+
+# 문제 정보 표의 열 순서
+INFO_TABLE_FIELDS = ("time_limit", "memory_limit", "submissions", "accepted", "users", "accuracy")
+
+# 문제 정보 표 (표 안에 다른 표가 없으므로 첫 </table>까지)
+INFO_TABLE_PATTERN = re.compile(r'<table[^>]*\bid="problem-info".*?</table>', re.S)
+
+# 문제 페이지의 통계 필드 (캐시의 통계 필드 중 solved.ac 정보를 뺀 나머지)
+PAGE_STATS_FIELDS = ("submissions", "accepted", "users", "accuracy")
 
 
 def get_problem_id(url):
@@ -63,138 +90,128 @@ def extract_images(element):
     return images
 
 
+def is_problem_element_id(value):
+    """파싱할 요소의 id인지 확인 (제목, 정보 표, 설명/입력/출력, 예제)"""
+    return value is not None and (value in PROBLEM_ELEMENT_IDS or value.startswith(SAMPLE_ID_PREFIXES))
+
+
+def get_parser_backend():
+    """
+    BeautifulSoup 파서 선택
+
+    기본값은 html.parser입니다. HTML_PARSER가 auto면 lxml이 설치되어 있을 때 lxml을 사용합니다.
+    """
+    if HTML_PARSER != "auto":
+        return HTML_PARSER
+    return "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+
+_PARSER_BACKEND = None
+
+
+def parse_problem_body(html):
+    """
+    문제 본문 요소만 골라서 파싱
+
+    메뉴, 푸터, 스크립트 등은 트리로 만들지 않아 파싱 시간이 크게 줄어듭니다.
+    """
+    global _PARSER_BACKEND
+    if _PARSER_BACKEND is None:
+        _PARSER_BACKEND = get_parser_backend()
+    return BeautifulSoup(html, _PARSER_BACKEND, parse_only=SoupStrainer(id=is_problem_element_id))
+
+
+def parse_info_table(info_elem):
+    """문제 정보 표(시간/메모리 제한, 제출, 정답, 맞힌 사람, 정답 비율)를 필드별 문자열로"""
+    row = info_elem.select_one("tbody tr") if info_elem else None
+    cells = row.find_all("td") if row else []
+    return {
+        field: cells[i].text.strip() if i < len(cells) else ""
+        for i, field in enumerate(INFO_TABLE_FIELDS)
+    }
+
+
+@timed("parse_stats")
+def parse_problem_stats(html):
+    """
+    문제 페이지에서 통계 필드(제출, 정답, 맞힌 사람, 정답 비율)만 추출
+
+    통계 필드만 만료된 문제에 사용합니다. 정보 표 부분만 잘라서 파싱하므로 전체 파싱보다 훨씬 빠릅니다.
+    """
+    global _PARSER_BACKEND
+    if _PARSER_BACKEND is None:
+        _PARSER_BACKEND = get_parser_backend()
+    match = INFO_TABLE_PATTERN.search(html)
+    soup = BeautifulSoup(match.group(0) if match else html, _PARSER_BACKEND,
+                         parse_only=SoupStrainer(id="problem-info"))
+    info = parse_info_table(soup.find(id="problem-info"))
+    return {field: info[field] for field in PAGE_STATS_FIELDS}
+
+
+def page_data_with_stats(static, html):
+    """캐시된 정적 필드에 새로 받은 페이지의 통계 필드를 합쳐 페이지 정보 생성"""
+    return {**static, **parse_problem_stats(html)}
+
+
+@timed("solved_ac")
 def get_solved_ac_info(problem_id):
     """
     solved.ac API에서 문제 정보 가져오기
     
+    배치 처리에서 미리 묶음 조회(prefetch_problems)한 경우 추가 요청 없이 반환합니다.
+    
     Returns:
         dict: {tier: str, tier_level: int, tags: list}
     """
-    result = {
-        "tier": "Unknown",
-        "tier_level": 0,
-        "tags": []
-    }
-    
     try:
-        response = requests.get(
-            f"https://solved.ac/api/v3/problem/show",
-            params={"problemId": problem_id},
-            headers={"Accept": "application/json"}
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            level = data.get("level", 0)
-            
-            tier_names = {
-                0: "Unrated",
-                1: "Bronze V", 2: "Bronze IV", 3: "Bronze III", 4: "Bronze II", 5: "Bronze I",
-                6: "Silver V", 7: "Silver IV", 8: "Silver III", 9: "Silver II", 10: "Silver I",
-                11: "Gold V", 12: "Gold IV", 13: "Gold III", 14: "Gold II", 15: "Gold I",
-                16: "Platinum V", 17: "Platinum IV", 18: "Platinum III", 19: "Platinum II", 20: "Platinum I",
-                21: "Diamond V", 22: "Diamond IV", 23: "Diamond III", 24: "Diamond II", 25: "Diamond I",
-                26: "Ruby V", 27: "Ruby IV", 28: "Ruby III", 29: "Ruby II", 30: "Ruby I"
-            }
-            
-            result["tier"] = tier_names.get(level, "Unknown")
-            result["tier_level"] = level
-            
-            # 알고리즘 태그 추출
-            tags = data.get("tags", [])
-            for tag in tags:
-                # 한국어 태그명 우선, 없으면 영어
-                display_names = tag.get("displayNames", [])
-                ko_name = None
-                en_name = None
-                for name in display_names:
-                    if name.get("language") == "ko":
-                        ko_name = name.get("name")
-                    elif name.get("language") == "en":
-                        en_name = name.get("name")
-                result["tags"].append(ko_name or en_name or tag.get("key", ""))
-                
+        return get_problem_info(problem_id)
     except Exception as e:
         print(f"⚠️ solved.ac 정보를 가져올 수 없습니다: {e}")
-    
-    return result
+        return empty_info()
 
 
-def scrape_problem(url):
+def init_parse_worker():
+    """파싱 프로세스 초기화 (Ctrl+C는 부모 프로세스가 처리하고 풀을 정리)"""
+    import signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+@timed("parse")
+def parse_problem_html(html, url):
     """
-    백준 문제 페이지 크롤링
+    백준 문제 페이지 HTML에서 문제 정보 추출 (solved.ac 정보 제외)
     
     Args:
-        url: 백준 문제 URL (예: https://www.acmicpc.net/problem/14716)
+        html: 문제 페이지 HTML
+        url: 백준 문제 URL
     
     Returns:
-        dict: 문제 정보 딕셔너리
+        dict: 페이지에서 얻을 수 있는 문제 정보 딕셔너리
     """
-    # 문제 번호 추출
-    problem_id = get_problem_id(url)
-    if not problem_id:
-        raise ValueError(f"올바른 백준 URL이 아닙니다: {url}")
-    
-    # Selenium으로 페이지 로드 (AWS WAF 우회)
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
-    
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # 브라우저 창 숨김
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    
-    try:
-        driver.get(url)
-        
-        # 페이지 로드 대기 (문제 제목이 나타날 때까지)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "problem_title"))
-        )
-        
-        # HTML 파싱
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-    finally:
-        driver.quit()
+    # 필요한 요소만 한 번에 모으기 (id → 요소, 같은 id가 여러 번 나오면 첫 번째)
+    elements = {}
+    for elem in parse_problem_body(html).find_all(id=is_problem_element_id):
+        elements.setdefault(elem["id"], elem)
     
     # 제목 추출
-    title_elem = soup.select_one("#problem_title")
+    title_elem = elements.get("problem_title")
     title = title_elem.text.strip() if title_elem else "제목 없음"
     
     # 문제 정보 테이블 추출
-    info_table = soup.select_one("#problem-info tbody tr")
-    if info_table:
-        cells = info_table.find_all("td")
-        time_limit = cells[0].text.strip() if len(cells) > 0 else ""
-        memory_limit = cells[1].text.strip() if len(cells) > 1 else ""
-        submissions = cells[2].text.strip() if len(cells) > 2 else ""
-        accepted = cells[3].text.strip() if len(cells) > 3 else ""
-        users = cells[4].text.strip() if len(cells) > 4 else ""
-        accuracy = cells[5].text.strip() if len(cells) > 5 else ""
-    else:
-        time_limit = memory_limit = submissions = accepted = users = accuracy = ""
+    info = parse_info_table(elements.get("problem-info"))
     
     # 문제 설명 추출
-    description_elem = soup.select_one("#problem_description")
+    description_elem = elements.get("problem_description")
     description = clean_text(description_elem.get_text(separator="\n")) if description_elem else ""
     description_images = extract_images(description_elem)
     
     # 입력 설명 추출
-    input_elem = soup.select_one("#problem_input")
+    input_elem = elements.get("problem_input")
     input_desc = clean_text(input_elem.get_text(separator="\n")) if input_elem else ""
     input_images = extract_images(input_elem)
     
     # 출력 설명 추출
-    output_elem = soup.select_one("#problem_output")
+    output_elem = elements.get("problem_output")
     output_desc = clean_text(output_elem.get_text(separator="\n")) if output_elem else ""
     output_images = extract_images(output_elem)
     
@@ -202,8 +219,8 @@ def scrape_problem(url):
     examples = []
     example_num = 1
     while True:
-        sample_input = soup.select_one(f"#sample-input-{example_num}")
-        sample_output = soup.select_one(f"#sample-output-{example_num}")
+        sample_input = elements.get(f"sample-input-{example_num}")
+        sample_output = elements.get(f"sample-output-{example_num}")
         
         if not sample_input:
             break
@@ -214,22 +231,16 @@ def scrape_problem(url):
         })
         example_num += 1
     
-    # solved.ac 정보 가져오기 (티어 + 알고리즘 태그)
-    solved_info = get_solved_ac_info(problem_id)
-    
     return {
-        "problem_id": problem_id,
+        "problem_id": get_problem_id(url),
         "title": title,
-        "tier": solved_info["tier"],
-        "tier_level": solved_info["tier_level"],
-        "tags": solved_info["tags"],
         "url": url,
-        "time_limit": time_limit,
-        "memory_limit": memory_limit,
-        "submissions": submissions,
-        "accepted": accepted,
-        "users": users,
-        "accuracy": accuracy,
+        "time_limit": info["time_limit"],
+        "memory_limit": info["memory_limit"],
+        "submissions": info["submissions"],
+        "accepted": info["accepted"],
+        "users": info["users"],
+        "accuracy": info["accuracy"],
         "description": description,
         "description_images": description_images,
         "input": input_desc,
@@ -240,6 +251,119 @@ def scrape_problem(url):
     }
 
 
+def build_problem_data(page_data, solved_info):
+    """
+    페이지 정보와 solved.ac 정보를 합쳐 최종 문제 딕셔너리 생성
+    
+    Args:
+        page_data: parse_problem_html 결과
+        solved_info: get_solved_ac_info 결과 {tier, tier_level, tags}
+    """
+    return {
+        "problem_id": page_data["problem_id"],
+        "title": page_data["title"],
+        "tier": solved_info["tier"],
+        "tier_level": solved_info["tier_level"],
+        "tags": solved_info["tags"],
+        "url": page_data["url"],
+        "time_limit": page_data["time_limit"],
+        "memory_limit": page_data["memory_limit"],
+        "submissions": page_data["submissions"],
+        "accepted": page_data["accepted"],
+        "users": page_data["users"],
+        "accuracy": page_data["accuracy"],
+        "description": page_data["description"],
+        "description_images": page_data["description_images"],
+        "input": page_data["input"],
+        "input_images": page_data["input_images"],
+        "output": page_data["output"],
+        "output_images": page_data["output_images"],
+        "examples": page_data["examples"]
+    }
+
+
+@timed("cache.store")
+def cache_problem(problem_data, keep_static=False):
+    """
+    로컬 캐시에 저장 (solved.ac 조회에 실패한 결과는 저장하지 않음)
+
+    Args:
+        keep_static: True면 통계 필드만 저장 (캐시된 정적 필드를 재사용한 경우)
+
+    Returns:
+        dict or None: 부분별 내용 변경 여부 {"static": bool, "volatile": bool}
+                      저장하지 않았으면 None (페이지 검증자도 저장하지 않음)
+    """
+    if problem_data["tier"] == "Unknown":
+        return None
+    return store_problem(problem_data, keep_static)
+
+
+def load_revalidation(problem_id, url):
+    """
+    조건부 요청에 쓸 (유효 기간이 지난 캐시 문제, 페이지 검증자)
+
+    304를 받았을 때 재사용할 캐시 문제가 없으면 조건부 요청을 보내지 않도록 (None, None)
+    """
+    stale = load_stale_problem(problem_id)
+    stored = load_validators(url) if stale else None
+    if not stored:
+        return None, None
+    return stale, stored[0]
+
+
+def cached_page_data(problem_data):
+    """캐시된 문제에서 페이지 정보만 꺼내기 (304 Not Modified일 때 파싱 대신 사용)"""
+    return {k: v for k, v in problem_data.items() if k not in SOLVED_AC_FIELDS}
+
+
+def scrape_problem(url):
+    """
+    백준 문제 페이지 크롤링
+    
+    Args:
+        url: 백준 문제 URL (예: https://www.acmicpc.net/problem/14716)
+    
+    Returns:
+        dict: 문제 정보 딕셔너리
+    """
+    # 문제 번호 추출
+    problem_id = get_problem_id(url)
+    if not problem_id:
+        raise ValueError(f"올바른 백준 URL이 아닙니다: {url}")
+    
+    # 로컬 캐시 확인 (유효 기간 안이면 크롤링 생략)
+    cached = load_cached_problem(problem_id)
+    if cached:
+        return cached
+    
+    # 페이지 HTML 가져오기 (정적 HTML 우선, WAF 챌린지 시에만 Selenium)
+    # 만료된 캐시가 있으면 조건부 요청으로 바뀌었는지만 확인
+    stale, validators = load_revalidation(problem_id, url)
+    html, validators = fetch_problem_page(url, validators)
+    
+    # HTML 파싱 (304 Not Modified면 캐시된 페이지 정보 재사용,
+    # 통계 필드만 만료됐으면 캐시된 정적 필드에 통계 필드만 새로 추출)
+    static = load_cached_static(problem_id) if html is not None else None
+    if html is None:
+        page_data = cached_page_data(stale)
+    elif static is not None:
+        page_data = page_data_with_stats(static, html)
+    else:
+        page_data = parse_problem_html(html, url)
+    
+    # solved.ac 정보 가져오기 (티어 + 알고리즘 태그)
+    solved_info = get_solved_ac_info(problem_id)
+    
+    problem_data = build_problem_data(page_data, solved_info)
+    
+    # 로컬 캐시에 저장 (캐시된 내용과 짝이 맞는 검증자만 저장)
+    if cache_problem(problem_data, keep_static=static is not None) is not None and html is not None:
+        store_validators(url, validators)
+    
+    return problem_data
+
+
 # 테스트용 코드
 if __name__ == "__main__":
     import json
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+출력 대상(sink) 모듈
+
+파이프라인의 작성(write) 단계가 문제 하나를 어디에 기록할지 정합니다.
+
+    NotionSink    Notion 페이지 (기본값)
+    MarkdownSink  문제마다 <디렉터리>/<문제 번호>.md (page_template.py와 같은 섹션 구성)
+    JsonlSink     한 줄에 문제 하나씩 JSON으로 이어 쓰기
+
+모든 sink는 문제를 하나씩 받아 바로 기록하므로 문제 수가 많아도 메모리 사용량이 늘지 않습니다.
+write()는 작성 단계의 여러 스레드에서 동시에 호출될 수 있습니다.
+"""
+
+import os
+import json
+import threading
+from abc import ABC, abstractmethod
+
+from page_template import PAGE_TEMPLATE
+
+
+class Sink(ABC):
+    """
+    출력 대상 기본 클래스
+
+    label: 진행 상황/결과 출력에 쓰는 이름 (예: "Notion 페이지")
+    journal_scope: 작업 저널에서 작업을 구분하는 키 (출력 대상마다 다름)
+    """
+
+    label = ""
+
+    @property
+    @abstractmethod
+    def journal_scope(self):
+        """작업 저널에서 작업을 구분하는 키"""
+
+    @abstractmethod
+    def write(self, problem_data, refresh=False):
+        """
+        문제 하나 기록
+
+        Returns:
+            tuple: (상태, 위치) 상태는 "created" / "updated" / "exists"
+        """
+
+    def close(self):
+        pass
+
+
+class NotionSink(Sink):
+    """Notion 부모 페이지 아래 하위 페이지 (NOTION_DATABASE_ID를 설정하면 데이터베이스 항목)로 작성"""
+
+    label = "Notion 페이지"
+
+    @property
+    def journal_scope(self):
+        # 작업 저널은 부모 페이지(또는 데이터베이스) ID로 구분 (기존 저널과 호환)
+        from config import NOTION_PARENT_PAGE_ID, NOTION_DATABASE_ID
+        return NOTION_DATABASE_ID or NOTION_PARENT_PAGE_ID
+
+    def write(self, problem_data, refresh=False):
+        from notion_api import create_problem_page
+
+        page_url = create_problem_page(problem_data, True, refresh)
+        if "(이미 존재)" in page_url:
+            return "exists", page_url.replace("(이미 존재) ", "")
+        if "(갱신됨)" in page_url:
+            return "updated", page_url.replace("(갱신됨) ", "")
+        return "created", page_url
+
+
+# ---------------------------------------------------------------------------
+# Markdown
+# ---------------------------------------------------------------------------
+
+def markdown_fence(content):
+    """내용에 들어 있지 않은 코드 블록 구분자"""
+    fence = "```"
+    while fence in content:
+        fence += "`"
+    return fence
+
+
+def markdown_cell(value):
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def render_markdown_block(spec, problem_data):
+    """템플릿 블록 선언 하나를 Markdown 문단 리스트로"""
+    kind = spec["type"]
+
+    if kind == "paragraph":
+        return [spec["text"]]
+
+    if kind == "text":
+        text = problem_data.get(spec["field"], "")
+        # 줄바꿈마다 문단을 나눠야 Markdown에서도 줄이 유지됨
+        return ["\n\n".join(line for line in text.split("\n") if line.strip())] if text else []
+
+    if kind == "images":
+        return [f"![]({url})" for url in problem_data.get(spec["field"], [])]
+
+    if kind == "tag_callout":
+        tags = problem_data.get("tags", [])
+        if not tags:
+            return []
+        return [f"> {spec['icon']} " + " | ".join(f"#{tag}" for tag in tags)]
+
+    if kind == "link_callout":
+        url = problem_data["url"]
+        return [f"> {spec['icon']} {spec['label'].strip()}  \n> [{url}]({url})"]
+
+    if kind == "info_table":
+        headers = [markdown_cell(header) for header, _ in spec["columns"]]
+        values = [markdown_cell(problem_data.get(field, "")) for _, field in spec["columns"]]
+        return ["\n".join([
+            "| " + " | ".join(headers) + " |",
+            "|" + "---|" * len(headers),
+            "| " + " | ".join(values) + " |",
+        ])]
+
+    if kind == "examples":
+        parts = []
+        for i, example in enumerate(problem_data.get("examples", []), 1):
+            for label, key in ((spec["input_label"], "input"), (spec["output_label"], "output")):
+                content = example.get(key, "")
+                fence = markdown_fence(content)
+                parts.append(f"### {label.format(i)}")
+                parts.append(f"{fence}\n{content}\n{fence}")
+        return parts
+
+    raise ValueError(f"알 수 없는 템플릿 블록 종류: {kind}")
+
+
+def render_markdown(problem_data):
+    """문제 하나를 페이지 템플릿 순서대로 Markdown 문서로 변환"""
+    from notion_api import build_page_title, get_tier_icon
+
+    parts = [f"# {get_tier_icon(problem_data['tier'])} {build_page_title(problem_data)}"]
+    for section in PAGE_TEMPLATE:
+        if section.get("divider"):
+            parts.append("---")
+        if section.get("heading"):
+            parts.append(f"## {section['heading']}")
+        for spec in section["blocks"]:
+            parts.extend(render_markdown_block(spec, problem_data))
+    return "\n\n".join(parts) + "\n"
+
+
+class MarkdownSink(Sink):
+    """
+    문제마다 Markdown 파일 하나 (<디렉터리>/<문제 번호>.md)
+
+    파일이 이미 있으면 "exists", refresh=True면 내용이 바뀐 파일만 다시 씁니다.
+    """
+
+    label = "Markdown 파일"
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def journal_scope(self):
+        return f"markdown:{self.directory}"
+
+    def write(self, problem_data, refresh=False):
+        path = os.path.join(self.directory, f"{problem_data['problem_id']}.md")
+        exists = os.path.exists(path)
+        if exists and not refresh:
+            return "exists", path
+
+        content = render_markdown(problem_data)
+        if exists:
+            with open(path, encoding="utf-8") as f:
+                if f.read() == content:
+                    return "exists", path
+
+        # 중간에 멈춰도 반쯤 쓴 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+        return ("updated" if exists else "created"), path
+
+
+# ---------------------------------------------------------------------------
+# JSONL
+# ---------------------------------------------------------------------------
+
+class JsonlSink(Sink):
+    """
+    한 줄에 문제 하나씩 JSON으로 이어 쓰기
+
+    이미 기록된 문제는 "exists"로 건너뜁니다.
+    refresh=True면 내용이 바뀐 문제를 새 줄로 다시 기록하므로, 읽을 때는 문제 번호별 마지막 줄을 사용합니다.
+    """
+
+    label = "JSONL"
+
+    def __init__(self, path):
+        from cache import content_hash
+
+        self._content_hash = content_hash
+        self.path = os.path.abspath(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 기존 파일에서 문제 번호별 내용 해시만 읽어 둠
+        self._hashes = {}
+        line = "\n"
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue    # 중간에 멈춰 잘린 마지막 줄
+                    self._hashes[record["problem_id"]] = record.get("content_hash")
+
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8", newline="\n")
+        if not line.endswith("\n"):
+            # 잘린 마지막 줄 뒤에 이어 쓰지 않도록 줄바꿈
+            self._file.write("\n")
+
+    @property
+    def journal_scope(self):
+        return f"jsonl:{self.path}"
+
+    def write(self, problem_data, refresh=False):
+        problem_id = problem_data["problem_id"]
+        digest = self._content_hash(problem_data)
+        location = f"{self.path}#{problem_id}"
+
+        with self._lock:
+            if problem_id in self._hashes:
+                if not refresh or self._hashes[problem_id] == digest:
+                    return "exists", location
+                status = "updated"
+            else:
+                status = "created"
+            record = {**problem_data, "content_hash": digest}
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self._hashes[problem_id] = digest
+        return status, location
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+solved.ac API 클라이언트 모듈
+
+/api/v3/problem/lookup 엔드포인트로 최대 100문제씩 묶어서
+티어와 알고리즘 태그를 조회합니다.
+/api/v3/search/problem 으로 사용자가 푼 문제 목록을 페이지 단위로 가져옵니다.
+
+lookup 응답은 검증자(ETag, Last-Modified)와 함께 캐시에 저장해 두고,
+같은 묶음을 다시 조회할 때는 조건부 요청을 보내 304면 저장된 결과를 재사용합니다.
+티어 이름과 태그 표시 이름은 metadata.py의 표에서 찾습니다.
+조회한 문제 정보는 CACHE_VOLATILE_TTL_HOURS 동안만 메모리에 두므로,
+데몬처럼 오래 실행되는 프로세스에서도 티어/태그 변경이 반영됩니다.
+"""
+
+import time
+import threading
+from urllib.parse import urlencode
+
+from fetcher import get_http_session, conditional_headers, response_validators
+from cache import load_validators, store_validators
+from config import CACHE_VOLATILE_TTL_HOURS
+from metadata import tier_by_level, get_tag_name, get_tag_names
+from profiler import timed, count
+
+
+API_BASE = "https://solved.ac/api/v3"
+
+# lookup 엔드포인트가 한 번에 받는 최대 문제 수
+LOOKUP_BATCH_SIZE = 100
+
+HTTP_TIMEOUT = 10
+
+# 조회한 문제 정보: {problem_id: ({tier, tier_level, tags}, 조회 시각)}
+_info_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _remember(infos):
+    """조회한 문제 정보 저장 (만료된 항목은 함께 정리해서 메모리가 계속 늘지 않도록)"""
+    now = time.time()
+    with _cache_lock:
+        expired = [pid for pid, (_, fetched_at) in _info_cache.items()
+                   if now - fetched_at > CACHE_VOLATILE_TTL_HOURS * 3600]
+        for pid in expired:
+            del _info_cache[pid]
+        for pid, info in infos.items():
+            _info_cache[pid] = (info, now)
+
+
+def _cached_infos(problem_ids):
+    """메모리에 있고 만료되지 않은 문제 정보만 반환"""
+    now = time.time()
+    with _cache_lock:
+        entries = {pid: _info_cache.get(pid) for pid in problem_ids}
+    return {
+        pid: entry[0] for pid, entry in entries.items()
+        if entry and now - entry[1] <= CACHE_VOLATILE_TTL_HOURS * 3600
+    }
+
+
+def empty_info():
+    """정보를 가져오지 못했을 때의 기본값"""
+    return {
+        "tier": "Unknown",
+        "tier_level": 0,
+        "tags": []
+    }
+
+
+def parse_problem_info(data, tag_names=None):
+    """
+    solved.ac 문제 객체를 {tier, tier_level, tags} 형태로 변환
+
+    Args:
+        data: /problem/show 또는 /problem/lookup 응답의 문제 객체
+        tag_names: 태그 key → 표시 이름 사전 (metadata.get_tag_names, 없는 태그는 displayNames에서 고름)
+    """
+    level = data.get("level", 0)
+    tag_names = tag_names or {}
+    return {
+        "tier": tier_by_level(level)["name"],
+        "tier_level": level,
+        "tags": [tag_names.get(tag.get("key")) or get_tag_name(tag) for tag in data.get("tags", [])]
+    }
+
+
+@timed("solved_ac.lookup")
+def _lookup_chunk(problem_ids):
+    """문제 번호 최대 100개를 한 번의 요청으로 조회 (이전 응답이 있으면 조건부 요청)"""
+    url = f"{API_BASE}/problem/lookup?" + urlencode({"problemIds": ",".join(str(pid) for pid in problem_ids)})
+    stored = load_validators(url)
+    validators, payload = stored if stored and stored[1] is not None else (None, None)
+
+    response = get_http_session().get(
+        url,
+        headers={"Accept": "application/json", **conditional_headers(validators)},
+        timeout=HTTP_TIMEOUT
+    )
+    count("http.requests")
+    count("http.bytes", len(response.content))
+    if response.status_code == 304 and validators:
+        count("http.not_modified")
+        # JSON 객체 키는 문자열로 저장되므로 문제 번호로 되돌림
+        return {int(pid): info for pid, info in payload.items()}
+    response.raise_for_status()
+
+    tag_names = get_tag_names()
+    found = {item["problemId"]: parse_problem_info(item, tag_names) for item in response.json()}
+    store_validators(url, response_validators(response), found)
+    return found
+
+
+def lookup_problems(problem_ids):
+    """
+    여러 문제의 티어/태그를 100개 단위 묶음 요청으로 조회
+
+    이미 조회한 문제는 CACHE_VOLATILE_TTL_HOURS가 지나기 전까지 다시 요청하지 않습니다.
+    solved.ac에 없는 문제는 기본값(Unknown)으로 기록합니다.
+
+    Args:
+        problem_ids: 문제 번호 iterable
+
+    Returns:
+        dict: {problem_id: {tier, tier_level, tags}}
+    """
+    problem_ids = list(dict.fromkeys(problem_ids))
+    result = _cached_infos(problem_ids)
+    missing = [pid for pid in problem_ids if pid not in result]
+
+    for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+        chunk = missing[start:start + LOOKUP_BATCH_SIZE]
+        found = _lookup_chunk(chunk)
+        infos = {pid: found.get(pid) or empty_info() for pid in chunk}
+        _remember(infos)
+        result.update(infos)
+
+    return {pid: result[pid] for pid in problem_ids if pid in result}
+
+
+def prefetch_problems(problem_ids):
+    """
+    배치 처리 전에 미리 묶음 조회 (실패해도 경고만 출력)
+
+    실패한 문제는 이후 문제별 조회에서 다시 시도됩니다.
+    """
+    try:
+        lookup_problems(problem_ids)
+    except Exception as e:
+        print(f"⚠️ solved.ac 묶음 조회 실패: {e}")
+
+
+def get_problem_info(problem_id):
+    """
+    문제 하나의 티어/태그 조회 (미리 조회된 값이 있으면 재사용)
+
+    Returns:
+        dict: {tier: str, tier_level: int, tags: list}
+    """
+    return lookup_problems([problem_id]).get(problem_id) or empty_info()
+
+
+def build_search_query(handle, tier=None, tag=None):
+    """
+    solved.ac 문제 검색 쿼리 생성
+
+    Args:
+        handle: solved.ac 사용자 핸들
+        tier: 티어 범위 (예: "g5..g1", "s")
+        tag: 알고리즘 태그 key (예: "dp")
+    """
+    query = f"solved_by:{handle}"
+    if tier:
+        query += f" tier:{tier}"
+    if tag:
+        query += f" tag:{tag}"
+    return query
+
+
+def iter_solved_problems(handle, tier=None, tag=None):
+    """
+    사용자가 푼 문제 번호를 검색 결과 페이지 단위로 스트리밍
+
+    검색 결과에 이미 들어 있는 티어/태그는 조회 결과로 저장해 두므로
+    이후 문제별 solved.ac 조회를 하지 않습니다.
+
+    Args:
+        handle: solved.ac 사용자 핸들
+        tier: 티어 범위 (예: "g5..g1")
+        tag: 알고리즘 태그 key (예: "dp")
+
+    Yields:
+        int: 문제 번호 (번호 오름차순)
+    """
+    query = build_search_query(handle, tier, tag)
+    page = 1
+    seen = 0
+
+    while True:
+        response = get_http_session().get(
+            f"{API_BASE}/search/problem",
+            params={"query": query, "page": page, "sort": "id", "direction": "asc"},
+            headers={"Accept": "application/json"},
+            timeout=HTTP_TIMEOUT
+        )
+        count("http.requests")
+        count("http.bytes", len(response.content))
+        response.raise_for_status()
+        data = response.json()
+        items = data.get("items", [])
+        if not items:
+            return
+
+        tag_names = get_tag_names()
+        infos = {item["problemId"]: parse_problem_info(item, tag_names) for item in items}
+        _remember(infos)
+
+        yield from infos
+
+        seen += len(items)
+        if seen >= data.get("count", 0):
+            return
+        page += 1